@@ -8,6 +8,7 @@
 #   - Manejo de excepciones para errores comunes de archivo.
 #   - Escritura atómica para evitar archivos dañados.
 #   - Menú de consola con notificaciones de éxito/fracaso en operaciones.
+#   - La clase Inventario no imprime: devuelve resultados o lanza InventarioError.
 # =========================
 
 import json
@@ -62,13 +63,38 @@ class Producto:
         return f"ID: {self.id_producto} | Nombre: {self.nombre} | Cantidad: {self.cantidad} | Precio: ${self.precio:.2f}"
 
 
+# -------------------------
+# Errores del inventario
+# -------------------------
+class InventarioError(Exception):
+    """Error de una operación del inventario (el mensaje es apto para mostrar)."""
+
+
+class ProductoDuplicadoError(InventarioError):
+    pass
+
+
+class ProductoNoEncontradoError(InventarioError):
+    pass
+
+
+class ArchivoInventarioError(InventarioError):
+    """No se pudo escribir el archivo; el cambio en memoria se deshizo."""
+
+
 # -------------------------
 # Clase Inventario
 # -------------------------
 class Inventario:
+    # No imprime nada: los métodos devuelven el resultado o lanzan InventarioError
+    # (sirve para scripts y cargas grandes); menu() es quien muestra los mensajes.
     def __init__(self, ruta_archivo="inventario.txt"):
         self.productos = []
         self.ruta_archivo = ruta_archivo
+        # Qué pasó al cargar: (código, detalle) o None si cargó normal.
+        # Códigos: "creado", "corrupto" (detalle: copia de respaldo),
+        # "no_encontrado", "sin_permiso", "error" (detalle: la excepción)
+        self.aviso_carga = None
         self._cargar_archivo()
 
     def _guardar_archivo(self):
@@ -78,91 +104,115 @@ class Inventario:
             with open(tmp_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
             os.replace(tmp_path, self.ruta_archivo)
-            print(f"💾 Cambios guardados en '{self.ruta_archivo}'.")
-            return True
-        except PermissionError:
-            print("❌ Permiso denegado: no se pudo escribir en el archivo.")
-            return False
+        except PermissionError as e:
+            raise ArchivoInventarioError("Permiso denegado: no se pudo escribir en el archivo.") from e
         except Exception as e:
-            print(f"❌ Error al guardar el archivo: {e}")
-            return False
+            raise ArchivoInventarioError(f"Error al guardar el archivo: {e}") from e
 
     def _cargar_archivo(self):
         if not os.path.exists(self.ruta_archivo):
             with open(self.ruta_archivo, "w", encoding="utf-8") as f:
                 json.dump([], f)
-            print("🆕 Archivo de inventario creado.")
+            self.aviso_carga = ("creado", None)
             return
 
         try:
             with open(self.ruta_archivo, "r", encoding="utf-8") as f:
                 data = json.load(f)
             self.productos = [Producto.from_dict(item) for item in data]
-            print(f"📂 {len(self.productos)} producto(s) cargado(s).")
         except json.JSONDecodeError:
             backup = f"{self.ruta_archivo}.corrupt-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
             os.rename(self.ruta_archivo, backup)
             with open(self.ruta_archivo, "w", encoding="utf-8") as f:
                 json.dump([], f)
-            print(f"⚠️ Archivo corrupto renombrado a {backup}. Nuevo archivo creado.")
+            self.aviso_carga = ("corrupto", backup)
         except FileNotFoundError:
-            print("❌ Archivo no encontrado. Se creará uno nuevo.")
+            self.aviso_carga = ("no_encontrado", None)
         except PermissionError:
-            print("❌ Permiso denegado al leer el archivo.")
+            self.aviso_carga = ("sin_permiso", None)
         except Exception as e:
-            print(f"❌ Error al cargar archivo: {e}")
+            self.aviso_carga = ("error", e)
+
+    def _buscar_por_id(self, id_producto):
+        for i, p in enumerate(self.productos):
+            if p.get_id() == id_producto:
+                return i, p
+        raise ProductoNoEncontradoError("No se encontró un producto con ese ID.")
 
     def agregar_producto(self, producto):
         if any(p.get_id() == producto.get_id() for p in self.productos):
-            print("❌ Ya existe un producto con ese ID.")
-            return
+            raise ProductoDuplicadoError("Ya existe un producto con ese ID.")
         self.productos.append(producto)
-        self._guardar_archivo()
+        try:
+            self._guardar_archivo()
+        except ArchivoInventarioError:
+            self.productos.pop()
+            raise
 
     def eliminar_producto(self, id_producto):
-        for p in self.productos:
-            if p.get_id() == id_producto:
-                self.productos.remove(p)
-                self._guardar_archivo()
-                print("✅ Producto eliminado.")
-                return
-        print("❌ No se encontró un producto con ese ID.")
+        """Elimina y devuelve el producto."""
+        i, p = self._buscar_por_id(id_producto)
+        del self.productos[i]
+        try:
+            self._guardar_archivo()
+        except ArchivoInventarioError:
+            self.productos.insert(i, p)
+            raise
+        return p
 
     def actualizar_producto(self, id_producto, nueva_cantidad=None, nuevo_precio=None):
-        for p in self.productos:
-            if p.get_id() == id_producto:
-                if nueva_cantidad is not None:
-                    p.set_cantidad(nueva_cantidad)
-                if nuevo_precio is not None:
-                    p.set_precio(nuevo_precio)
-                self._guardar_archivo()
-                print("✅ Producto actualizado.")
-                return
-        print("❌ No se encontró un producto con ese ID.")
+        """Actualiza y devuelve el producto."""
+        _, p = self._buscar_por_id(id_producto)
+        antes = (p.get_cantidad(), p.get_precio())
+        if nueva_cantidad is not None:
+            p.set_cantidad(nueva_cantidad)
+        if nuevo_precio is not None:
+            p.set_precio(nuevo_precio)
+        try:
+            self._guardar_archivo()
+        except ArchivoInventarioError:
+            p.set_cantidad(antes[0])
+            p.set_precio(antes[1])
+            raise
+        return p
 
     def buscar_producto(self, nombre):
-        resultados = [p for p in self.productos if nombre.lower() in p.get_nombre().lower()]
-        if resultados:
-            print("\n🔍 Resultados:")
-            for p in resultados:
-                print(p)
-        else:
-            print("❌ No se encontraron productos.")
-
-    def mostrar_todos(self):
-        if not self.productos:
-            print("📦 Inventario vacío.")
-        else:
-            print("\n📋 Inventario:")
-            for p in self.productos:
-                print(p)
+        """Productos cuyo nombre contiene 'nombre'."""
+        nombre = nombre.lower()
+        return [p for p in self.productos if nombre in p.get_nombre().lower()]
+
+    def listar(self):
+        return list(self.productos)
 
 
 # -------------------------
 # Menú Interactivo
 # -------------------------
+def mostrar_productos(productos, titulo, vacio):
+    if not productos:
+        print(vacio)
+        return
+    print(titulo)
+    for p in productos:
+        print(p)
+
+
+MENSAJES_CARGA = {
+    "creado": "🆕 Archivo de inventario creado.",
+    "corrupto": "⚠️ Archivo corrupto renombrado a {}. Nuevo archivo creado.",
+    "no_encontrado": "❌ Archivo no encontrado. Se creará uno nuevo.",
+    "sin_permiso": "❌ Permiso denegado al leer el archivo.",
+    "error": "❌ Error al cargar archivo: {}",
+}
+
+
 def menu():
     inventario = Inventario()
+    if inventario.aviso_carga:
+        codigo, detalle = inventario.aviso_carga
+        print(MENSAJES_CARGA[codigo].format(detalle))
+    else:
+        print(f"📂 {len(inventario.productos)} producto(s) cargado(s).")
 
     while True:
         print("\n=== MENÚ INVENTARIO ===")
@@ -175,45 +225,54 @@ def menu():
 
         opcion = input("Seleccione opción: ")
 
-        if opcion == "1":
-            id_prod = input("ID único: ")
-            nombre = input("Nombre: ")
-            try:
-                cantidad = int(input("Cantidad: "))
-                precio = float(input("Precio: "))
-            except ValueError:
-                print("❌ Error: cantidad y precio deben ser números.")
-                continue
-            inventario.agregar_producto(Producto(id_prod, nombre, cantidad, precio))
-
-        elif opcion == "2":
-            id_prod = input("ID a eliminar: ")
-            inventario.eliminar_producto(id_prod)
-
-        elif opcion == "3":
-            id_prod = input("ID a actualizar: ")
-            try:
-                nueva_cantidad = input("Nueva cantidad (vacío si no cambia): ")
-                nuevo_precio = input("Nuevo precio (vacío si no cambia): ")
-                nueva_cantidad = int(nueva_cantidad) if nueva_cantidad else None
-                nuevo_precio = float(nuevo_precio) if nuevo_precio else None
-            except ValueError:
-                print("❌ Error en los datos ingresados.")
-                continue
-            inventario.actualizar_producto(id_prod, nueva_cantidad, nuevo_precio)
-
-        elif opcion == "4":
-            nombre = input("Nombre a buscar: ")
-            inventario.buscar_producto(nombre)
-
-        elif opcion == "5":
-            inventario.mostrar_todos()
-
-        elif opcion == "6":
-            print("👋 Saliendo...")
-            break
-        else:
-            print("❌ Opción inválida.")
+        try:
+            if opcion == "1":
+                id_prod = input("ID único: ")
+                nombre = input("Nombre: ")
+                try:
+                    cantidad = int(input("Cantidad: "))
+                    precio = float(input("Precio: "))
+                except ValueError:
+                    print("❌ Error: cantidad y precio deben ser números.")
+                    continue
+                inventario.agregar_producto(Producto(id_prod, nombre, cantidad, precio))
+                print(f"💾 Cambios guardados en '{inventario.ruta_archivo}'.")
+
+            elif opcion == "2":
+                id_prod = input("ID a eliminar: ")
+                inventario.eliminar_producto(id_prod)
+                print(f"💾 Cambios guardados en '{inventario.ruta_archivo}'.")
+                print("✅ Producto eliminado.")
+
+            elif opcion == "3":
+                id_prod = input("ID a actualizar: ")
+                try:
+                    nueva_cantidad = input("Nueva cantidad (vacío si no cambia): ")
+                    nuevo_precio = input("Nuevo precio (vacío si no cambia): ")
+                    nueva_cantidad = int(nueva_cantidad) if nueva_cantidad else None
+                    nuevo_precio = float(nuevo_precio) if nuevo_precio else None
+                except ValueError:
+                    print("❌ Error en los datos ingresados.")
+                    continue
+                inventario.actualizar_producto(id_prod, nueva_cantidad, nuevo_precio)
+                print(f"💾 Cambios guardados en '{inventario.ruta_archivo}'.")
+                print("✅ Producto actualizado.")
+
+            elif opcion == "4":
+                nombre = input("Nombre a buscar: ")
+                mostrar_productos(inventario.buscar_producto(nombre), "\n🔍 Resultados:",
+                                  "❌ No se encontraron productos.")
+
+            elif opcion == "5":
+                mostrar_productos(inventario.listar(), "\n📋 Inventario:", "📦 Inventario vacío.")
+
+            elif opcion == "6":
+                print("👋 Saliendo...")
+                break
+            else:
+                print("❌ Opción inválida.")
+        except InventarioError as e:
+            print(f"❌ {e}")
 
 
 if __name__ == "__main__":
@@ -48,62 +48,87 @@ class Producto:
         return Producto(data["id"], data["nombre"], data["cantidad"], data["precio"])
 
 
+# =============================
+# Errores del inventario
+# =============================
+class InventarioError(Exception):
+    """Error de una operación del inventario (el mensaje es apto para mostrar)"""
+
+
+class ProductoDuplicadoError(InventarioError):
+    pass
+
+
+class ProductoNoEncontradoError(InventarioError):
+    pass
+
+
+class ArchivoInventarioError(InventarioError):
+    pass
+
+
 # =============================
 # Clase Inventario
 # =============================
 class Inventario:
+    """Sin print: devuelve resultados o lanza InventarioError (la consola está en menu())"""
+
     def __init__(self, archivo="inventario.json"):
         self.productos = {}  # Diccionario {id: Producto}
         self.archivo = archivo
+        # ("no_encontrado" / "corrupto", detalle) si el archivo no existía o estaba dañado
+        self.aviso_carga = None
         self.cargar_desde_archivo()
 
     # Añadir producto
     def agregar_producto(self, producto):
         if producto.get_id() in self.productos:
-            print("⚠️ Ya existe un producto con ese ID.")
-        else:
-            self.productos[producto.get_id()] = producto
+            raise ProductoDuplicadoError("Ya existe un producto con ese ID.")
+        self.productos[producto.get_id()] = producto
+        try:
             self.guardar_en_archivo()
-            print("✅ Producto añadido con éxito.")
+        except ArchivoInventarioError:
+            del self.productos[producto.get_id()]
+            raise
 
-    # Eliminar producto
+    # Eliminar producto (devuelve el eliminado)
     def eliminar_producto(self, id_unico):
-        if id_unico in self.productos:
-            del self.productos[id_unico]
+        if id_unico not in self.productos:
+            raise ProductoNoEncontradoError("No se encontró el producto.")
+        producto = self.productos.pop(id_unico)
+        try:
             self.guardar_en_archivo()
-            print("🗑️ Producto eliminado.")
-        else:
-            print("⚠️ No se encontró el producto.")
+        except ArchivoInventarioError:
+            self.productos[id_unico] = producto
+            raise
+        return producto
 
-    # Actualizar producto
+    # Actualizar producto (devuelve el actualizado)
     def actualizar_producto(self, id_unico, cantidad=None, precio=None):
-        if id_unico in self.productos:
-            if cantidad is not None:
-                self.productos[id_unico].set_cantidad(cantidad)
-            if precio is not None:
-                self.productos[id_unico].set_precio(precio)
+        if id_unico not in self.productos:
+            raise ProductoNoEncontradoError("Producto no encontrado.")
+        producto = self.productos[id_unico]
+        antes = (producto.get_cantidad(), producto.get_precio())
+        if cantidad is not None:
+            producto.set_cantidad(cantidad)
+        if precio is not None:
+            producto.set_precio(precio)
+        try:
             self.guardar_en_archivo()
-            print("🔄 Producto actualizado.")
-        else:
-            print("⚠️ Producto no encontrado.")
+        except ArchivoInventarioError:
+            producto.set_cantidad(antes[0])
+            producto.set_precio(antes[1])
+            raise
+        return producto
 
-    # Buscar por nombre
+    # Buscar por nombre (coincidencia exacta, sin distinguir mayúsculas)
     def buscar_producto(self, nombre):
-        resultados = [p for p in self.productos.values() if p.get_nombre().lower() == nombre.lower()]
-        if resultados:
-            for p in resultados:
-                print(f"🔎 {p.get_id()} - {p.get_nombre()} | Cantidad: {p.get_cantidad()} | Precio: {p.get_precio()}")
-        else:
-            print("⚠️ No se encontró ningún producto con ese nombre.")
-
-    # Mostrar todos
-    def mostrar_todos(self):
-        if self.productos:
-            print("\n📦 Inventario completo:")
-            for p in self.productos.values():
-                print(f"ID: {p.get_id()} | Nombre: {p.get_nombre()} | Cantidad: {p.get_cantidad()} | Precio: {p.get_precio()}")
-        else:
-            print("⚠️ El inventario está vacío.")
+        nombre = nombre.lower()
+        return [p for p in self.productos.values() if p.get_nombre().lower() == nombre]
+
+    # Todos los productos
+    def listar(self):
+        return list(self.productos.values())
 
     # =============================
     # Manejo de Archivos
@@ -112,8 +137,8 @@ class Inventario:
         try:
             with open(self.archivo, "w", encoding="utf-8") as f:
                 json.dump({id_: p.to_dict() for id_, p in self.productos.items()}, f, indent=4)
-        except PermissionError:
-            print("❌ Error: No tienes permisos para escribir en el archivo.")
+        except PermissionError as e:
+            raise ArchivoInventarioError("No tienes permisos para escribir en el archivo.") from e
 
     def cargar_desde_archivo(self):
         try:
@@ -121,18 +146,31 @@ class Inventario:
                 data = json.load(f)
                 self.productos = {int(id_): Producto.from_dict(p) for id_, p in data.items()}
         except FileNotFoundError:
-            print("📂 Archivo no encontrado. Se creará uno nuevo al guardar.")
+            self.aviso_carga = ("no_encontrado", None)
             self.productos = {}
-        except json.JSONDecodeError:
-            print("⚠️ Archivo corrupto. Se reiniciará el inventario.")
+        except json.JSONDecodeError as e:
+            self.aviso_carga = ("corrupto", e)
             self.productos = {}
 
 
 # =============================
 # Interfaz de Usuario (Consola)
 # =============================
+def mostrar_producto(p):
+    print(f"ID: {p.get_id()} | Nombre: {p.get_nombre()} | Cantidad: {p.get_cantidad()} | Precio: {p.get_precio()}")
+
+
+MENSAJES_CARGA = {
+    "no_encontrado": "📂 Archivo no encontrado. Se creará uno nuevo al guardar.",
+    "corrupto": "⚠️ Archivo corrupto. Se reiniciará el inventario.",
+}
+
+
 def menu():
     inventario = Inventario()
+    if inventario.aviso_carga:
+        codigo, _ = inventario.aviso_carga
+        print(MENSAJES_CARGA[codigo])
 
     while True:
         print("\n=== MENÚ INVENTARIO ===")
@@ -145,40 +183,58 @@ def menu():
 
         opcion = input("Seleccione opción: ")
 
-        if opcion == "1":
-            id_unico = int(input("ID único: "))
-            nombre = input("Nombre: ")
-            cantidad = int(input("Cantidad: "))
-            precio = float(input("Precio: "))
-            inventario.agregar_producto(Producto(id_unico, nombre, cantidad, precio))
-
-        elif opcion == "2":
-            id_unico = int(input("ID del producto a eliminar: "))
-            inventario.eliminar_producto(id_unico)
-
-        elif opcion == "3":
-            id_unico = int(input("ID del producto a actualizar: "))
-            cantidad = input("Nueva cantidad (Enter para no cambiar): ")
-            precio = input("Nuevo precio (Enter para no cambiar): ")
-            inventario.actualizar_producto(
-                id_unico,
-                cantidad=int(cantidad) if cantidad else None,
-                precio=float(precio) if precio else None
-            )
-
-        elif opcion == "4":
-            nombre = input("Nombre del producto: ")
-            inventario.buscar_producto(nombre)
-
-        elif opcion == "5":
-            inventario.mostrar_todos()
-
-        elif opcion == "6":
-            print("👋 Saliendo del programa...")
-            break
-
-        else:
-            print("⚠️ Opción no válida, intente de nuevo.")
+        try:
+            if opcion == "1":
+                id_unico = int(input("ID único: "))
+                nombre = input("Nombre: ")
+                cantidad = int(input("Cantidad: "))
+                precio = float(input("Precio: "))
+                inventario.agregar_producto(Producto(id_unico, nombre, cantidad, precio))
+                print("✅ Producto añadido con éxito.")
+
+            elif opcion == "2":
+                id_unico = int(input("ID del producto a eliminar: "))
+                inventario.eliminar_producto(id_unico)
+                print("🗑️ Producto eliminado.")
+
+            elif opcion == "3":
+                id_unico = int(input("ID del producto a actualizar: "))
+                cantidad = input("Nueva cantidad (Enter para no cambiar): ")
+                precio = input("Nuevo precio (Enter para no cambiar): ")
+                inventario.actualizar_producto(
+                    id_unico,
+                    cantidad=int(cantidad) if cantidad else None,
+                    precio=float(precio) if precio else None
+                )
+                print("🔄 Producto actualizado.")
+
+            elif opcion == "4":
+                nombre = input("Nombre del producto: ")
+                resultados = inventario.buscar_producto(nombre)
+                if not resultados:
+                    print("⚠️ No se encontró ningún producto con ese nombre.")
+                for p in resultados:
+                    print(f"🔎 {p.get_id()} - {p.get_nombre()} | Cantidad: {p.get_cantidad()} | Precio: {p.get_precio()}")
+
+            elif opcion == "5":
+                productos = inventario.listar()
+                if productos:
+                    print("\n📦 Inventario completo:")
+                    for p in productos:
+                        mostrar_producto(p)
+                else:
+                    print("⚠️ El inventario está vacío.")
+
+            elif opcion == "6":
+                print("👋 Saliendo del programa...")
+                break
+
+            else:
+                print("⚠️ Opción no válida, intente de nuevo.")
+        except ValueError:
+            print("❌ Error: ID, cantidad y precio deben ser números.")
+        except InventarioError as e:
+            print(f"⚠️ {e}")
 
 
 if __name__ == "__main__":
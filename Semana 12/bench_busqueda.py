@@ -0,0 +1,133 @@
+"""
+Benchmark de búsqueda en la Biblioteca: índice invertido (IndiceLibros) contra
+recorrer todo el catálogo como se hacía antes (lower() + "in" por libro).
+- Genera un catálogo sintético reproducible (por defecto 1.000.000 de libros).
+- Mide el tiempo de armar el índice, su memoria (opcional, con tracemalloc)
+  y la latencia de cada consulta con ambos métodos.
+- Comprueba que el índice encuentra lo mismo que el recorrido.
+Uso: python bench_busqueda.py [cantidad] [--memoria]
+"""
+
+import importlib.util
+import itertools
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+_TITULO = ("Cien", "años", "de", "soledad", "historia", "del", "mar", "la", "ciudad", "perdida",
+           "noche", "árbol", "canción", "viaje", "al", "centro", "tierra", "jardín", "secreto",
+           "los", "días", "invierno", "corazón", "niño", "estrella", "montaña", "río", "sombra")
+_NOMBRES = ("Gabriel", "Isabel", "Julio", "Laura", "Mario", "Sofía", "Pablo", "Elena", "José", "Inés")
+_APELLIDOS = ("García", "Márquez", "Allende", "Cortázar", "Vargas", "Llosa", "Neruda", "Mistral",
+              "Borges", "Rulfo", "Peña", "Núñez", "Ibáñez", "Fernández", "Benedetti")
+_CATEGORIAS = ("Novela", "Poesía", "Ciencia", "Historia", "Infantil", "Ensayo", "Tecnología")
+_SILABAS = ("ca", "lo", "mi", "ra", "te", "su", "ño", "ví", "bre", "tan", "gón", "pel", "dú", "qui", "os")
+CONSULTAS = ("soledad", "garcia marquez", "Márquez", "cien años", "ciudad perdida noche",
+             "cortazar", "río", "zzz", "de", "arb", "estrella montaña", "tanpel", "carami")
+
+
+def _modulo():
+    # El archivo de la Biblioteca tiene espacios y tildes en el nombre
+    ruta = next(Path(__file__).parent.glob("*colecciones*.py"))
+    spec = importlib.util.spec_from_file_location("biblioteca", ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def vocabulario(r, cantidad=20_000):
+    """Palabras reales primero y luego inventadas, con pesos tipo Zipf (pocas muy comunes)."""
+    palabras = list(_TITULO)
+    vistas = set(palabras)
+    while len(palabras) < cantidad:
+        p = "".join(r.choice(_SILABAS) for _ in range(r.randint(2, 4)))
+        if p not in vistas:
+            vistas.add(p)
+            palabras.append(p)
+    # Pesos acumulados una sola vez: choices() con pesos sueltos los suma en cada llamada
+    return palabras, list(itertools.accumulate(1 / (i + 1) for i in range(len(palabras))))
+
+
+def catalogo(modulo, n, semilla=1):
+    r = random.Random(semilla)
+    palabras, acumulados = vocabulario(r)
+    for i in range(n):
+        titulo = " ".join(r.choices(palabras, cum_weights=acumulados, k=r.randint(2, 5)))
+        autor = f"{r.choice(_NOMBRES)} {r.choice(_APELLIDOS)} {r.choice(_APELLIDOS)}"
+        yield modulo.Libro(titulo.capitalize(), autor, r.choice(_CATEGORIAS), f"ISBN-{i:07d}")
+
+
+def _recorrer(libros, consulta, plegar):
+    # Lo mismo que busca el índice, pero mirando libro por libro
+    terminos = plegar(consulta).split()
+    encontrados = []
+    for l in libros:
+        textos = (plegar(l.get_titulo()), plegar(l.get_autor()))
+        if all(any(_contiene(t, x) for x in textos) for t in terminos):
+            encontrados.append(l.get_isbn())
+    return encontrados
+
+
+def _contiene(termino, texto):
+    if len(termino) >= 3:
+        return termino in texto
+    return (" " + termino) in (" " + texto)
+
+
+def _viejo(libros, texto):
+    # buscar_por_titulo original: lower() de cada título en cada consulta
+    texto = texto.lower()
+    return [l for l in libros if texto in l.get_titulo().lower()]
+
+
+def main():
+    n = int(next((a for a in sys.argv[1:] if not a.startswith("--")), 1_000_000))
+    memoria = "--memoria" in sys.argv
+    modulo = _modulo()
+    libros = list(catalogo(modulo, n))
+    print(f"{n:,} libros")
+
+    if memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    indice = modulo.IndiceLibros()
+    for l in libros:
+        indice.agregar(l)
+    armado = time.perf_counter() - inicio
+    linea = f"Índice armado en {armado:.1f} s ({n / armado:,.0f} libros/s)"
+    if memoria:
+        linea += f", {tracemalloc.get_traced_memory()[0] / n:.0f} B/libro"
+        tracemalloc.stop()
+    print(linea)
+
+    # Para comparar: el recorrido completo con texto ya plegado sería lo mejor sin índice
+    muestra = libros if n <= 200_000 else libros[:200_000]
+    print(f"\n{'consulta':<24} {'resultados':>10} {'índice ms':>10} {'recorrer ms':>12} {'viejo ms':>10}")
+    for consulta in CONSULTAS:
+        t = time.perf_counter()
+        encontrados = indice.buscar(consulta)
+        t_indice = (time.perf_counter() - t) * 1000
+        t = time.perf_counter()
+        _viejo(libros, consulta)
+        t_viejo = (time.perf_counter() - t) * 1000
+        # Verificación (sobre una muestra si el catálogo es enorme)
+        t = time.perf_counter()
+        esperados = _recorrer(muestra, consulta, modulo.plegar)
+        t_recorrer = (time.perf_counter() - t) * 1000 * len(libros) / len(muestra)
+        en_muestra = set(indice.buscar(consulta)) & {l.get_isbn() for l in muestra}
+        ok = "" if en_muestra == set(esperados) else "  ¡DISTINTO!"
+        print(f"{consulta:<24} {len(encontrados):>10,} {t_indice:>10.2f} {t_recorrer:>12.0f} {t_viejo:>10.0f}{ok}")
+
+    t = time.perf_counter()
+    primeros = indice.buscar("garcia marquez", limite=10)
+    print(f"\nTop 10 de 'garcia marquez': {(time.perf_counter() - t) * 1000:.2f} ms")
+    t = time.perf_counter()
+    novela = indice.por_categoria("NOVELA")
+    print(f"Categoría 'NOVELA': {len(novela):,} libros en {(time.perf_counter() - t) * 1000:.1f} ms")
+    print("Primero:", libros[int(primeros[0][5:])] if primeros else "-")
+
+
+if __name__ == "__main__":
+    main()
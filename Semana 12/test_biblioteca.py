@@ -0,0 +1,159 @@
+"""
+Pruebas de la Biblioteca (python -m pytest en esta carpeta).
+"""
+
+import importlib.util
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+
+def _modulo():
+    # El archivo de la Biblioteca tiene espacios y tildes en el nombre
+    ruta = next(Path(__file__).parent.glob("*colecciones*.py"))
+    spec = importlib.util.spec_from_file_location("biblioteca", ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+bib = _modulo()
+
+
+@pytest.fixture
+def archivo(tmp_path):
+    return str(tmp_path / "biblioteca.json")
+
+
+def test_diario_cortado_y_mas_operaciones(archivo):
+    b = bib.Biblioteca(archivo)
+    b.añadir_libro(bib.Libro("Uno", "Autor", "Novela", "I1"))
+    b.diario.cerrar()
+    # Corte a mitad de una escritura: queda media línea al final del diario
+    with open(archivo + ".log", "ab") as f:
+        f.write(b'{"op":"alta_li')
+
+    b = bib.Biblioteca(archivo)
+    assert sorted(b.libros) == ["I1"]
+    b.añadir_libro(bib.Libro("Dos", "Autor", "Novela", "I2"))
+    b.añadir_libro(bib.Libro("Tres", "Autor", "Novela", "I3"))
+    b.diario.cerrar()
+
+    b = bib.Biblioteca(archivo)
+    assert sorted(b.libros) == ["I1", "I2", "I3"]
+
+
+def test_diario_ultima_linea_sin_salto(archivo):
+    b = bib.Biblioteca(archivo)
+    b.añadir_libro(bib.Libro("Uno", "Autor", "Novela", "I1"))
+    b.registrar_usuario(bib.Usuario("Ana", "U1"))
+    b.diario.cerrar()
+    # Línea JSON válida pero sin "\n": la escritura no terminó, no cuenta
+    libro = bib.Libro("Dos", "Autor", "Novela", "I2").to_dict()
+    with open(archivo + ".log", "ab") as f:
+        f.write(json.dumps({"op": "alta_libro", "libro": libro, "s": 99}).encode())
+
+    b = bib.Biblioteca(archivo)
+    assert sorted(b.libros) == ["I1"]
+    assert not b.prestar("I2", "U1")
+    b.prestar("I1", "U1")
+    b.diario.cerrar()
+
+    b = bib.Biblioteca(archivo)
+    assert sorted(b.libros) == ["I1"]
+    assert b.prestamos == {"I1": "U1"}
+
+
+def test_diario_linea_danada_en_el_medio(archivo):
+    b = bib.Biblioteca(archivo)
+    b.añadir_libro(bib.Libro("Uno", "Autor", "Novela", "I1"))
+    b.diario.cerrar()
+    with open(archivo + ".log", "ab") as f:
+        f.write(b'{"op":"alta_li\n')
+    with pytest.raises(ValueError):
+        list(bib.DiarioOperaciones(archivo + ".log").leer())
+
+
+def test_cambiar_categoria(archivo):
+    b = bib.Biblioteca(archivo)
+    b.añadir_libro(bib.Libro("Uno", "Autor", "Novela", "I1"))
+    b.cambiar_categoria("I1", "Poesía")
+    assert b.indice.por_categoria("novela") == []
+    assert b.indice.por_categoria("poesia") == ["I1"]
+
+    # Volver a indexar el mismo ISBN con otra categoría lo saca de la vieja
+    b.indice.agregar(bib.Libro("Uno", "Autor", "Ensayo", "I1"))
+    assert b.indice.por_categoria("poesia") == []
+    assert b.indice.por_categoria("ensayo") == ["I1"]
+    assert list(b.indice.categorias) == ["ensayo"]
+
+
+def test_diario_danado_se_aparta(archivo, tmp_path):
+    b = bib.Biblioteca(archivo)
+    b.añadir_libro(bib.Libro("Uno", "Autor", "Novela", "I1"))
+    b.diario.cerrar()
+    with open(archivo + ".log", "ab") as f:
+        f.write(b'{"op":"alta_li\n')
+
+    b = bib.Biblioteca(archivo)
+    assert sorted(b.libros) == ["I1"]
+    assert len(list(tmp_path.glob("biblioteca.json.log.corrupt-*"))) == 1
+    b.añadir_libro(bib.Libro("Dos", "Autor", "Novela", "I2"))
+    b.diario.cerrar()
+
+    b = bib.Biblioteca(archivo)
+    assert sorted(b.libros) == ["I1", "I2"]
+
+
+def test_consulta_a_futuro_no_cambia_el_presente(archivo):
+    b = bib.Biblioteca(archivo)
+    for i in range(3):
+        b.añadir_libro(bib.Libro(f"Libro {i}", "Autor", "Novela", f"I{i}"))
+    b.registrar_usuario(bib.Usuario("Ana", "U1"))
+    b.prestar("I0", "U1", dias=2)
+    b.prestar("I1", "U1", dias=5)
+    b.prestar("I2", "U1", dias=-1)
+    en_10_dias = time.time() + 10 * 86400
+
+    assert b.vencidos_de("U1", ahora=en_10_dias) == 3
+    assert [v[0] for v in b.prestamos_vencidos(ahora=en_10_dias)] == ["I2", "I0", "I1"]
+    assert b.proximos_a_vencer(5, ahora=time.time() + 3 * 86400)[0][0] == "I1"
+
+    # A la hora real sólo I2 está vencido
+    assert [v[0] for v in b.prestamos_vencidos()] == ["I2"]
+    assert b.vencidos_de("U1") == 1
+    assert [p[0] for p in b.proximos_a_vencer(5)] == ["I0", "I1"]
+    assert b.prestamos_vencidos(ahora=time.time() - 2 * 86400) == []
+
+
+def _catalogo(tmp_path, filas):
+    ruta = tmp_path / "catalogo.csv"
+    ruta.write_text("titulo,autor,categoria,isbn\n" + "".join(f + "\n" for f in filas),
+                    encoding="utf-8")
+    return str(ruta)
+
+
+def test_importar_catalogo(archivo, tmp_path):
+    b = bib.Biblioteca(archivo)
+    b.añadir_libro(bib.Libro("Uno", "Autor", "Novela", "I1"))
+    ruta = _catalogo(tmp_path, ["Dos,Autor,Novela,I2", "Uno bis,Autor,,I1",
+                                "Dos bis,Autor,,I2", ",Autor,,I3"])
+    assert b.importar_catalogo(ruta) == (1, [(3, "ISBN I1 repetido"), (4, "ISBN I2 repetido"),
+                                             (5, "falta ISBN, título o autor")])
+    b.diario.cerrar()
+
+    b = bib.Biblioteca(archivo)
+    assert sorted(b.libros) == ["I1", "I2"]
+    assert b.libros["I2"].get_titulo() == "Dos"
+
+
+def test_importar_catalogo_sin_poder_guardar(archivo, tmp_path, monkeypatch):
+    b = bib.Biblioteca(archivo)
+    b.añadir_libro(bib.Libro("Uno", "Autor", "Novela", "I1"))
+    monkeypatch.setattr(b, "_guardar_archivo", lambda: False)
+    with pytest.raises(OSError):
+        b.importar_catalogo(_catalogo(tmp_path, ["Dos,Autor,Novela,I2"]))
+    assert sorted(b.libros) == ["I1"]
+    assert b.indice.por_categoria("novela") == ["I1"]
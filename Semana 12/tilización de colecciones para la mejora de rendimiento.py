@@ -4,21 +4,52 @@ Biblioteca Digital - Sistema de Gestión
 - Funcionalidades:
   - Añadir / quitar libros
   - Registrar / dar de baja usuarios
-  - Prestar / devolver libros
+  - Prestar / devolver libros (con fecha de vencimiento)
+  - Préstamos vencidos y próximos a vencer
   - Buscar libros por título, autor o categoría
   - Listar libros prestados por usuario
 - Estructuras utilizadas:
   - Tuplas para atributos inmutables del libro (título, autor)
-  - Listas para los libros prestados por usuario
+  - Conjuntos ordenados (dict con valores None) para los libros prestados por usuario
   - Diccionarios para catálogo de libros por ISBN
   - Conjuntos para IDs de usuarios únicos
+  - Montículo (heapq) de vencimientos: préstamos ordenados por fecha límite
+  - Índice invertido (IndiceLibros) para buscar por título / autor / categoría
+    sin recorrer todo el catálogo
+- Importación masiva por consola (sin el menú), desde un CSV (separado por
+  comas) con columnas titulo, autor, categoria, isbn:
+    python "<este archivo>" importar catalogo.csv [--archivo biblioteca.json] [--reporte errores.csv]
 - Persistencia:
-  - Guarda y carga en archivo JSON 'biblioteca.json' (manejo de excepciones incluido)
+  - Foto completa en 'biblioteca.json' (manejo de excepciones incluido) más un
+    diario 'biblioteca.json.log' con una línea por operación (alta, baja,
+    préstamo, devolución...). Cada cambio sólo añade su línea; el fsync se
+    agrupa (uno por ventana de tiempo) y cada tantas operaciones se reescribe
+    la foto y se vacía el diario. Al cargar: foto + diario reproducido.
 """
 
+import argparse
+import csv
+import heapq
 import json
 import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from array import array
 from datetime import datetime
+from functools import lru_cache
+
+VENTANA_FSYNC = 0.1         # segundos: como mucho un fsync del diario por ventana
+OPS_POR_SNAPSHOT = 5000     # operaciones en el diario antes de reescribir la foto
+DIAS_PRESTAMO = 14          # plazo por defecto de un préstamo
+COLUMNAS_CATALOGO = ("titulo", "autor", "categoria", "isbn")
+
+
+def _fecha(segundos):
+    return datetime.fromtimestamp(segundos).strftime("%Y-%m-%d")
+
 
 # -------------------------
 # Clase Libro
@@ -78,12 +109,13 @@ class Usuario:
     Representa un usuario de la biblioteca.
     - nombre: string
     - user_id: identificador único (string)
-    - prestados: lista de ISBNs de libros actualmente prestados
+    - prestados: ISBNs de libros actualmente prestados, en orden de préstamo
+      (dict usado como conjunto ordenado: alta, baja y "in" en O(1))
     """
     def __init__(self, nombre, user_id):
         self.nombre = str(nombre)
         self.user_id = str(user_id)
-        self.prestados = []  # lista de ISBNs
+        self.prestados = {}  # isbn -> None
 
     def get_nombre(self):
         return self.nombre
@@ -95,12 +127,10 @@ class Usuario:
         return list(self.prestados)  # devolver copia
 
     def prestar_libro(self, isbn):
-        if isbn not in self.prestados:
-            self.prestados.append(isbn)
+        self.prestados[isbn] = None
 
     def devolver_libro(self, isbn):
-        if isbn in self.prestados:
-            self.prestados.remove(isbn)
+        self.prestados.pop(isbn, None)
 
     def to_dict(self):
         return {
@@ -112,13 +142,324 @@ class Usuario:
     @staticmethod
     def from_dict(d):
         u = Usuario(d["nombre"], d["user_id"])
-        u.prestados = list(d.get("prestados", []))
+        u.prestados = dict.fromkeys(d.get("prestados", []))
         return u
 
     def __str__(self):
         return f"{self.nombre} (ID: {self.user_id}) - Prestados: {len(self.prestados)}"
 
 
+# -------------------------
+# Índice de búsqueda
+# -------------------------
+@lru_cache(maxsize=65536)
+def _plegar_palabra(palabra):
+    if palabra.isascii():
+        return palabra
+    palabra = unicodedata.normalize("NFKD", palabra)
+    return "".join(c for c in palabra if not unicodedata.combining(c))
+
+
+def plegar(texto):
+    """Minúsculas, sin tildes y sólo palabras separadas por un espacio ("Márquez," -> "marquez")."""
+    texto = str(texto).casefold()
+    if not texto.isascii():
+        # NFC primero: así una tilde "suelta" (NFD) no parte la palabra en dos
+        texto = unicodedata.normalize("NFC", texto)
+    # Las palabras se repiten mucho: se pliegan una vez cada una (caché)
+    return " ".join(map(_plegar_palabra, re.findall(r"\w+", texto)))
+
+
+def gramas(texto):
+    """
+    Claves del índice para un texto ya plegado:
+    - trigramas de " " + texto (así " so" = palabra que empieza con "so")
+    - inicio de cada palabra con una letra (" s"), para consultas de una letra
+    """
+    t = " " + texto
+    claves = {t[i:i + 3] for i in range(len(t) - 2)}
+    claves.update(" " + p[0] for p in texto.split())
+    return claves
+
+
+def gramas_consulta(termino):
+    if len(termino) >= 3:
+        return {termino[i:i + 3] for i in range(len(termino) - 2)}
+    return {" " + termino}  # 1-2 letras: palabras que empiezan así
+
+
+class IndiceLibros:
+    """
+    Índice invertido de título y autor (por separado) más categoría -> ISBNs.
+    - Cada libro recibe un número (doc) en orden de alta; las listas de
+      apariciones son array('I') de docs (4 bytes por entrada, ya ordenadas).
+    - Buscar: por cada término se toma la lista más corta de sus gramas y se
+      confirma el texto sólo en esos candidatos. Varios términos = Y (AND).
+    - Al quitar un libro su doc queda como hueco (se saltea al buscar); cuando
+      los huecos son muchos se reconstruye el índice.
+    """
+    CAMPOS = ("titulo", "autor")
+    PESOS = {"titulo": 2, "autor": 1}  # para ordenar resultados de buscar()
+
+    def __init__(self):
+        self._isbns = []       # doc -> isbn (None = quitado)
+        self._docs = {}        # isbn -> doc
+        self._textos = {c: [] for c in self.CAMPOS}   # doc -> " texto plegado " ("" = quitado)
+        self._gramas = {c: {} for c in self.CAMPOS}   # grama -> array('I') de docs
+        self.categorias = {}   # categoría plegada -> set de ISBNs
+        self._categoria = {}   # isbn -> categoría plegada (para sacarlo del set correcto)
+        self._huecos = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def agregar(self, libro):
+        isbn = libro.get_isbn()
+        if isbn in self._docs:
+            self.quitar(libro)
+        doc = len(self._isbns)
+        self._isbns.append(isbn)
+        self._docs[isbn] = doc
+        for campo, texto in zip(self.CAMPOS, libro.info):
+            texto = plegar(texto)
+            self._textos[campo].append(f" {texto} ")
+            indice = self._gramas[campo]
+            for g in gramas(texto):
+                lista = indice.get(g)
+                if lista is None:
+                    lista = indice[g] = array("I")
+                lista.append(doc)
+        self.cambiar_categoria(isbn, libro.get_categoria())
+
+    def quitar(self, libro):
+        isbn = libro.get_isbn()
+        doc = self._docs.pop(isbn, None)
+        if doc is None:
+            return
+        self._isbns[doc] = None
+        for campo in self.CAMPOS:
+            self._textos[campo][doc] = ""
+        self.cambiar_categoria(isbn, None)
+        self._huecos += 1
+        if self._huecos > 1024 and self._huecos * 2 > len(self._isbns):
+            self._reconstruir()
+
+    def cambiar_categoria(self, isbn, nueva):
+        """Pasa el ISBN de la categoría en la que está indexado a 'nueva' (None = ninguna)."""
+        vieja = self._categoria.pop(isbn, None)
+        if vieja is not None:
+            conjunto = self.categorias[vieja]
+            conjunto.discard(isbn)
+            if not conjunto:
+                del self.categorias[vieja]
+        if nueva is not None:
+            nueva = sys.intern(plegar(nueva))  # una sola copia del texto por categoría
+            self.categorias.setdefault(nueva, set()).add(isbn)
+            self._categoria[isbn] = nueva
+
+    def _reconstruir(self):
+        vivos = [d for d, isbn in enumerate(self._isbns) if isbn is not None]
+        isbns = [self._isbns[d] for d in vivos]
+        textos = {c: [self._textos[c][d] for d in vivos] for c in self.CAMPOS}
+        self._isbns, self._docs, self._huecos = isbns, {i: d for d, i in enumerate(isbns)}, 0
+        self._textos = textos
+        for campo in self.CAMPOS:
+            indice = self._gramas[campo] = {}
+            for doc, texto in enumerate(textos[campo]):
+                for g in gramas(texto.strip()):
+                    lista = indice.get(g)
+                    if lista is None:
+                        lista = indice[g] = array("I")
+                    lista.append(doc)
+
+    def _lista_mas_corta(self, termino, campo):
+        """La lista de docs más corta entre los gramas del término (None si alguno no existe)."""
+        indice = self._gramas[campo]
+        mejor = None
+        for g in gramas_consulta(termino):
+            lista = indice.get(g)
+            if lista is None:
+                return None
+            if mejor is None or len(lista) < len(mejor):
+                mejor = lista
+        return mejor
+
+    def buscar(self, consulta, campos=CAMPOS, limite=None):
+        """
+        ISBNs de los libros que contienen todos los términos de 'consulta' en
+        alguno de 'campos' (términos de 1-2 letras: palabras que empiezan así).
+        Orden: palabra completa > inicio de palabra > dentro de una palabra,
+        con más peso el título; empates en orden de alta.
+        """
+        terminos = list(dict.fromkeys(plegar(consulta).split()))
+        if not terminos:
+            return []
+        listas = {}
+        for termino in terminos:
+            listas[termino] = {c: self._lista_mas_corta(termino, c) for c in campos}
+            if all(l is None for l in listas[termino].values()):
+                return []
+        # Del término más selectivo al menos selectivo: cada uno sólo confirma
+        # los docs que sobrevivieron a los anteriores
+        costo = lambda t: sum(len(l) for l in listas[t].values() if l is not None)
+        terminos.sort(key=costo)
+        docs = None
+        aciertos = {}  # (termino, campo) -> docs que lo contienen
+        for termino in terminos:
+            buscado = termino if len(termino) >= 3 else " " + termino
+            encontrados = set()
+            for campo, lista in listas[termino].items():
+                if lista is None:
+                    continue
+                textos = self._textos[campo]
+                revisar = docs if docs is not None and len(docs) < len(lista) else lista
+                hallados = {d for d in revisar if buscado in textos[d]}
+                if docs is not None and revisar is lista:
+                    hallados &= docs
+                aciertos[termino, campo] = hallados
+                encontrados |= hallados
+            docs = encontrados
+            if not docs:
+                return []
+        # Puntaje: por término, el mejor campo (peso x 1, 2 o 3)
+        opciones = [[(aciertos[t, c], self._textos[c], self.PESOS[c], " " + t, f" {t} ")
+                     for c in campos if (t, c) in aciertos] for t in terminos]
+        resultados = []
+        for doc in docs:
+            total = 0
+            for por_campo in opciones:
+                mejor = 0
+                for hallados, textos, peso, inicio, completo in por_campo:
+                    if doc in hallados:
+                        texto = textos[doc]
+                        puntos = peso * (1 + (inicio in texto) + (completo in texto))
+                        if puntos > mejor:
+                            mejor = puntos
+                total += mejor
+            resultados.append((-total, doc))
+        if limite is not None:
+            resultados = heapq.nsmallest(limite, resultados)
+        else:
+            resultados.sort()
+        return [self._isbns[doc] for _, doc in resultados]
+
+    def por_categoria(self, categoria):
+        """ISBNs de la categoría (sin distinguir mayúsculas ni tildes), en orden de alta."""
+        isbns = self.categorias.get(plegar(categoria), ())
+        return sorted(isbns, key=self._docs.__getitem__)
+
+
+# -------------------------
+# Diario de operaciones
+# -------------------------
+class DiarioOperaciones:
+    """
+    Archivo de sólo-añadir con una operación JSON por línea (commit agrupado).
+    - anotar() escribe la línea y la pasa al sistema operativo (sobrevive a un
+      cierre del programa); el fsync (sobrevivir a un corte de luz) se hace en
+      seguida si el último fue hace más de 'ventana' segundos y si no, un hilo
+      lo hace al cumplirse la ventana: todas las operaciones de esa ventana
+      comparten un solo fsync. Con ventana=0 hay un fsync por operación.
+    - Cada registro lleva un número de secuencia "s": la foto guarda el último
+      incluido, así reproducir el diario nunca aplica dos veces lo mismo.
+    - Un corte a mitad de una escritura deja la última línea incompleta: nunca
+      se confirmó, así que al abrir para añadir se recorta hasta la última
+      línea entera (si no, la siguiente operación quedaría pegada a ella).
+    """
+    def __init__(self, ruta, ventana=VENTANA_FSYNC):
+        self.ruta = ruta
+        self.ventana = ventana
+        self.operaciones = 0      # líneas desde la última foto
+        self._f = None
+        self._bloqueo = threading.Lock()
+        self._temporizador = None
+        self._pendiente = False   # hay líneas escritas sin fsync
+        self._ultimo_fsync = 0.0
+
+    def anotar(self, registro):
+        linea = json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._bloqueo:
+            if self._f is None:
+                self._f = self._abrir()
+            self._f.write(linea.encode("utf-8"))
+            self._f.flush()
+            self.operaciones += 1
+            self._pendiente = True
+            espera = self._ultimo_fsync + self.ventana - time.monotonic()
+            if espera <= 0:
+                self._fsync()
+            elif self._temporizador is None:
+                self._temporizador = threading.Timer(espera, self.sincronizar)
+                self._temporizador.daemon = True
+                self._temporizador.start()
+
+    def _abrir(self):
+        f = open(self.ruta, "ab+")
+        fin = pos = f.seek(0, os.SEEK_END)
+        # Buscar hacia atrás el último salto de línea
+        while pos > 0:
+            inicio = max(0, pos - 4096)
+            f.seek(inicio)
+            i = f.read(pos - inicio).rfind(b"\n")
+            if i >= 0:
+                pos = inicio + i + 1
+                break
+            pos = inicio
+        if pos < fin:
+            f.truncate(pos)
+        return f
+
+    def sincronizar(self):
+        """Hace ya el fsync pendiente, si lo hay."""
+        with self._bloqueo:
+            self._fsync()
+
+    def _fsync(self):
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        if self._pendiente and self._f is not None:
+            os.fsync(self._f.fileno())
+            self._pendiente = False
+        self._ultimo_fsync = time.monotonic()
+
+    def leer(self):
+        """
+        Genera los registros del diario. Una última línea sin salto de línea se
+        ignora aunque parezca completa: la escritura se cortó antes de terminar
+        (y _abrir() la recorta al añadir). Una línea dañada en el medio es un ValueError.
+        """
+        if not os.path.exists(self.ruta):
+            return
+        with open(self.ruta, "rb") as f:
+            for n, linea in enumerate(f, 1):
+                if not linea.endswith(b"\n"):
+                    return  # corte a mitad de la última escritura
+                try:
+                    registro = json.loads(linea)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    raise ValueError(f"Línea {n} del diario '{self.ruta}' dañada") from None
+                yield registro
+
+    def vaciar(self):
+        """Tras escribir una foto: el diario empieza de cero."""
+        with self._bloqueo:
+            self._fsync()
+            if self._f is not None:
+                self._f.close()
+                self._f = None
+            with open(self.ruta, "wb"):
+                pass
+            self.operaciones = 0
+
+    def cerrar(self):
+        with self._bloqueo:
+            self._fsync()
+            if self._f is not None:
+                self._f.close()
+                self._f = None
+
+
 # -------------------------
 # Clase Biblioteca
 # -------------------------
@@ -129,13 +470,34 @@ class Biblioteca:
     - usuarios: dict { user_id: Usuario }
     - user_ids: set -> asegura unicidad de los IDs
     - prestamos: dict { isbn: user_id } -> rápido lookup de a quién está prestado un libro
+    - por_usuario: dict { user_id: {isbn: None} } -> índice inverso de prestamos
+      (sólo usuarios con préstamos; consultas en tiempo proporcional al resultado)
+    - fechas: dict { isbn: (desde, vence) } -> segundos epoch (None en préstamos
+      de archivos anteriores a las fechas)
+    - vencimientos: montículo de (vence, isbn, user_id) aún no vencidos; las
+      entradas de préstamos ya devueltos se descartan al salir (borrado perezoso)
+    - vencidos: dict { isbn: user_id } en orden de vencimiento, y
+      vencidos_por_usuario: { user_id: cantidad }, ambos al día con cada cambio
+    - indice: IndiceLibros -> búsquedas por título / autor / categoría sin recorrer todo
+    - diario: DiarioOperaciones -> cada cambio es una línea; la foto completa se
+      reescribe cada 'ops_por_snapshot' operaciones (y al cerrar)
     """
-    def __init__(self, archivo="biblioteca.json"):
+    def __init__(self, archivo="biblioteca.json", ventana_fsync=VENTANA_FSYNC,
+                 ops_por_snapshot=OPS_POR_SNAPSHOT):
         self.libros = {}   # isbn -> Libro
         self.usuarios = {} # user_id -> Usuario
         self.user_ids = set()
         self.prestamos = {} # isbn -> user_id
+        self.por_usuario = {} # user_id -> {isbn: None}
+        self.fechas = {} # isbn -> (desde, vence)
+        self.vencimientos = [] # heap de (vence, isbn, user_id)
+        self.vencidos = {} # isbn -> user_id
+        self.vencidos_por_usuario = {} # user_id -> cantidad
+        self.indice = IndiceLibros()
         self.archivo = archivo
+        self.diario = DiarioOperaciones(archivo + ".log", ventana_fsync)
+        self.ops_por_snapshot = ops_por_snapshot
+        self._secuencia = 0  # número de la última operación (ver DiarioOperaciones)
         self._cargar_archivo()
 
     # ---------- Operaciones de libros ----------
@@ -144,8 +506,7 @@ class Biblioteca:
         if isbn in self.libros:
             print(f"⚠️ Ya existe un libro con ISBN {isbn}.")
             return False
-        self.libros[isbn] = libro
-        self._guardar_archivo()
+        self._registrar({"op": "alta_libro", "libro": libro.to_dict()}, libro)
         print("✅ Libro añadido:")
         print("  ", libro)
         return True
@@ -158,21 +519,60 @@ class Biblioteca:
         if isbn in self.prestamos:
             print("❌ No se puede eliminar: el libro está prestado actualmente.")
             return False
-        removed = self.libros.pop(isbn)
-        self._guardar_archivo()
+        removed = self.libros[isbn]
+        self._registrar({"op": "baja_libro", "isbn": isbn})
         print("🗑️ Libro eliminado:")
         print("  ", removed)
         return True
 
+    def cambiar_categoria(self, isbn, nueva_cat):
+        """Reclasifica un libro (usar esto y no Libro.set_categoria, para mantener el índice)."""
+        libro = self.libros.get(str(isbn))
+        if libro is None:
+            print("❌ No existe ese ISBN en el catálogo.")
+            return False
+        self._registrar({"op": "categoria", "isbn": libro.get_isbn(), "categoria": str(nueva_cat)})
+        return True
+
+    def importar_catalogo(self, ruta):
+        """
+        Alta masiva desde un CSV (columnas titulo, autor, categoria, isbn) sin
+        pasar por añadir_libro: no imprime cada libro ni anota cada alta en el
+        diario, y guarda una sola foto al final. Las filas sin ISBN, título o
+        autor, o con un ISBN que ya está en el catálogo, se saltan.
+        Devuelve (agregados, [(línea, motivo), ...]). Si la foto no se puede
+        guardar, deshace las altas y lanza OSError.
+        """
+        nuevos, errores = [], []
+        with open(ruta, "r", encoding="utf-8-sig", newline="") as f:
+            lector = csv.DictReader(f)
+            faltan = [c for c in COLUMNAS_CATALOGO if c not in (lector.fieldnames or ())]
+            if faltan:
+                raise ValueError(f"faltan columnas en el CSV: {', '.join(faltan)}")
+            for fila in lector:
+                titulo, autor, categoria, isbn = ((fila[c] or "").strip() for c in COLUMNAS_CATALOGO)
+                if not (isbn and titulo and autor):
+                    errores.append((lector.line_num, "falta ISBN, título o autor"))
+                elif isbn in self.libros:  # también cubre los repetidos del mismo archivo
+                    errores.append((lector.line_num, f"ISBN {isbn} repetido"))
+                else:
+                    self._aplicar({"op": "alta_libro"}, Libro(titulo, autor, categoria or "Sin categoría", isbn))
+                    nuevos.append(isbn)
+        if nuevos and not self._guardar_archivo():
+            # Las altas no están en el diario: si quedaran en memoria, lo que se
+            # anote después (un préstamo de esos libros) no se podría reproducir
+            for isbn in nuevos:
+                self._aplicar({"op": "baja_libro", "isbn": isbn})
+            raise OSError(f"no se pudo guardar '{self.archivo}'; no se importó ningún libro")
+        return len(nuevos), errores
+
     # ---------- Operaciones de usuarios ----------
     def registrar_usuario(self, usuario: Usuario):
         uid = usuario.get_id()
         if uid in self.user_ids:
             print("⚠️ Ya existe un usuario con ese ID.")
             return False
-        self.usuarios[uid] = usuario
-        self.user_ids.add(uid)
-        self._guardar_archivo()
+        self._registrar({"op": "alta_usuario", "usuario": usuario.to_dict()}, usuario)
         print("✅ Usuario registrado:", usuario)
         return True
 
@@ -185,14 +585,12 @@ class Biblioteca:
         if self.usuarios[user_id].prestados:
             print("❌ El usuario tiene libros prestados. Debe devolverlos antes de darse de baja.")
             return False
-        del self.usuarios[user_id]
-        self.user_ids.remove(user_id)
-        self._guardar_archivo()
+        self._registrar({"op": "baja_usuario", "user_id": user_id})
         print("🗑️ Usuario dado de baja:", user_id)
         return True
 
     # ---------- Préstamos ----------
-    def prestar(self, isbn, user_id):
+    def prestar(self, isbn, user_id, dias=DIAS_PRESTAMO):
         isbn = str(isbn); user_id = str(user_id)
         if isbn not in self.libros:
             print("❌ ISBN no encontrado en catálogo.")
@@ -204,10 +602,11 @@ class Biblioteca:
             print("❌ El libro ya está prestado a otro usuario.")
             return False
         # Registrar préstamo
-        self.prestamos[isbn] = user_id
-        self.usuarios[user_id].prestar_libro(isbn)
-        self._guardar_archivo()
-        print(f"✅ Libro (ISBN {isbn}) prestado a usuario {user_id}.")
+        desde = int(time.time())
+        vence = desde + int(dias * 86400)
+        self._registrar({"op": "prestar", "isbn": isbn, "user_id": user_id,
+                         "desde": desde, "vence": vence})
+        print(f"✅ Libro (ISBN {isbn}) prestado a usuario {user_id} hasta el {_fecha(vence)}.")
         return True
 
     def devolver(self, isbn, user_id):
@@ -219,27 +618,31 @@ class Biblioteca:
             print("❌ Este libro no está prestado a ese usuario.")
             return False
         # Procesar devolución
-        del self.prestamos[isbn]
-        self.usuarios[user_id].devolver_libro(isbn)
-        self._guardar_archivo()
+        self._registrar({"op": "devolver", "isbn": isbn, "user_id": user_id})
         print(f"📚 Libro (ISBN {isbn}) devuelto por usuario {user_id}.")
         return True
 
     # ---------- Búsquedas ----------
+    # Usan el índice: varias palabras = deben estar todas (en cualquier orden),
+    # sin distinguir mayúsculas ni tildes; primero los que coinciden mejor.
+    def buscar(self, texto, limite=None):
+        """Por título o autor. Devuelve los Libro encontrados."""
+        return [self.libros[i] for i in self.indice.buscar(texto, limite=limite)]
+
     def buscar_por_titulo(self, texto):
-        texto = texto.lower()
-        resultados = [l for l in self.libros.values() if texto in l.get_titulo().lower()]
+        resultados = [self.libros[i] for i in self.indice.buscar(texto, ("titulo",))]
         self._imprimir_lista(resultados, "título")
+        return resultados
 
     def buscar_por_autor(self, texto):
-        texto = texto.lower()
-        resultados = [l for l in self.libros.values() if texto in l.get_autor().lower()]
+        resultados = [self.libros[i] for i in self.indice.buscar(texto, ("autor",))]
         self._imprimir_lista(resultados, "autor")
+        return resultados
 
     def buscar_por_categoria(self, categoria):
-        categoria = categoria.lower()
-        resultados = [l for l in self.libros.values() if categoria == l.get_categoria().lower()]
+        resultados = [self.libros[i] for i in self.indice.por_categoria(categoria)]
         self._imprimir_lista(resultados, "categoría")
+        return resultados
 
     def _imprimir_lista(self, lista, criterio=""):
         if not lista:
@@ -270,27 +673,230 @@ class Biblioteca:
             print("📭 El usuario no tiene libros prestados.")
             return
         print(f"\n📄 Libros prestados a {user.get_nombre()} (ID: {user_id}):")
+        self._actualizar_vencidos()
         for isbn in user.prestados:
             libro = self.libros.get(isbn)
             if libro:
-                print(" ", libro)
+                print(" ", libro, "|", self._estado_vencimiento(isbn))
             else:
                 print("  - ISBN:", isbn, "(no encontrado en catálogo)")
 
+    def _estado_vencimiento(self, isbn):
+        vence = self.fechas.get(isbn, (None, None))[1]
+        if vence is None:
+            return "sin fecha de devolución"
+        if isbn in self.vencidos:
+            return f"⚠️ VENCIDO el {_fecha(vence)}"
+        return f"vence el {_fecha(vence)}"
+
+    # ---------- Consultas de préstamos ----------
+    # Recorren sólo por_usuario de los usuarios pedidos: el costo depende de
+    # cuántos préstamos se devuelven, no de usuarios x préstamos.
+    def prestamos_de(self, user_ids):
+        """{user_id: [isbn, ...]} de varios usuarios (lista vacía si no tiene)."""
+        return {str(uid): list(self.por_usuario.get(str(uid), ())) for uid in user_ids}
+
+    def usuarios_con_prestamos(self):
+        """{user_id: cantidad de libros prestados} sólo de quienes tienen alguno."""
+        return {uid: len(isbns) for uid, isbns in self.por_usuario.items()}
+
+    # ---------- Vencimientos ----------
+    # Lo vencido (a la hora real) sale del montículo a 'vencidos' una sola vez
+    # (O(log n) cada uno): "todos los vencidos" y "los próximos N" cuestan
+    # O(k log n) para k resultados. 'ahora' permite preguntar "¿y si fuera tal
+    # fecha?" sin cambiar ese estado: lo que vencería hasta entonces se lee del
+    # montículo sin sacarlo.
+    def prestamos_vencidos(self, ahora=None):
+        """[(isbn, user_id, vence)] de los préstamos vencidos, del más antiguo al más reciente."""
+        hoy = time.time()
+        self._actualizar_vencidos(hoy)
+        vencidos = [(isbn, uid, self.fechas[isbn][1]) for isbn, uid in self.vencidos.items()]
+        if ahora is None or ahora == hoy:
+            return vencidos
+        if ahora < hoy:
+            return [v for v in vencidos if v[2] <= ahora]
+        return vencidos + [(isbn, uid, vence) for vence, isbn, uid in self._en_cola_hasta(ahora)]
+
+    def proximos_a_vencer(self, n, ahora=None):
+        """[(isbn, user_id, vence)] de los n préstamos (no vencidos a 'ahora') que vencen primero."""
+        hoy = time.time()
+        self._actualizar_vencidos(hoy)
+        ahora = hoy if ahora is None else ahora
+        elegidos = []
+        if ahora < hoy:
+            # Vencidos hoy pero no a esa fecha (ya están en orden de vencimiento)
+            elegidos = [(self.fechas[isbn][1], isbn, uid) for isbn, uid in self.vencidos.items()
+                        if self.fechas[isbn][1] > ahora][:n]
+        cola = self.vencimientos
+        sacados = []
+        while cola and len(elegidos) < n:
+            entrada = heapq.heappop(cola)
+            if self._vigente(*entrada):
+                sacados.append(entrada)
+                if entrada[0] > ahora:
+                    elegidos.append(entrada)
+        for entrada in sacados:
+            heapq.heappush(cola, entrada)
+        return [(isbn, uid, vence) for vence, isbn, uid in elegidos]
+
+    def vencidos_de(self, user_id, ahora=None):
+        """Cuántos préstamos vencidos tiene el usuario."""
+        user_id = str(user_id)
+        if ahora is None:
+            self._actualizar_vencidos()
+            return self.vencidos_por_usuario.get(user_id, 0)
+        return sum(1 for _, uid, _ in self.prestamos_vencidos(ahora) if uid == user_id)
+
+    def _actualizar_vencidos(self, hoy=None):
+        # Sólo con la hora real: lo que se mueve a 'vencidos' no vuelve al montículo
+        hoy = time.time() if hoy is None else hoy
+        cola = self.vencimientos
+        while cola and cola[0][0] <= hoy:
+            vence, isbn, uid = heapq.heappop(cola)
+            if self._vigente(vence, isbn, uid):
+                self.vencidos[isbn] = uid
+                self.vencidos_por_usuario[uid] = self.vencidos_por_usuario.get(uid, 0) + 1
+
+    def _en_cola_hasta(self, ahora):
+        """Entradas vigentes del montículo con vence <= ahora, ordenadas, sin sacarlas."""
+        cola = self.vencimientos
+        hallados = []
+        pendientes = [0] if cola else []
+        while pendientes:
+            # Los hijos de un nodo nunca vencen antes que él: se poda por ahí
+            i = pendientes.pop()
+            if i < len(cola) and cola[i][0] <= ahora:
+                if self._vigente(*cola[i]):
+                    hallados.append(cola[i])
+                pendientes += (2 * i + 1, 2 * i + 2)
+        hallados.sort()
+        return hallados
+
+    def _vigente(self, vence, isbn, uid):
+        # Una entrada del montículo sigue valiendo si es el préstamo actual del libro
+        return (self.prestamos.get(isbn) == uid and isbn not in self.vencidos
+                and self.fechas.get(isbn, (None, None))[1] == vence)
+
+    def _rehacer_vencimientos(self):
+        self.vencimientos = [(vence, isbn, self.prestamos[isbn])
+                             for isbn, (_, vence) in self.fechas.items()
+                             if vence is not None and isbn not in self.vencidos]
+        heapq.heapify(self.vencimientos)
+
+    # ---------- Operaciones (las aplica en memoria y las anota en el diario) ----------
+    def _registrar(self, registro, objeto=None):
+        """Aplica la operación ya validada, la anota y cada tanto escribe la foto."""
+        self._secuencia += 1
+        registro["s"] = self._secuencia
+        self._aplicar(registro, objeto)
+        try:
+            self.diario.anotar(registro)
+        except PermissionError:
+            print("❌ Permiso denegado: no se pudo escribir el diario de la biblioteca.")
+            return False
+        except OSError as e:
+            print("❌ Error escribiendo el diario:", e)
+            return False
+        if self.diario.operaciones >= self.ops_por_snapshot:
+            return self._guardar_archivo()
+        return True
+
+    def _aplicar(self, r, objeto=None):
+        # Mismo código al operar y al reproducir el diario; no valida ni imprime.
+        # objeto: el Libro / Usuario de un alta (al reproducir se arma del registro)
+        op = r.get("op")
+        if op == "alta_libro":
+            libro = objeto or Libro.from_dict(r["libro"])
+            anterior = self.libros.get(libro.get_isbn())
+            if anterior is not None:
+                self.indice.quitar(anterior)
+            self.libros[libro.get_isbn()] = libro
+            self.indice.agregar(libro)
+        elif op == "baja_libro":
+            libro = self.libros.pop(r["isbn"], None)
+            if libro is not None:
+                self.indice.quitar(libro)
+        elif op == "categoria":
+            libro = self.libros.get(r["isbn"])
+            if libro is not None:
+                self.indice.cambiar_categoria(libro.get_isbn(), r["categoria"])
+                libro.set_categoria(r["categoria"])
+        elif op == "alta_usuario":
+            usuario = objeto or Usuario.from_dict(r["usuario"])
+            self.usuarios[usuario.get_id()] = usuario
+            self.user_ids.add(usuario.get_id())
+        elif op == "baja_usuario":
+            self.usuarios.pop(r["user_id"], None)
+            self.user_ids.discard(r["user_id"])
+        elif op == "prestar":
+            self._poner_prestamo(r["isbn"], r["user_id"], r.get("desde"), r.get("vence"))
+        elif op == "devolver":
+            if self.prestamos.get(r["isbn"]) == r["user_id"]:
+                self._quitar_prestamo(r["isbn"])
+            if r["user_id"] in self.usuarios:
+                self.usuarios[r["user_id"]].devolver_libro(r["isbn"])
+
+    def _poner_prestamo(self, isbn, user_id, desde=None, vence=None):
+        # prestamos, por_usuario, fechas, vencidos y Usuario.prestados cambian siempre juntos
+        if isbn in self.prestamos:
+            self._quitar_prestamo(isbn)
+        self.prestamos[isbn] = user_id
+        self.por_usuario.setdefault(user_id, {})[isbn] = None
+        self.fechas[isbn] = (desde, vence)
+        if vence is not None:
+            heapq.heappush(self.vencimientos, (vence, isbn, user_id))
+        if user_id in self.usuarios:
+            self.usuarios[user_id].prestar_libro(isbn)
+
+    def _quitar_prestamo(self, isbn):
+        user_id = self.prestamos.pop(isbn, None)
+        if user_id is None:
+            return
+        self.fechas.pop(isbn, None)
+        if self.vencidos.pop(isbn, None) is not None:
+            self.vencidos_por_usuario[user_id] -= 1
+            if not self.vencidos_por_usuario[user_id]:
+                del self.vencidos_por_usuario[user_id]
+        # La entrada del montículo queda y se descarta al salir; si sobran muchas, se rehace
+        if len(self.vencimientos) > 1024 and len(self.vencimientos) > 2 * len(self.prestamos):
+            self._rehacer_vencimientos()
+        isbns = self.por_usuario.get(user_id)
+        if isbns is not None:
+            isbns.pop(isbn, None)
+            if not isbns:
+                del self.por_usuario[user_id]
+        if user_id in self.usuarios:
+            self.usuarios[user_id].devolver_libro(isbn)
+
+    def sincronizar(self):
+        """fsync ya de lo anotado (sin esperar a que termine la ventana)."""
+        self.diario.sincronizar()
+
+    def cerrar(self):
+        """Al salir: si el diario tiene operaciones, se pasan a la foto."""
+        if self.diario.operaciones:
+            self._guardar_archivo()
+        self.diario.cerrar()
+
     # ---------- Persistencia en archivo ----------
     def _guardar_archivo(self):
+        """Foto completa (incluye hasta la operación _secuencia); después vacía el diario."""
         tmp = self.archivo + ".tmp"
         try:
             data = {
+                "secuencia": self._secuencia,
                 "libros": {isbn: lib.to_dict() for isbn, lib in self.libros.items()},
                 "usuarios": {uid: u.to_dict() for uid, u in self.usuarios.items()},
-                "prestamos": dict(self.prestamos)
+                "prestamos": dict(self.prestamos),
+                "fechas": {isbn: list(f) for isbn, f in self.fechas.items() if f[1] is not None}
             }
             with open(tmp, "w", encoding="utf-8") as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
                 f.flush()
                 os.fsync(f.fileno())
             os.replace(tmp, self.archivo)
+            # Si se corta aquí, la foto ya tiene la secuencia: el diario viejo se saltea
+            self.diario.vaciar()
             # Mensaje opcional:
             # print(f"💾 Archivo '{self.archivo}' actualizado.")
             return True
@@ -320,11 +926,13 @@ class Biblioteca:
                 print(f"🆕 Archivo '{self.archivo}' creado (nuevo catálogo vacío).")
             except PermissionError:
                 print("❌ Permiso denegado: no se puede crear archivo de biblioteca.")
+            self._reproducir_diario()
             return
 
         try:
             with open(self.archivo, "r", encoding="utf-8") as f:
                 data = json.load(f)
+            self._secuencia = int(data.get("secuencia", 0))
             # Cargar libros
             libros_data = data.get("libros", {})
             for isbn, ld in libros_data.items():
@@ -332,6 +940,7 @@ class Biblioteca:
                     self.libros[isbn] = Libro.from_dict(ld)
                 except Exception:
                     continue
+                self.indice.agregar(self.libros[isbn])
             # Cargar usuarios
             usuarios_data = data.get("usuarios", {})
             for uid, ud in usuarios_data.items():
@@ -343,19 +952,24 @@ class Biblioteca:
                     continue
             # Cargar prestamos
             prestamos_data = data.get("prestamos", {})
-            self.prestamos = {str(k): str(v) for k, v in prestamos_data.items()}
-            # Asegurar consistencia: que usuarios tengan sus libros en la lista 'prestados'
-            for isbn, uid in self.prestamos.items():
-                if uid in self.usuarios:
-                    if isbn not in self.usuarios[uid].prestados:
-                        self.usuarios[uid].prestados.append(isbn)
-            print(f"📂 Biblioteca cargada: {len(self.libros)} libros, {len(self.usuarios)} usuarios.")
+            fechas_data = data.get("fechas", {})
+            # Asegurar consistencia: que usuarios tengan sus libros en 'prestados'
+            # (y armar por_usuario); agregar a un conjunto ya es O(1)
+            for isbn, uid in prestamos_data.items():
+                desde, vence = fechas_data.get(isbn) or (None, None)
+                self._poner_prestamo(str(isbn), str(uid), desde, vence)
+            reproducidas = self._reproducir_diario()
+            extra = f" (+{reproducidas} operaciones del diario)" if reproducidas else ""
+            print(f"📂 Biblioteca cargada: {len(self.libros)} libros, {len(self.usuarios)} usuarios.{extra}")
         except json.JSONDecodeError:
             # Archivo corrupto -> renombrar y crear uno nuevo
             ts = datetime.now().strftime("%Y%m%d-%H%M%S")
             corrupt_name = f"{self.archivo}.corrupt-{ts}"
             try:
                 os.replace(self.archivo, corrupt_name)
+                # El diario continuaba esa foto: sin ella no sirve, se aparta también
+                if os.path.exists(self.diario.ruta):
+                    os.replace(self.diario.ruta, f"{self.diario.ruta}.corrupt-{ts}")
                 with open(self.archivo, "w", encoding="utf-8") as f:
                     json.dump({"libros": {}, "usuarios": {}, "prestamos": {}}, f)
                 print(f"⚠️ Archivo corrupto renombrado a '{corrupt_name}'. Se creó un nuevo archivo vacío.")
@@ -366,12 +980,46 @@ class Biblioteca:
         except Exception as e:
             print("❌ Error cargando archivo de biblioteca:", e)
 
+    def _reproducir_diario(self):
+        """Aplica las operaciones del diario posteriores a la foto; devuelve cuántas."""
+        aplicadas = 0
+        try:
+            for r in self.diario.leer():
+                self.diario.operaciones += 1
+                s = r.get("s", 0)
+                if s <= self._secuencia:
+                    continue  # ya estaba en la foto (corte entre foto y vaciado)
+                self._aplicar(r)
+                self._secuencia = s
+                aplicadas += 1
+        except ValueError as e:
+            # Línea dañada en el medio: se conserva lo anterior a ella, el diario
+            # se aparta (si no, cada carga volvería a fallar) y se escribe una foto
+            ts = datetime.now().strftime("%Y%m%d-%H%M%S")
+            apartado = f"{self.diario.ruta}.corrupt-{ts}"
+            try:
+                os.replace(self.diario.ruta, apartado)
+            except OSError as ex:
+                print("❌ No se pudo apartar el diario dañado:", ex)
+                return aplicadas
+            print(f"⚠️ {e}: diario renombrado a '{apartado}'. "
+                  f"Se conservan las operaciones anteriores a esa línea.")
+            self._guardar_archivo()
+        return aplicadas
+
 # -------------------------
 # Interfaz de consola (menú)
 # -------------------------
 def menu():
     biblioteca = Biblioteca()
+    try:
+        _menu(biblioteca)
+    finally:
+        # fsync pendiente y foto con lo que quedó en el diario
+        biblioteca.cerrar()
 
+
+def _menu(biblioteca):
     while True:
         print("\n=== BIBLIOTECA DIGITAL ===")
         print("1. Añadir libro")
@@ -383,6 +1031,7 @@ def menu():
         print("7. Buscar libros (título/autor/categoría)")
         print("8. Mostrar todos los libros")
         print("9. Listar libros prestados por usuario")
+        print("10. Préstamos vencidos y próximos a vencer")
         print("0. Salir")
 
         opcion = input("Selecciona opción: ").strip()
@@ -418,15 +1067,18 @@ def menu():
             biblioteca.devolver(isbn, user_id)
 
         elif opcion == "7":
-            sub = input("Buscar por (t)ítulo, (a)utor o (c)ategoría? ").strip().lower()
-            if sub == "t":
+            sub = input("Buscar por (t)ítulo, (a)utor, (c)ategoría o (g)eneral? ").strip().lower()
+            if sub == "g":
+                tx = input("Palabras del título o autor: ").strip()
+                biblioteca._imprimir_lista(biblioteca.buscar(tx), "título o autor")
+            elif sub == "t":
                 tx = input("Texto de título: ").strip()
                 biblioteca.buscar_por_titulo(tx)
             elif sub == "a":
                 tx = input("Texto de autor: ").strip()
                 biblioteca.buscar_por_autor(tx)
             elif sub == "c":
-                tx = input("Categoría (exacta): ").strip()
+                tx = input("Categoría (exacta, sin importar tildes): ").strip()
                 biblioteca.buscar_por_categoria(tx)
             else:
                 print("❌ Opción inválida de búsqueda.")
@@ -438,6 +1090,15 @@ def menu():
             user_id = input("ID de usuario: ").strip()
             biblioteca.listar_prestados_por_usuario(user_id)
 
+        elif opcion == "10":
+            vencidos = biblioteca.prestamos_vencidos()
+            print(f"\n⚠️ Préstamos vencidos: {len(vencidos)}")
+            for isbn, uid, vence in vencidos:
+                print(f"  ISBN {isbn} | usuario {uid} | venció el {_fecha(vence)}")
+            print("\n⏳ Próximos a vencer:")
+            for isbn, uid, vence in biblioteca.proximos_a_vencer(10):
+                print(f"  ISBN {isbn} | usuario {uid} | vence el {_fecha(vence)}")
+
         elif opcion == "0":
             print("👋 Saliendo. ¡Hasta luego!")
             break
@@ -446,6 +1107,33 @@ def menu():
             print("❌ Opción inválida. Intenta de nuevo.")
 
 
+# -------------------------
+# Importación por consola
+# -------------------------
+def main_importar(argv):
+    parser = argparse.ArgumentParser(description="Importar un catálogo CSV a la biblioteca.")
+    parser.add_argument("accion", choices=("importar",))
+    parser.add_argument("catalogo", help="CSV con columnas titulo, autor, categoria, isbn")
+    parser.add_argument("--archivo", default="biblioteca.json")
+    parser.add_argument("--reporte", help="CSV donde escribir las filas rechazadas (línea, motivo)")
+    args = parser.parse_args(argv)
+
+    biblioteca = Biblioteca(args.archivo)
+    try:
+        agregados, errores = biblioteca.importar_catalogo(args.catalogo)
+        print(f"📥 Importados {agregados} libros ({len(errores)} filas con error).")
+        if errores and args.reporte:
+            with open(args.reporte, "w", encoding="utf-8", newline="") as f:
+                csv.writer(f).writerows([("linea", "motivo")] + errores)
+            print(f"📝 Filas rechazadas en '{args.reporte}'.")
+    except (OSError, ValueError, csv.Error) as e:
+        print("❌ No se pudo importar:", e)
+        return 1
+    finally:
+        biblioteca.cerrar()
+    return 2 if errores else 0
+
+
 # -------------------------
 # Pruebas automáticas simples (se ejecutan si corres este archivo directamente)
 # -------------------------
@@ -459,8 +1147,9 @@ def pruebas_demo():
 
     # Limpiar demo previo (no borrar archivos reales)
     try:
-        if os.path.exists("biblioteca_demo.json"):
-            os.remove("biblioteca_demo.json")
+        for ruta in ("biblioteca_demo.json", "biblioteca_demo.json.log"):
+            if os.path.exists(ruta):
+                os.remove(ruta)
     except Exception:
         pass
 
@@ -472,6 +1161,7 @@ def pruebas_demo():
     b.prestar("ISBN-1002", "U100")
     b.listar_prestados_por_usuario("U100")
     b.mostrar_todos()
+    b.cerrar()
     print("=== FIN DEMO ===\n")
 
 
@@ -481,4 +1171,6 @@ def pruebas_demo():
 if __name__ == "__main__":
     # Si quieres ejecutar la demo al inicio descomenta la línea siguiente:
     # pruebas_demo()
+    if len(sys.argv) > 1:
+        sys.exit(main_importar(sys.argv[1:]))
     menu()
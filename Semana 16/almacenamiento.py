@@ -0,0 +1,173 @@
+# almacenamiento.py
+# Formatos de archivo para el snapshot del Inventario.
+#   - AlmacenJSON:    arreglo JSON con indentación (formato original de inventario.txt)
+#   - AlmacenBinario: registros de tamaño fijo (struct) + tabla de strings, leído con mmap
+# El formato se elige por la extensión del archivo (ver almacen_para).
+# Conversión por consola:  python almacenamiento.py inventario.txt inventario.bin
+import json
+import mmap
+import struct
+import sys
+from functools import partial
+from pathlib import Path
+
+TAM_BLOQUE = 64 * 1024  # bytes leídos por vez en la carga incremental
+EXTENSIONES_BINARIAS = (".bin", ".inv")
+_PLANTILLA_JSON = (
+    '  {\n    "codigo": %s,\n    "nombre": %s,\n'
+    '    "cantidad": %d,\n    "precio": %s\n  }'
+)
+
+
+def _saltar_espacios(buf: str, pos: int, extra: str = "") -> int:
+    while pos < len(buf) and (buf[pos].isspace() or buf[pos] in extra):
+        pos += 1
+    return pos
+
+
+class AlmacenJSON:
+    """Arreglo JSON indentado; se lee y escribe producto a producto."""
+
+    def leer(self, ruta: Path):
+        """
+        Genera los objetos del archivo uno a uno, sin leerlo completo en memoria.
+        Acepta un arreglo JSON ([{...}, {...}]) o JSON-lines (un objeto por línea).
+        """
+        decoder = json.JSONDecoder()
+        with ruta.open("r", encoding="utf-8") as f:
+            buf = f.read(TAM_BLOQUE)
+            pos = _saltar_espacios(buf, 0)
+            arreglo = buf[pos:pos + 1] == "["
+            if arreglo:
+                pos += 1
+            fin_archivo = False
+            while True:
+                pos = _saltar_espacios(buf, pos, ",")
+                if pos >= len(buf):
+                    if fin_archivo:
+                        if arreglo:
+                            raise ValueError("arreglo JSON sin cerrar")
+                        return
+                    buf, pos = buf[pos:] + f.read(TAM_BLOQUE), 0
+                    fin_archivo = pos >= len(buf)
+                    continue
+                if arreglo and buf[pos] == "]":
+                    return
+                try:
+                    obj, fin = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    # Objeto cortado al final del bloque: leer más y reintentar
+                    mas = f.read(TAM_BLOQUE)
+                    if not mas:
+                        raise
+                    buf, pos = buf[pos:] + mas, 0
+                    continue
+                yield obj
+                pos = fin
+                if pos > TAM_BLOQUE:
+                    buf, pos = buf[pos:], 0
+
+    def escribir(self, ruta: Path, productos) -> None:
+        # Mismo texto que json.dumps(lista, ensure_ascii=False, indent=2), pero
+        # producto a producto y sin el codificador con indentación (que es lento)
+        texto = partial(json.dumps, ensure_ascii=False)
+        with ruta.open("w", encoding="utf-8") as f:
+            primero = True
+            for p in productos:
+                f.write(("[\n" if primero else ",\n") + _PLANTILLA_JSON % (
+                    texto(p.codigo), texto(p.nombre), p.cantidad, texto(p.precio)))
+                primero = False
+            f.write("[]" if primero else "\n]")
+
+
+class AlmacenBinario:
+    """
+    Snapshot binario:
+      cabecera  <4sII   : firma, versión, cantidad de productos
+      registros <IIIIqq : (offset, largo) de código y de nombre, cantidad, centavos
+      strings   UTF-8 concatenados (los nombres repetidos se guardan una sola vez)
+    """
+    FIRMA = b"INVB"
+    VERSION = 2
+    CABECERA = struct.Struct("<4sII")
+    REGISTRO = struct.Struct("<IIIIqq")
+
+    def leer(self, ruta: Path):
+        with ruta.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            firma, version, n = self.CABECERA.unpack_from(mm, 0)
+            if firma != self.FIRMA or version != self.VERSION:
+                raise ValueError(f"{ruta} no es un inventario binario v{self.VERSION}")
+            registro = self.REGISTRO
+            base = self.CABECERA.size + n * registro.size
+            cache: dict[int, str] = {}
+            for i in range(n):
+                oc, lc, on, ln, cantidad, centavos = registro.unpack_from(
+                    mm, self.CABECERA.size + i * registro.size)
+                nombre = cache.get(on)
+                if nombre is None:
+                    nombre = cache[on] = mm[base + on:base + on + ln].decode("utf-8")
+                yield {
+                    "codigo": mm[base + oc:base + oc + lc].decode("utf-8"),
+                    "nombre": nombre,
+                    "cantidad": cantidad,
+                    "centavos": centavos,
+                }
+
+    def escribir(self, ruta: Path, productos) -> None:
+        registros = bytearray()
+        strings = bytearray()
+        offsets: dict[str, tuple[int, int]] = {}
+
+        def _string(s: str, compartir: bool) -> tuple[int, int]:
+            if compartir and s in offsets:
+                return offsets[s]
+            b = s.encode("utf-8")
+            ref = (len(strings), len(b))
+            strings.extend(b)
+            if compartir:
+                offsets[s] = ref
+            return ref
+
+        n = 0
+        for p in productos:
+            oc, lc = _string(p.codigo, False)
+            on, ln = _string(p.nombre, True)
+            registros += self.REGISTRO.pack(oc, lc, on, ln, p.cantidad, p.centavos)
+            n += 1
+        with ruta.open("wb") as f:
+            f.write(self.CABECERA.pack(self.FIRMA, self.VERSION, n))
+            f.write(registros)
+            f.write(strings)
+
+
+def almacen_para(ruta) -> AlmacenJSON | AlmacenBinario:
+    """Elige el formato según la extensión (.bin/.inv = binario, resto = JSON)."""
+    if Path(ruta).suffix.lower() in EXTENSIONES_BINARIAS:
+        return AlmacenBinario()
+    return AlmacenJSON()
+
+
+def convertir(origen, destino) -> int:
+    """Convierte un snapshot entre formatos. Devuelve la cantidad de productos."""
+    from producto import Producto
+    origen, destino = Path(origen), Path(destino)
+    if origen.resolve() == destino.resolve():
+        raise ValueError("origen y destino deben ser archivos distintos")
+    total = 0
+
+    def _productos():
+        nonlocal total
+        for d in almacen_para(origen).leer(origen):
+            total += 1
+            yield Producto(**d)
+
+    almacen_para(destino).escribir(destino, _productos())
+    return total
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python almacenamiento.py <origen> <destino>")
+        sys.exit(1)
+    total = convertir(sys.argv[1], sys.argv[2])
+    print(f"{total} producto(s) convertidos: {sys.argv[1]} -> {sys.argv[2]}")
@@ -0,0 +1,57 @@
+# bench_inicio.py
+# Tiempo hasta el primer cuadro de main.App: desde que arranca el proceso hasta
+# que la ventana está visible. Compara la caché de imágenes vacía (importa PIL y
+# escala, como antes en cada arranque) con la caché llena (sólo Tk lee los PNG).
+# Necesita una pantalla (Tk) y Pillow. Uso: python bench_inicio.py [repeticiones]
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+CARPETA = Path(__file__).parent
+
+
+def _hijo(inicio: float, cache: str) -> None:
+    import imagenes
+    imagenes.CARPETA_CACHE = Path(cache)
+    import main
+    app = main.App()
+    app.wait_visibility()
+    app.update()
+    print(time.time() - inicio)
+    app._salir()
+
+
+def _medir(cache: str) -> float:
+    inicio = time.time()
+    salida = subprocess.run(
+        [sys.executable, __file__, "--hijo", str(inicio), cache],
+        cwd=CARPETA, capture_output=True, text=True, check=True,
+    )
+    return float(salida.stdout.split()[-1])
+
+
+def main(repeticiones: int = 5) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        # Caché vacía: una carpeta nueva por arranque
+        frio = [_medir(str(Path(tmp) / f"frio{i}")) for i in range(repeticiones)]
+        # Caché llena: el primer arranque la completa y no se cuenta
+        llena = str(Path(tmp) / "llena")
+        _medir(llena)
+        caliente = [_medir(llena) for _ in range(repeticiones)]
+
+    print(f"{'caché':<8} {'mediana':>10} {'mín':>10} {'máx':>10}")
+    for nombre, tiempos in (("vacía", frio), ("llena", caliente)):
+        ms = [t * 1000 for t in tiempos]
+        print(f"{nombre:<8} {statistics.median(ms):>8.0f}ms {min(ms):>8.0f}ms {max(ms):>8.0f}ms")
+    ganancia = statistics.median(frio) / statistics.median(caliente)
+    print(f"primer cuadro {ganancia:.1f}x más rápido con la caché llena")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--hijo":
+        _hijo(float(sys.argv[2]), sys.argv[3])
+    else:
+        main(*(int(a) for a in sys.argv[1:2]))
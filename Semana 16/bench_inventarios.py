@@ -0,0 +1,345 @@
+# bench_inventarios.py
+# Compara las clases Inventario de las Semanas 9, 10, 11 y 16 con las mismas
+# cargas de trabajo, sin pasar por menu():
+#   agregar / actualizar / eliminar / buscar: 'operaciones' llamadas sobre un
+#       catálogo sintético de 'productos' (cada carga empieza de un catálogo nuevo)
+#   cargar / guardar: el catálogo completo, 'repeticiones' veces
+# Mide operaciones por segundo, latencia (p50 / p95 / p99), pico de memoria
+# (tracemalloc, en una segunda pasada corta para no distorsionar los tiempos) y bytes
+# escritos a disco (wchar de /proc/self/io; sólo en Linux).
+# Si alguna implementación imprime algo, esa salida se descarta.
+# Uso: python bench_inventarios.py [--productos 5000] [--operaciones 500]
+#                                  [--semilla 1] [--json resultados.json | --json -]
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from pathlib import Path
+from inventario import Inventario
+from producto import Producto
+
+RAIZ = Path(__file__).resolve().parent.parent
+CARGAS = ("agregar", "actualizar", "eliminar", "buscar", "cargar", "guardar")
+MUESTRA_MEMORIA = 20  # llamadas de la pasada con tracemalloc (el pico se alcanza enseguida)
+_PALABRAS = ("Tornillo", "Tuerca", "Arandela", "Clavo", "Perno", "Bisagra", "Taco", "Grapa")
+_MATERIALES = ("acero", "bronce", "zinc", "plástico", "inox")
+
+
+def _cargar_modulo(nombre: str, ruta: Path):
+    """Importa un archivo .py por ruta (los de las otras semanas tienen espacios en el nombre)."""
+    spec = importlib.util.spec_from_file_location(nombre, ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def catalogo(n: int, semilla: int, desde: int = 0) -> list[tuple]:
+    """Productos sintéticos reproducibles: (id, nombre, cantidad, precio)."""
+    r = random.Random(semilla * 1_000_003 + desde)
+    return [(i, f"{r.choice(_PALABRAS)} {r.choice(_MATERIALES)} {i % 997}",
+             r.randrange(1000), r.randrange(1, 100_000) / 100)
+            for i in range(desde, desde + n)]
+
+
+# ---------- Adaptadores ----------
+# Una clase por implementación con las mismas operaciones. Las que la
+# implementación no tiene (p. ej. guardar en la Semana 9) quedan en None.
+class Adaptador(ABC):
+    nombre = ""
+    archivo = "inventario.json"
+
+    def __init__(self, carpeta: Path):
+        self.ruta = carpeta / self.archivo
+
+    @abstractmethod
+    def preparar(self, productos):
+        """Inventario con 'productos' ya cargados (fuera de la medición)."""
+
+    agregar = actualizar = eliminar = buscar = cargar = guardar = None
+
+
+class _Consola(Adaptador):
+    """Semanas 9 y 10: lista de Producto, ID string."""
+    modulo = None
+
+    def _producto(self, t):
+        i, nombre, cantidad, precio = t
+        return self.modulo.Producto(str(i), nombre, cantidad, precio)
+
+    def agregar(self, inv, t):
+        inv.agregar_producto(self._producto(t))
+
+    def actualizar(self, inv, t):
+        inv.actualizar_producto(str(t[0]), t[2] + 1, t[3])
+
+    def eliminar(self, inv, t):
+        inv.eliminar_producto(str(t[0]))
+
+    def buscar(self, inv, texto):
+        inv.buscar_producto(texto)
+
+
+class Semana9(_Consola):
+    nombre = "semana9"
+
+    def preparar(self, productos):
+        inv = self.modulo.Inventario()
+        inv.productos = [self._producto(t) for t in productos]
+        return inv
+
+
+class Semana10(_Consola):
+    nombre = "semana10"
+    archivo = "inventario.txt"
+
+    def preparar(self, productos):
+        self.ruta.unlink(missing_ok=True)
+        inv = self.modulo.Inventario(str(self.ruta))
+        inv.productos = [self._producto(t) for t in productos]
+        inv._guardar_archivo()
+        return self.cargar()
+
+    def cargar(self, inv=None):
+        return self.modulo.Inventario(str(self.ruta))
+
+    def guardar(self, inv):
+        inv._guardar_archivo()
+
+
+class Semana11(Adaptador):
+    """Dict {id entero: Producto}; buscar compara el nombre completo."""
+    nombre = "semana11"
+
+    def preparar(self, productos):
+        self.ruta.unlink(missing_ok=True)
+        inv = self.modulo.Inventario(str(self.ruta))
+        inv.productos = {t[0]: self.modulo.Producto(*t) for t in productos}
+        inv.guardar_en_archivo()
+        return self.cargar()
+
+    def agregar(self, inv, t):
+        inv.agregar_producto(self.modulo.Producto(*t))
+
+    def actualizar(self, inv, t):
+        inv.actualizar_producto(t[0], t[2] + 1, t[3])
+
+    def eliminar(self, inv, t):
+        inv.eliminar_producto(t[0])
+
+    def buscar(self, inv, texto):
+        inv.buscar_producto(texto)
+
+    def cargar(self, inv=None):
+        return self.modulo.Inventario(str(self.ruta))
+
+    def guardar(self, inv):
+        inv.guardar_en_archivo()
+
+
+class Semana16(Adaptador):
+    nombre = "semana16"
+    archivo = "inventario.txt"
+    opciones: dict = {}
+
+    def preparar(self, productos):
+        for ruta in (self.ruta, self.ruta.with_name(self.ruta.name + ".log")):
+            ruta.unlink(missing_ok=True)
+        inv = Inventario(str(self.ruta), **self.opciones)
+        with inv.lote():
+            for t in productos:
+                inv.agregar(self._producto(t))
+        inv.guardar()
+        return self.cargar()
+
+    @staticmethod
+    def _producto(t):
+        i, nombre, cantidad, precio = t
+        return Producto(f"P{i}", nombre, cantidad, precio)
+
+    def agregar(self, inv, t):
+        inv.agregar(self._producto(t))
+
+    def actualizar(self, inv, t):
+        inv.modificar(f"P{t[0]}", t[1], t[2] + 1, t[3])
+
+    def eliminar(self, inv, t):
+        inv.eliminar(f"P{t[0]}")
+
+    def buscar(self, inv, texto):
+        inv.consultar(texto)
+
+    def cargar(self, inv=None):
+        return Inventario(str(self.ruta), **self.opciones)
+
+    def guardar(self, inv):
+        inv.guardar()
+
+
+class Semana16Diario(Semana16):
+    nombre = "semana16-diario"
+    opciones = {"diario": True}
+
+
+class Semana16Indice(Semana16):
+    nombre = "semana16-diario-indice"
+    opciones = {"diario": True, "columnar": True, "indice_busqueda": True}
+
+
+def adaptadores() -> list[type[Adaptador]]:
+    Semana9.modulo = _cargar_modulo("semana9", RAIZ / "Semana 9" / "Sistema de Gestión de Inventarios.py")
+    Semana10.modulo = _cargar_modulo("semana10", RAIZ / "Semana 10" / "Sitema de Gestión de Inventario Mejorado.py")
+    Semana11.modulo = _cargar_modulo("semana11", RAIZ / "Semana 11" / "Sistema Avanzado de Gestión de Inventario.py")
+    return [Semana9, Semana10, Semana11, Semana16, Semana16Diario, Semana16Indice]
+
+
+# ---------- Medición ----------
+def _bytes_escritos() -> int | None:
+    try:
+        with open("/proc/self/io", "rb") as f:
+            for linea in f:
+                if linea.startswith(b"wchar:"):
+                    return int(linea.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _percentil(ordenados: list[int], p: float) -> float:
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))] / 1e6
+
+
+def _argumentos(carga: str, productos: list[tuple], operaciones: int, repeticiones: int, semilla: int):
+    """Argumentos de cada llamada de la carga (los mismos para todas las implementaciones)."""
+    r = random.Random(semilla)
+    if carga == "agregar":
+        return catalogo(operaciones, semilla, desde=len(productos))
+    if carga in ("actualizar", "eliminar"):
+        return r.sample(productos, min(operaciones, len(productos)))
+    if carga == "buscar":
+        return [r.choice(productos)[1] for _ in range(operaciones)]
+    return [None] * repeticiones
+
+
+def _correr(adaptador: Adaptador, carga: str, productos, argumentos, memoria: bool) -> dict:
+    """Una pasada de la carga sobre un catálogo recién preparado."""
+    operacion = getattr(adaptador, carga)
+    completo = carga in ("cargar", "guardar")
+    if memoria:
+        # Desde antes de preparar: el pico incluye el catálogo en memoria
+        tracemalloc.start()
+    inv = adaptador.preparar(productos)
+    if memoria:
+        tracemalloc.reset_peak()
+        for a in argumentos[:MUESTRA_MEMORIA]:
+            operacion(inv) if completo else operacion(inv, a)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return {"pico_memoria_bytes": pico}
+    latencias = []
+    antes = _bytes_escritos()
+    for a in argumentos:
+        t = time.perf_counter_ns()
+        operacion(inv) if completo else operacion(inv, a)
+        latencias.append(time.perf_counter_ns() - t)
+    despues = _bytes_escritos()
+    latencias.sort()
+    total = sum(latencias) / 1e9
+    return {
+        "operaciones": len(latencias),
+        "ops_por_segundo": len(latencias) / total if total > 0 else None,
+        "p50_ms": _percentil(latencias, 0.50),
+        "p95_ms": _percentil(latencias, 0.95),
+        "p99_ms": _percentil(latencias, 0.99),
+        "media_ms": statistics.fmean(latencias) / 1e6,
+        "bytes_escritos": None if antes is None else despues - antes,
+    }
+
+
+def medir(adaptador: Adaptador, carga: str, productos, operaciones: int,
+          repeticiones: int, semilla: int, memoria: bool = True) -> dict | None:
+    """Resultados de una carga, o None si la implementación no la tiene."""
+    if getattr(adaptador, carga) is None:
+        return None
+    argumentos = _argumentos(carga, productos, operaciones, repeticiones, semilla)
+    # Lo que imprimen las versiones de consola se descarta
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultado = _correr(adaptador, carga, productos, argumentos, memoria=False)
+        resultado["pico_memoria_bytes"] = None
+        if memoria:
+            resultado.update(_correr(adaptador, carga, productos, argumentos, memoria=True))
+    return resultado
+
+
+# ---------- Informe ----------
+def _fmt(valor, formato: str) -> str:
+    return "-" if valor is None else format(valor, formato)
+
+
+def imprimir(resultados: dict) -> None:
+    print(f"{resultados['productos']:,} productos, {resultados['operaciones']:,} operaciones, "
+          f"semilla {resultados['semilla']}")
+    for carga in CARGAS:
+        print(f"\n{carga}")
+        print(f"  {'implementación':<24} {'ops/s':>11} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+              f"{'pico MB':>8} {'escrito MB':>10}")
+        for nombre, cargas in resultados["implementaciones"].items():
+            r = cargas.get(carga)
+            if r is None:
+                print(f"  {nombre:<24} {'(no tiene)':>11}")
+                continue
+            pico = None if r["pico_memoria_bytes"] is None else r["pico_memoria_bytes"] / 1e6
+            escrito = None if r["bytes_escritos"] is None else r["bytes_escritos"] / 1e6
+            print(f"  {nombre:<24} {_fmt(r['ops_por_segundo'], '11,.0f')} {r['p50_ms']:9.3f} "
+                  f"{r['p95_ms']:9.3f} {r['p99_ms']:9.3f} {_fmt(pico, '8.1f')} {_fmt(escrito, '10.2f')}")
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description="Benchmark de las clases Inventario (Semanas 9, 10, 11 y 16).")
+    parser.add_argument("--productos", type=int, default=5000, help="tamaño del catálogo sintético")
+    parser.add_argument("--operaciones", type=int, default=500, help="llamadas por carga de trabajo")
+    parser.add_argument("--repeticiones", type=int, default=5, help="veces que se carga / guarda el catálogo")
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--solo", nargs="*", help="implementaciones a medir (por nombre)")
+    parser.add_argument("--cargas", nargs="*", choices=CARGAS, default=list(CARGAS))
+    parser.add_argument("--sin-memoria", action="store_true", help="no hacer la pasada con tracemalloc")
+    parser.add_argument("--json", help="archivo de resultados JSON ('-' = salida estándar)")
+    args = parser.parse_args(argv)
+
+    productos = catalogo(args.productos, args.semilla)
+    resultados = {"productos": args.productos, "operaciones": args.operaciones,
+                  "repeticiones": args.repeticiones, "semilla": args.semilla,
+                  "python": sys.version.split()[0], "implementaciones": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for clase in adaptadores():
+            if args.solo and clase.nombre not in args.solo:
+                continue
+            carpeta = Path(tmp) / clase.nombre
+            carpeta.mkdir()
+            adaptador = clase(carpeta)
+            resultados["implementaciones"][clase.nombre] = {
+                carga: medir(adaptador, carga, productos, args.operaciones,
+                             args.repeticiones, args.semilla, not args.sin_memoria)
+                for carga in args.cargas
+            }
+            print(f"{clase.nombre}: listo", file=sys.stderr)
+
+    if args.json == "-":
+        json.dump(resultados, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        imprimir(resultados)
+        if args.json:
+            Path(args.json).write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding="utf-8")
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# bench_memoria.py
+# Mide los bytes por producto de cada representación del inventario.
+# Uso: python bench_memoria.py [cantidad]   (por defecto 200000)
+import sys
+import tracemalloc
+from producto import Producto, TablaProductos
+
+
+class ProductoConDict:
+    """Réplica del Producto original (con __dict__ por instancia)."""
+    def __init__(self, codigo, nombre, cantidad, precio):
+        self.codigo = str(codigo).strip()
+        self.nombre = nombre.strip()
+        self.cantidad = int(cantidad)
+        self.precio = float(precio)
+
+
+def _datos(n):
+    for i in range(n):
+        yield f"P{i:07d}", f"Producto de prueba {i % 5000}", i % 1000, (i % 10000) / 100
+
+
+def _medir(construir, n) -> float:
+    tracemalloc.start()
+    obj = construir(n)
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return actual / n
+
+
+def _con_dict(n):
+    return {c: ProductoConDict(c, nom, q, p) for c, nom, q, p in _datos(n)}
+
+
+def _con_slots(n):
+    return {c: Producto(c, nom, q, p) for c, nom, q, p in _datos(n)}
+
+
+def _columnar(n):
+    t = TablaProductos()
+    for c, nom, q, p in _datos(n):
+        t[c] = Producto(c, nom, q, p)
+    return t
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"Bytes por producto ({n:,} productos)")
+    base = None
+    for nombre, construir in (("Producto con __dict__", _con_dict),
+                              ("Producto con __slots__", _con_slots),
+                              ("TablaProductos (columnar)", _columnar)):
+        b = _medir(construir, n)
+        base = base or b
+        print(f"  {nombre:<28} {b:8.1f} B   ({b / base:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# bench_tabla.py
+# Latencia de refresco de la tabla de productos: Treeview completo (versión
+# anterior de FormProducto._refrescar) vs TablaVirtual (sólo filas visibles).
+# Necesita una pantalla (Tk). Uso: python bench_tabla.py [tamaños...]
+#   por defecto 10000 100000 1000000; la tabla completa se omite sobre 100000.
+import sys
+import tempfile
+import time
+import tkinter as tk
+from pathlib import Path
+from tkinter import ttk
+from dinero import formato
+from inventario import Inventario
+from producto import Producto
+from tabla_virtual import TablaVirtual
+
+COLUMNAS = (
+    ("codigo", "Código", 110, "center"),
+    ("nombre", "Nombre", 360, "w"),
+    ("cantidad", "Cantidad", 110, "center"),
+    ("precio", "Precio", 140, "e"),
+    ("total", "Total", 140, "e"),
+)
+MAX_COMPLETA = 100_000
+
+
+def _valores(p):
+    return (p.codigo, p.nombre, p.cantidad, formato(p.centavos), formato(p.cantidad * p.centavos))
+
+
+def _inventario(n: int, carpeta: str) -> Inventario:
+    inv = Inventario(str(Path(carpeta) / f"bench_{n}.txt"), columnar=True)
+    inv.agregar_muchos(Producto(f"P{i:07d}", f"Producto {i % 5000}", i % 1000, (i % 10000) / 100)
+                       for i in range(n))
+    return inv
+
+
+def _ms(fn) -> float:
+    inicio = time.perf_counter()
+    fn()
+    return (time.perf_counter() - inicio) * 1000
+
+
+def _refresco_completo(root, tree, inv) -> None:
+    tree.delete(*tree.get_children())
+    for i, p in enumerate(inv.listar()):
+        tree.insert("", tk.END, values=_valores(p), tags=("even" if i % 2 == 0 else "odd",))
+    root.update_idletasks()
+
+
+def main():
+    tamaños = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    root = tk.Tk()
+    root.withdraw()
+    print(f"{'productos':>10} | {'completa (ms)':>13} | {'virtual (ms)':>12} | {'scroll (ms)':>11} | {'buscar (ms)':>11}")
+    with tempfile.TemporaryDirectory() as carpeta:
+        for n in tamaños:
+            inv = _inventario(n, carpeta)
+
+            completa = "-"
+            if n <= MAX_COMPLETA:
+                tree = ttk.Treeview(root, columns=[c for c, *_ in COLUMNAS], show="headings")
+                completa = f"{_ms(lambda: _refresco_completo(root, tree, inv)):13.1f}"
+                tree.destroy()
+
+            tabla = TablaVirtual(root, inv, COLUMNAS, _valores)
+            virtual = _ms(lambda: (tabla.refrescar(), root.update_idletasks()))
+            scroll = _ms(lambda: (tabla._scroll("moveto", "0.5"), root.update_idletasks()))
+            buscar = _ms(lambda: (tabla.refrescar("123"), root.update_idletasks()))
+            tabla.destroy()
+            print(f"{n:>10,} | {completa:>13} | {virtual:12.1f} | {scroll:11.1f} | {buscar:11.1f}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
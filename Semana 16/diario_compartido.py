@@ -0,0 +1,191 @@
+# diario_compartido.py
+# Diario (.log) compartido por varios procesos que abren el mismo inventario.
+#   - Bloqueo entre procesos con un archivo <inventario>.lock
+#     (fcntl.flock en Linux/macOS, msvcrt.locking en Windows).
+#   - Generación: la primera línea del diario es {"op": "generacion", "gen": N, "autor": ...}.
+#     Cada compactación escribe un snapshot nuevo y un diario nuevo con N+1; quien
+#     lea otra generación sabe que su posición en el diario ya no sirve.
+#   - Detección barata: se compara (mtime, tamaño, inodo) del diario con lo último
+#     leído; si no cambió no hace falta abrirlo.
+#   - Cada línea lleva "autor" (un id por proceso) para distinguir las propias.
+# Inventario(compartido=True) usa esta clase y fusiona en memoria lo que lee.
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def bloquear(ruta: Path):
+    """Bloqueo exclusivo entre procesos; espera mientras otro lo tenga."""
+    fd = os.open(ruta, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK se rinde a los 10 s: seguir esperando
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+
+def _firma(st: os.stat_result) -> tuple:
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def firma_archivo(ruta: Path) -> tuple | None:
+    """(mtime, tamaño, inodo) del archivo, o None si no existe."""
+    try:
+        return _firma(os.stat(ruta))
+    except FileNotFoundError:
+        return None
+
+
+class DiarioCompartido:
+    def __init__(self, ruta: Path, ruta_bloqueo: Path):
+        self.ruta = ruta
+        self.ruta_bloqueo = ruta_bloqueo
+        self.autor = uuid.uuid4().hex[:12]
+        # Generación del diario y bytes ya leídos de él
+        self.generacion = 0
+        self.leido = 0
+        self._firma: tuple | None = None
+
+    def bloqueo(self):
+        return bloquear(self.ruta_bloqueo)
+
+    def cambio(self) -> bool:
+        """True si el diario cambió desde la última lectura (sólo hace un stat)."""
+        return firma_archivo(self.ruta) != self._firma
+
+    # ---------- Lectura (con el bloqueo tomado) ----------
+    def leer_generacion(self) -> int:
+        try:
+            with self.ruta.open("rb") as f:
+                return self._cabecera(f)[0]
+        except FileNotFoundError:
+            return 0
+
+    def preparar(self, generacion: int) -> None:
+        """Leer desde el principio la próxima vez (tras cargar el snapshot de esa generación)."""
+        self.generacion = generacion
+        self.leido = 0
+        self._firma = None
+
+    def leer_nuevas(self) -> tuple[bool, list[dict]]:
+        """
+        (otra_generacion, registros nuevos desde la última lectura).
+        otra_generacion=True: otro proceso compactó; hay que recargar el snapshot
+        y volver a llamar para leer el diario nuevo desde el principio.
+        """
+        try:
+            f = self.ruta.open("rb")
+        except FileNotFoundError:
+            self.preparar(0)
+            return False, []
+        with f:
+            generacion, autor, inicio = self._cabecera(f)
+            if generacion != self.generacion:
+                self.generacion = generacion
+                self.leido = inicio
+                if autor != self.autor:
+                    self._firma = None
+                    return True, []
+            if os.fstat(f.fileno()).st_size < self.leido:
+                # Vaciado sin cambiar de generación (p. ej. un Inventario no compartido)
+                self.leido = inicio
+                self._firma = None
+                return True, []
+            f.seek(self.leido)
+            datos = f.read()
+            self._firma = _firma(os.fstat(f.fileno()))
+        # Sólo líneas completas; una a medio escribir se lee la próxima vez
+        fin = datos.rfind(b"\n") + 1
+        self.leido += fin
+        registros = []
+        for linea in datos[:fin].splitlines():
+            try:
+                registros.append(json.loads(linea))
+            except json.JSONDecodeError:
+                continue  # resto de una escritura cortada
+        return False, registros
+
+    def sin_ajenos_desde(self, generacion: int, leido: int) -> bool:
+        """True si desde (generacion, leido) el diario sólo tiene líneas de este proceso."""
+        try:
+            f = self.ruta.open("rb")
+        except FileNotFoundError:
+            return generacion == 0 and leido == 0
+        with f:
+            if self._cabecera(f)[0] != generacion:
+                return False
+            f.seek(leido)
+            for linea in f:
+                if not linea.endswith(b"\n"):
+                    break
+                try:
+                    if json.loads(linea).get("autor") != self.autor:
+                        return False
+                except json.JSONDecodeError:
+                    continue
+        return True
+
+    @staticmethod
+    def _cabecera(f) -> tuple[int, str | None, int]:
+        """(generación, autor, byte donde empiezan los registros)."""
+        f.seek(0)
+        linea = f.readline()
+        try:
+            r = json.loads(linea)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            r = None
+        if not isinstance(r, dict) or r.get("op") != "generacion":
+            # Diario sin cabecera (creado sin modo compartido): generación 0
+            return 0, None, 0
+        return r["gen"], r.get("autor"), len(linea)
+
+    # ---------- Escritura (con el bloqueo tomado) ----------
+    def anexar(self, datos: bytes, avanzar: bool = False) -> None:
+        """
+        Añade líneas al final. avanzar=True: si ya se había leído todo, las líneas
+        propias se dan por leídas (no hace falta volver a leerlas).
+        """
+        with self.ruta.open("ab+") as f:
+            f.seek(0, os.SEEK_END)
+            tam = f.tell()
+            if tam:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Línea cortada de un proceso que murió escribiendo
+                    datos = b"\n" + datos
+            f.write(datos)
+            f.flush()
+            if avanzar and tam == self.leido and self._firma is not None:
+                self.leido = tam + len(datos)
+                self._firma = _firma(os.fstat(f.fileno()))
+
+    def reiniciar(self, generacion: int) -> None:
+        """Diario nuevo (sólo la cabecera) para 'generacion', reemplazado de forma atómica."""
+        cabecera = {"op": "generacion", "gen": generacion, "autor": self.autor}
+        tmp = self.ruta.with_name(f"{self.ruta.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(json.dumps(cabecera).encode("utf-8") + b"\n")
+        os.replace(tmp, self.ruta)
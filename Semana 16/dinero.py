@@ -0,0 +1,67 @@
+# dinero.py
+# Montos como centavos enteros: sumas y multiplicaciones exactas, sin float ni Decimal.
+#   a_centavos("1,234.565") -> 123457     (half-up a 2 decimales)
+#   a_centavos("1,50")      -> ValueError (la coma sólo separa miles: 1,234)
+#   formato(123457)         -> "$1,234.57"
+#   a_texto(123457)         -> "1234.57"  (para campos editables)
+import re
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+
+# La coma sólo se acepta como separador de miles de verdad ("1,234,567"); una
+# coma decimal ("1,50") no se adivina: se rechaza en vez de leer 150
+_MONTO = re.compile(r"([+-]?)(\d{1,3}(?:,\d{3})+|\d*)(?:\.(\d*))?")
+
+
+class Dinero(int):
+    """Monto en centavos. Es un int, así que la aritmética es entera."""
+    __slots__ = ()
+
+    def __str__(self):
+        return formato(self)
+
+    def __repr__(self):
+        return f"Dinero({int(self)})"
+
+
+def a_centavos(valor) -> int:
+    """Centavos de un monto en dólares (int, float, str, Decimal o Dinero), redondeo half-up."""
+    if isinstance(valor, Dinero):
+        return int(valor)
+    if isinstance(valor, str):
+        return _texto_a_centavos(valor)
+    if isinstance(valor, int):
+        return valor * 100
+    if isinstance(valor, float):
+        c = round(valor * 100)
+        if abs(valor * 100 - c) < 1e-6:
+            # Caso común: el precio ya tiene 2 decimales
+            return int(c)
+        valor = Decimal(str(valor))
+    return int(Decimal(valor).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) * 100)
+
+
+def _texto_a_centavos(texto: str) -> int:
+    m = _MONTO.fullmatch(texto.strip().replace("$", "").replace(" ", ""))
+    if m is None or not (m.group(2) or m.group(3)):
+        raise ValueError(f"Monto inválido: {texto!r}")
+    signo, entero, decimales = m.group(1), m.group(2).replace(",", ""), m.group(3) or ""
+    c = int(entero or "0") * 100 + int((decimales + "00")[:2])
+    if len(decimales) > 2 and decimales[2] >= "5":
+        c += 1
+    return -c if signo == "-" else c
+
+
+@lru_cache(maxsize=65536)
+def formato(centavos: int) -> str:
+    """"$1,234.57" a partir de centavos (se repite mucho al pintar la tabla: caché)."""
+    signo = "-" if centavos < 0 else ""
+    c = abs(centavos)
+    return f"${signo}{c // 100:,}.{c % 100:02d}"
+
+
+def a_texto(centavos: int) -> str:
+    """Monto sin símbolo ni separador de miles, p. ej. "1234.57"."""
+    signo = "-" if centavos < 0 else ""
+    c = abs(centavos)
+    return f"{signo}{c // 100}.{c % 100:02d}"
@@ -0,0 +1,86 @@
+# estres_compartido.py
+# Prueba de carga: varios procesos editan a la vez el mismo inventario con
+# Inventario(compartido=True). Cada proceso tiene sus propios códigos (ediciones
+# que no se pisan) y además todos tocan unos códigos comunes (conflictos).
+# Con un límite de diario chico se fuerzan compactaciones (cambios de generación).
+# Al final todos leen los cambios de los demás y se comprueba que:
+#   - ningún cambio sin conflicto se perdió (los códigos propios de cada proceso
+#     quedan como ese proceso los dejó),
+#   - todos los procesos ven exactamente lo mismo que una carga nueva del archivo.
+# Uso: python estres_compartido.py [procesos] [operaciones] [--hilo]
+#   --hilo: cada proceso escribe con segundo_plano=True (hilo escritor)
+import multiprocessing as mp
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from inventario import Inventario
+from producto import Producto
+
+COMUNES = 20
+LIMITE_DIARIO = 64 * 1024
+
+
+def _estado(inv: Inventario) -> dict:
+    return {p.codigo: (p.nombre, p.cantidad, p.centavos) for p in inv.listar()}
+
+
+def _trabajador(n: int, archivo: str, operaciones: int, hilo: bool, barrera, resultados) -> None:
+    inv = Inventario(archivo, compartido=True, segundo_plano=hilo, limite_diario=LIMITE_DIARIO)
+    r = random.Random(n)
+    inicio = time.perf_counter()
+    for i in range(operaciones):
+        if r.random() < 0.2:
+            codigo = f"COMUN-{r.randrange(COMUNES)}"
+        else:
+            codigo = f"P{n}-{r.randrange(200)}"
+        op = r.random()
+        if op < 0.15:
+            inv.eliminar(codigo)
+        elif codigo in inv:
+            inv.modificar(codigo, f"{n}/{i}", r.randrange(100), r.randrange(100000) / 100)
+        else:
+            inv.agregar(Producto(codigo, f"{n}/{i}", r.randrange(100), r.randrange(100000) / 100))
+    inv.sincronizar()
+    segundos = time.perf_counter() - inicio
+    propios = {c: v for c, v in _estado(inv).items() if c.startswith(f"P{n}-")}
+    # Todos terminaron de escribir: cada uno trae lo de los demás
+    barrera.wait()
+    inv.actualizar_desde_disco()
+    resultados.put((n, segundos, propios, _estado(inv), len(inv.conflictos), inv.compartido.generacion))
+    inv.cerrar()
+
+
+def main(procesos: int = 4, operaciones: int = 2000, hilo: bool = False) -> bool:
+    with tempfile.TemporaryDirectory() as tmp:
+        archivo = str(Path(tmp) / "inventario.txt")
+        barrera = mp.Barrier(procesos)
+        resultados = mp.Queue()
+        hijos = [mp.Process(target=_trabajador, args=(n, archivo, operaciones, hilo, barrera, resultados))
+                 for n in range(procesos)]
+        for h in hijos:
+            h.start()
+        datos = [resultados.get() for _ in hijos]
+        for h in hijos:
+            h.join()
+        final = _estado(Inventario(archivo, compartido=True))
+
+    ok = True
+    print(f"{'proceso':>7} {'ops/s':>9} {'conflictos':>10} {'generación':>10}  resultado")
+    for n, segundos, propios, visto, conflictos, generacion in sorted(datos):
+        perdidos = [c for c, v in propios.items() if final.get(c) != v]
+        sobrantes = [c for c in final if c.startswith(f"P{n}-") and c not in propios]
+        igual = visto == final
+        bien = igual and not perdidos and not sobrantes
+        ok = ok and bien
+        detalle = "ok" if bien else f"perdidos={len(perdidos)} sobrantes={len(sobrantes)} igual={igual}"
+        print(f"{n:>7} {operaciones / segundos:>9,.0f} {conflictos:>10} {generacion:>10}  {detalle}")
+    print(f"productos finales: {len(final)}  ->  {'OK' if ok else 'FALLÓ'}")
+    return ok
+
+
+if __name__ == "__main__":
+    hilo = "--hilo" in sys.argv
+    args = [int(a) for a in sys.argv[1:] if not a.startswith("--")]
+    sys.exit(0 if main(*args, hilo=hilo) else 1)
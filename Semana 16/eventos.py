@@ -0,0 +1,71 @@
+# eventos.py
+# Avisos de cambios del inventario para que la interfaz actualice sólo lo necesario.
+# Cada suscriptor recibe: (tipo, codigo, nuevo, anterior)
+#   tipo: "agregar" | "modificar" | "eliminar" | "recargar"
+#   nuevo / anterior: Producto (copia) o None
+#   "recargar": cambió todo el inventario (p. ej. durante la carga, o muchos cambios
+#               traídos de otro proceso); sin codigo ni productos
+from contextlib import contextmanager
+from producto import Producto
+
+
+def copiar(p: Producto | None) -> Producto | None:
+    if p is None:
+        return None
+    return Producto.de_centavos(p.codigo, p.nombre, p.cantidad, p.centavos)
+
+
+class EmisorCambios:
+    """Base para inventarios que notifican agregar / modificar / eliminar."""
+
+    def _iniciar_eventos(self) -> None:
+        self._suscriptores: list = []
+        # Durante un lote los eventos esperan al commit (y se descartan si se revierte)
+        self._eventos_en_espera: list | None = None
+
+    def suscribir(self, funcion) -> None:
+        self._suscriptores.append(funcion)
+
+    def desuscribir(self, funcion) -> None:
+        if funcion in self._suscriptores:
+            self._suscriptores.remove(funcion)
+
+    @property
+    def con_suscriptores(self) -> bool:
+        return bool(self._suscriptores)
+
+    def _emitir(self, tipo: str, codigo: str, nuevo=None, anterior=None) -> None:
+        if not self._suscriptores:
+            return
+        evento = (tipo, codigo, copiar(nuevo), anterior)
+        if self._eventos_en_espera is not None:
+            self._eventos_en_espera.append(evento)
+            return
+        for funcion in list(self._suscriptores):
+            funcion(*evento)
+
+    def _retener_eventos(self) -> None:
+        self._eventos_en_espera = []
+
+    @contextmanager
+    def _agrupar_eventos(self, maximo: int):
+        """Junta los avisos del bloque; si son más de 'maximo', manda un solo "recargar"."""
+        if self._eventos_en_espera is not None:
+            # Ya se están reteniendo (p. ej. dentro de un lote)
+            yield
+            return
+        self._retener_eventos()
+        try:
+            yield
+        finally:
+            if len(self._eventos_en_espera) > maximo:
+                self._eventos_en_espera = [("recargar", None, None, None)]
+            self._liberar_eventos()
+
+    def _liberar_eventos(self, descartar: bool = False) -> None:
+        eventos, self._eventos_en_espera = self._eventos_en_espera, None
+        if descartar or not eventos:
+            return
+        for evento in eventos:
+            for funcion in list(self._suscriptores):
+                funcion(*evento)
@@ -2,20 +2,33 @@
 import os
 import tkinter as tk
 from tkinter import ttk, messagebox
-from decimal import Decimal, ROUND_HALF_UP
-from PIL import Image, ImageTk  # pip install pillow
+from dinero import Dinero, a_centavos, a_texto, formato
+from imagenes import cargar_imagen
 from producto import Producto
+from tabla_virtual import TablaVirtual
 
 
-def _to_decimal(x) -> Decimal:
-    """Convierte con seguridad a Decimal (maneja '', None, etc.)."""
+def _a_centavos(x) -> int:
+    """Centavos de lo escrito en un campo (maneja '', None, '$1,234.50', etc.)."""
     try:
-        s = str(x).strip()
-        if s == "":
-            return Decimal("0")
-        return Decimal(s)
-    except Exception:
-        return Decimal("0")
+        return a_centavos(str(x))
+    except ValueError:
+        return 0
+
+
+def _a_entero(x) -> int:
+    """Cantidad escrita en un campo; 0 si no es un número (los decimales se truncan)."""
+    s = str(x).replace(",", "").strip()
+    try:
+        return int(s)
+    except ValueError:
+        try:
+            return int(float(s))
+        except (ValueError, OverflowError):
+            return 0
+
+
+ESPERA_BUSQUEDA_MS = 150  # pausa al escribir antes de buscar
 
 
 class FormProducto(tk.Toplevel):
@@ -25,7 +38,7 @@ class FormProducto(tk.Toplevel):
         self.geometry("900x540")
         self.resizable(False, False)
         self.inventario = inventario
-        self._box_photo = None  # mantener referencia a imagen
+        self._box_photo = None  # imagen del formulario: se carga al abrirlo por primera vez
 
         # --------- Estilos ----------
         style = ttk.Style(self)
@@ -57,9 +70,7 @@ class FormProducto(tk.Toplevel):
                    command=self._eliminar).pack(side=tk.LEFT, padx=4)
 
         # --------- TABLA (con columna TOTAL) ----------
-        cols = ("codigo", "nombre", "cantidad", "precio", "total")
-        self.tree = ttk.Treeview(self, columns=cols, show="headings", height=16)
-
+        # Virtual: sólo se crean en Tk las filas visibles (ver tabla_virtual.py)
         headers = (
             ("codigo",   "Código",   110, "center"),
             ("nombre",   "Nombre",   360, "w"),
@@ -67,18 +78,9 @@ class FormProducto(tk.Toplevel):
             ("precio",   "Precio",   140, "e"),
             ("total",    "Total",    140, "e"),
         )
-        for c, txt, w, anchor in headers:
-            self.tree.heading(c, text=txt, command=lambda k=c: self._ordenar_por(k, False))
-            self.tree.column(c, width=w, anchor=anchor, stretch=False)
-
-        vsb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=vsb.set)
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(12, 0), pady=(0, 12))
-        vsb.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 12), pady=(0, 12))
-
-        # Zebra rows
-        self.tree.tag_configure("even", background="#f6f7fb")
-        self.tree.tag_configure("odd", background="white")
+        self.tabla = TablaVirtual(self, self.inventario, headers, self._valores_fila, alto=16)
+        self.tabla.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=12, pady=(0, 12))
+        self.tree = self.tabla.tree
 
         # --------- STATUS BAR (resumen) ----------
         self.status = ttk.Label(self, anchor="w")
@@ -93,7 +95,13 @@ class FormProducto(tk.Toplevel):
         # --------- Atajos ----------
         self.bind("<Delete>", lambda e: self._eliminar())
         self.bind("<Escape>", lambda e: self.destroy())
-        ent_buscar.bind("<KeyRelease>", lambda e: self._refrescar(self.var_buscar.get()))
+        # Búsqueda en vivo: espera una pausa al escribir antes de consultar
+        self._busqueda_pendiente = None
+        ent_buscar.bind("<KeyRelease>", self._programar_busqueda)
+
+        # Cambios del inventario -> actualizar sólo la fila afectada y los totales
+        self.inventario.suscribir(self._on_cambio)
+        self.bind("<Destroy>", self._al_cerrar)
 
         self._refrescar()
 
@@ -105,48 +113,86 @@ class FormProducto(tk.Toplevel):
             self.tree.focus(iid)
         self.menu_ctx.tk_popup(event.x_root, event.y_root)
 
-    def _resumen_inventario(self, productos):
-        total_items = sum(int(p.cantidad) for p in productos)
-        total_valor = sum(
-            (_to_decimal(p.cantidad) * _to_decimal(p.precio) for p in productos),
-            start=Decimal("0")
-        ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    def _al_cerrar(self, event):
+        if event.widget is self:
+            self.inventario.desuscribir(self._on_cambio)
+
+    def _resumen_inventario(self):
+        # Totales que mantiene el inventario: (productos, ítems, valor en centavos)
+        self._resumen = list(self.inventario.resumen(self.tabla.filtro))
+        self._mostrar_resumen()
+
+    def _ajustar_resumen(self, p, signo: int):
+        self._resumen[0] += signo
+        self._resumen[1] += signo * p.cantidad
+        self._resumen[2] += signo * p.cantidad * p.centavos
+
+    def _mostrar_resumen(self):
+        cantidad, total_items, valor = self._resumen
         self.status.config(
-            text=f"{len(productos)} producto(s) | Ítems: {total_items} | Valor total: ${total_valor:,.2f}"
+            text=f"{cantidad} producto(s) | Ítems: {total_items} | Valor total: {formato(valor)}"
         )
 
+    def _on_cambio(self, tipo, codigo, nuevo, anterior):
+        if tipo == "recargar":
+            # Otra parte de la carga (o muchos cambios externos): recontar y repintar
+            self._refrescar(self.tabla.filtro)
+            return
+        filtro = self.tabla.filtro
+        if not filtro:
+            # Sin búsqueda los totales del inventario ya están al día (O(1))
+            self._resumen = list(self.inventario.resumen())
+        else:
+            if anterior is not None and self.inventario.coincide(anterior, filtro):
+                self._ajustar_resumen(anterior, -1)
+            if nuevo is not None and self.inventario.coincide(nuevo, filtro):
+                self._ajustar_resumen(nuevo, 1)
+        self._mostrar_resumen()
+        self.tabla.aplicar_cambio(tipo, codigo, nuevo, anterior)
+
+    @staticmethod
+    def _valores_fila(p):
+        # Sólo aritmética entera; formato() guarda en caché los textos repetidos
+        return (p.codigo, p.nombre, p.cantidad, formato(p.centavos), formato(p.cantidad * p.centavos))
+
     def _refrescar(self, filtro: str | None = None):
-        self.tree.delete(*self.tree.get_children())
-        productos = self.inventario.listar()
-        if filtro:
-            f = filtro.lower().strip()
-            productos = [p for p in productos if f in p.codigo.lower() or f in p.nombre.lower()]
-
-        for i, p in enumerate(productos):
-            tag = "even" if i % 2 == 0 else "odd"
-            precio = _to_decimal(p.precio).quantize(Decimal("0.01"))
-            total = (_to_decimal(p.cantidad) * _to_decimal(p.precio)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            precio_fmt = f"${precio:,.2f}"
-            total_fmt = f"${total:,.2f}"
-            self.tree.insert("", tk.END,
-                             values=(p.codigo, p.nombre, p.cantidad, precio_fmt, total_fmt),
-                             tags=(tag,))
-        self._resumen_inventario(productos)
+        # La tabla pide al modelo sólo la página visible (conserva orden y posición)
+        self.tabla.refrescar(filtro)
+        self._resumen_inventario()
 
     def _buscar(self):
+        if self._busqueda_pendiente is not None:
+            self.after_cancel(self._busqueda_pendiente)
+            self._busqueda_pendiente = None
         self._refrescar(self.var_buscar.get())
 
+    def _programar_busqueda(self, event=None):
+        if self._busqueda_pendiente is not None:
+            self.after_cancel(self._busqueda_pendiente)
+        self._busqueda_pendiente = self.after(ESPERA_BUSQUEDA_MS, self._buscar)
+
     def _seleccion(self):
         iid = self.tree.focus() or (self.tree.selection()[0] if self.tree.selection() else None)
         if not iid:
             return None
         return self.tree.item(iid, "values")
 
+    def _cargando(self) -> bool:
+        # Mientras se carga el archivo no se permiten cambios (la carga los pisaría)
+        if self.inventario.cargando:
+            messagebox.showinfo("Espere", "El inventario todavía se está cargando.", parent=self)
+            return True
+        return False
+
     # ---------- Acciones ----------
     def _nuevo(self):
+        if self._cargando():
+            return
         self._form_producto("Nuevo Producto")
 
     def _modificar(self):
+        if self._cargando():
+            return
         valores = self._seleccion()
         if not valores:
             messagebox.showwarning("Atención", "Seleccione un producto para modificar.")
@@ -154,6 +200,8 @@ class FormProducto(tk.Toplevel):
         self._form_producto("Modificar Producto", valores)
 
     def _eliminar(self):
+        if self._cargando():
+            return
         valores = self._seleccion()
         if not valores:
             messagebox.showinfo("Información", "Seleccione un producto para eliminar.")
@@ -163,7 +211,7 @@ class FormProducto(tk.Toplevel):
             ok = self.inventario.eliminar(codigo)
             if not ok:
                 messagebox.showerror("Error", "No se pudo eliminar. Intente nuevamente.")
-            self._refrescar(self.var_buscar.get())
+            # La tabla y el resumen se actualizan con el evento del inventario
 
     # ---------- Formulario bonito: NUEVO / MODIFICAR ----------
     def _form_producto(self, titulo: str, valores=None):
@@ -185,15 +233,14 @@ class FormProducto(tk.Toplevel):
         img_label = ttk.Label(left)
         img_label.grid(row=0, column=0, pady=(0, 6))
 
-        # Cargar box.png si existe; si no, emoji
-        if os.path.exists("box.png"):
+        # Cargar box.png si existe (una sola vez, desde la caché); si no, emoji
+        if self._box_photo is None and os.path.exists("box.png"):
             try:
-                _img = Image.open("box.png")
-                _img.thumbnail((120, 120), Image.LANCZOS)
-                self._box_photo = ImageTk.PhotoImage(_img)
-                img_label.configure(image=self._box_photo)
+                self._box_photo = cargar_imagen("box.png", "miniatura", 120, 120, master=self)
             except Exception:
-                img_label.configure(text="📦", font=("Segoe UI Emoji", 40))
+                pass
+        if self._box_photo is not None:
+            img_label.configure(image=self._box_photo)
         else:
             img_label.configure(text="📦", font=("Segoe UI Emoji", 40))
 
@@ -230,14 +277,11 @@ class FormProducto(tk.Toplevel):
         sp_can.grid(row=2, column=1, **padd, sticky="w")
         sp_pre.grid(row=3, column=1, **padd, sticky="w")
 
-        # Total en vivo con Decimal (preciso)
+        # Total en vivo en centavos enteros (exacto)
         total_var = tk.StringVar(value="$0.00")
 
         def actualizar_total(*_):
-            q = _to_decimal(var_cantidad.get())
-            p = _to_decimal(var_precio.get())
-            t = (q * p).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            total_var.set(f"${t:,.2f}")
+            total_var.set(formato(_a_entero(var_cantidad.get()) * _a_centavos(var_precio.get())))
 
         var_cantidad.trace_add("write", actualizar_total)
         var_precio.trace_add("write", actualizar_total)
@@ -250,15 +294,8 @@ class FormProducto(tk.Toplevel):
         if valores:
             var_codigo.set(str(valores[0]))
             var_nombre.set(str(valores[1]))
-            try:
-                var_cantidad.set(str(int(str(valores[2]).replace(",", ""))))
-            except Exception:
-                var_cantidad.set("0")
-            try:
-                limpio = str(valores[3]).replace("$", "").replace(",", "")
-                var_precio.set(f"{_to_decimal(limpio).quantize(Decimal('0.01'))}")
-            except Exception:
-                var_precio.set("0.00")
+            var_cantidad.set(str(_a_entero(valores[2])))
+            var_precio.set(a_texto(_a_centavos(valores[3])))
             e_cod.state(["disabled"])
 
         # Botones
@@ -273,9 +310,9 @@ class FormProducto(tk.Toplevel):
             try:
                 codigo = var_codigo.get().strip()
                 nombre = var_nombre.get().strip()
-                cantidad = int(_to_decimal(var_cantidad.get()))
-                precio_dec = _to_decimal(var_precio.get()).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                precio = float(precio_dec)  # para JSON, pero ya con 2 decimales
+                cantidad = _a_entero(var_cantidad.get())
+                # centavos exactos; un monto mal escrito ("1,50") es un error, no $0
+                precio = Dinero(a_centavos(var_precio.get().strip() or "0"))
                 if not codigo or not nombre:
                     raise ValueError("Código y Nombre son obligatorios.")
                 if cantidad < 0 or precio < 0:
@@ -294,7 +331,7 @@ class FormProducto(tk.Toplevel):
                     messagebox.showwarning("Duplicado", f"Ya existe un producto con código {codigo}.", parent=win)
                     return
 
-            self._refrescar(self.var_buscar.get())
+            # La tabla y el resumen se actualizan con el evento del inventario (_on_cambio)
             win.destroy()
 
         b_guardar.configure(command=guardar)
@@ -303,22 +340,3 @@ class FormProducto(tk.Toplevel):
         win.bind("<Return>", lambda e: guardar())
         win.bind("<Escape>", lambda e: win.destroy())
         e_cod.focus_set()
-
-    # ---------- Ordenar por columna ----------
-    def _ordenar_por(self, col, reverse):
-        items = [(self.tree.set(k, col), k) for k in self.tree.get_children("")]
-        def _key(v):
-            # cantidad, precio y total se ordenan como número
-            if col in ("cantidad", "precio", "total"):
-                try:
-                    return float(str(v).replace("$", "").replace(",", ""))
-                except:
-                    return 0.0
-            return str(v).lower()
-        items.sort(key=lambda t: _key(t[0]), reverse=reverse)
-        for index, (_, k) in enumerate(items):
-            self.tree.move(k, "", index)
-        for i, k in enumerate(self.tree.get_children("")):
-            self.tree.item(k, tags=("even" if i % 2 == 0 else "odd",))
-        self.tree.heading(col, command=lambda: self._ordenar_por(col, not reverse))
-
@@ -0,0 +1,59 @@
+# imagenes.py
+# Caché en disco de imágenes ya escaladas para la interfaz.
+#   - La clave es: ruta absoluta + fecha de modificación + tamaño del archivo
+#     + modo y tamaño pedido. Si la imagen original cambia, la clave cambia.
+#   - Lo guardado es un PNG del tamaño final, que Tk abre solo (PhotoImage):
+#     con la caché llena ni siquiera se importa PIL.
+#   - PIL se importa sólo al escalar una imagen que no está en la caché.
+import hashlib
+import os
+import tkinter as tk
+from pathlib import Path
+
+CARPETA_CACHE = Path(__file__).with_name(".cache_imagenes")
+MODOS = ("exacto", "ancho", "miniatura")
+
+
+def ruta_en_cache(origen, modo: str, ancho: int, alto: int = 0) -> Path:
+    """Archivo de la caché para 'origen' escalado según 'modo' a (ancho, alto)."""
+    origen = Path(origen).resolve()
+    st = origen.stat()
+    clave = f"{origen}|{st.st_mtime_ns}|{st.st_size}|{modo}|{ancho}x{alto}"
+    resumen = hashlib.sha1(clave.encode("utf-8")).hexdigest()[:16]
+    return CARPETA_CACHE / f"{origen.stem}-{resumen}.png"
+
+
+def cargar_imagen(origen, modo: str, ancho: int, alto: int = 0, master=None) -> tk.PhotoImage:
+    """
+    PhotoImage de 'origen' escalada:
+      exacto:    a (ancho, alto) justos
+      ancho:     a 'ancho' conservando la proporción
+      miniatura: que entre en (ancho, alto) conservando la proporción (no agranda)
+    Lanza OSError si falta el archivo, e ImportError si hay que escalar sin PIL.
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo de escalado desconocido: {modo}")
+    destino = ruta_en_cache(origen, modo, ancho, alto)
+    if not destino.exists():
+        _escalar(Path(origen), destino, modo, ancho, alto)
+    return tk.PhotoImage(file=str(destino), master=master)
+
+
+def _escalar(origen: Path, destino: Path, modo: str, ancho: int, alto: int) -> None:
+    from PIL import Image  # pip install pillow (sólo hace falta con la caché vacía)
+
+    img = Image.open(origen)
+    if modo == "exacto":
+        img = img.resize((ancho, alto))
+    elif modo == "ancho":
+        ratio = ancho / img.width
+        img = img.resize((ancho, int(img.height * ratio)), Image.LANCZOS)
+    else:
+        img.thumbnail((ancho, alto), Image.LANCZOS)
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA")
+    destino.parent.mkdir(exist_ok=True)
+    # Escritura atómica: otra instancia de la app podría estar leyendo la caché
+    tmp = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+    img.save(tmp, format="PNG", compress_level=1)
+    os.replace(tmp, destino)
@@ -0,0 +1,212 @@
+# importacion.py
+# Importar / exportar productos en CSV o JSON-lines (un objeto por línea) sin
+# cargar el archivo entero en memoria.
+#   - importar(): lee fila por fila (generador), valida y aplica por partes de
+#     'tam' filas dentro de un solo lote(): el archivo del inventario se escribe
+#     una vez al final. Si el código ya existe se modifica (upsert).
+#     Las filas inválidas no cortan la importación: se juntan en "errores".
+#   - exportar(): recorre los productos (opcionalmente filtrados) y los escribe
+#     a medida que salen.
+# Columnas: codigo, nombre, cantidad, precio (en dólares, p. ej. "1,234.50").
+# CSV separado por ";" (listas europeas): el precio usa coma decimal ("1.234,50").
+# Por consola:
+#   python importacion.py importar lista.csv [--inventario inventario.txt]
+#   python importacion.py exportar salida.jsonl [--filtro tornillo]
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from dinero import Dinero, a_centavos, a_texto
+from producto import Producto
+
+COLUMNAS = ("codigo", "nombre", "cantidad", "precio")
+EXTENSIONES_JSONL = (".jsonl", ".ndjson")
+# Precio de un CSV con ";": coma decimal y punto de miles -> al revés
+_COMA_DECIMAL = str.maketrans({",": ".", ".": ","})
+TAM_PARTE = 5000        # filas aplicadas entre avisos de progreso
+MAX_ERRORES = 1000      # errores guardados con detalle (el resto sólo se cuenta)
+
+
+def _es_jsonl(ruta: Path) -> bool:
+    return ruta.suffix.lower() in EXTENSIONES_JSONL
+
+
+# ---------- Lectura ----------
+def leer_filas(ruta):
+    """Genera (número de línea, dict o mensaje de error) de un CSV o JSON-lines."""
+    ruta = Path(ruta)
+    with ruta.open("r", encoding="utf-8-sig", newline="") as f:
+        if _es_jsonl(ruta):
+            for n, linea in enumerate(f, 1):
+                if not linea.strip():
+                    continue
+                try:
+                    fila = json.loads(linea)
+                except json.JSONDecodeError as ex:
+                    yield n, f"JSON inválido: {ex.msg}"
+                    continue
+                yield n, fila if isinstance(fila, dict) else "se esperaba un objeto JSON"
+            return
+        muestra = f.read(4096)
+        f.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+        except csv.Error:
+            dialecto = csv.excel
+        lector = csv.DictReader(f, dialect=dialecto)
+        faltan = [c for c in COLUMNAS if c not in (lector.fieldnames or ())]
+        if faltan:
+            raise ValueError(f"Faltan columnas en {ruta.name}: {', '.join(faltan)}")
+        coma_decimal = dialecto.delimiter == ";"
+        for fila in lector:
+            if coma_decimal and fila["precio"]:
+                fila["precio"] = fila["precio"].translate(_COMA_DECIMAL)
+            yield lector.line_num, fila
+
+
+def validar(fila: dict) -> Producto:
+    """Producto a partir de una fila; ValueError con un mensaje legible si no es válida."""
+    codigo = str(fila.get("codigo") or "").strip()
+    nombre = str(fila.get("nombre") or "").strip()
+    if not codigo:
+        raise ValueError("código vacío")
+    if not nombre:
+        raise ValueError("nombre vacío")
+    cantidad = fila.get("cantidad")
+    try:
+        if isinstance(cantidad, bool) or not isinstance(cantidad, (int, str)):
+            raise ValueError
+        cantidad = int(cantidad)  # "3" sí, "3.5" no
+    except ValueError:
+        raise ValueError(f"cantidad inválida: {fila.get('cantidad')!r}") from None
+    if cantidad < 0:
+        raise ValueError("cantidad negativa")
+    precio = fila.get("precio")
+    try:
+        centavos = a_centavos(precio)
+    except (ValueError, TypeError, ArithmeticError):
+        raise ValueError(f"precio inválido: {precio!r}") from None
+    if centavos < 0:
+        raise ValueError("precio negativo")
+    return Producto.de_centavos(codigo, nombre, cantidad, centavos)
+
+
+# ---------- Importar ----------
+def importar(inventario, ruta, tam: int = TAM_PARTE, progreso=None) -> dict:
+    """
+    Aplica el archivo al inventario (Inventario o InventarioSQLite) con upsert por
+    código y una sola escritura a disco. progreso(filas_leidas, errores) se llama
+    tras cada parte. Devuelve las estadísticas de la importación.
+    """
+    inicio = time.perf_counter()
+    resultado = {"filas": 0, "agregados": 0, "modificados": 0, "sin_cambios": 0,
+                 "total_errores": 0, "errores": []}
+    filas = leer_filas(ruta)
+    with inventario.lote():
+        while True:
+            parte = list(islice(filas, tam))
+            if not parte:
+                break
+            for n, fila in parte:
+                resultado["filas"] += 1
+                try:
+                    if isinstance(fila, str):
+                        raise ValueError(fila)
+                    p = validar(fila)
+                except ValueError as ex:
+                    resultado["total_errores"] += 1
+                    if len(resultado["errores"]) < MAX_ERRORES:
+                        resultado["errores"].append((n, str(ex)))
+                    continue
+                _poner(inventario, p, resultado)
+            if progreso is not None:
+                progreso(resultado["filas"], resultado["total_errores"])
+    resultado["segundos"] = time.perf_counter() - inicio
+    return resultado
+
+
+def _poner(inventario, p: Producto, resultado: dict) -> None:
+    anterior = inventario.obtener(p.codigo)
+    if anterior is None:
+        inventario.agregar(p)
+        resultado["agregados"] += 1
+    elif (anterior.nombre, anterior.cantidad, anterior.centavos) == (p.nombre, p.cantidad, p.centavos):
+        # Sin cambios: no genera escritura ni aviso
+        resultado["sin_cambios"] += 1
+    else:
+        inventario.modificar(p.codigo, p.nombre, p.cantidad, Dinero(p.centavos))
+        resultado["modificados"] += 1
+
+
+# ---------- Exportar ----------
+def exportar(inventario, ruta, filtro: str | None = None, progreso=None, cada: int = TAM_PARTE) -> int:
+    """
+    Escribe los productos (los que coinciden con 'filtro', si se da) a medida que
+    se recorren. Escritura atómica. Devuelve cuántos se exportaron.
+    """
+    ruta = Path(ruta)
+    tmp = ruta.with_name(ruta.name + ".tmp")
+    total = 0
+    try:
+        with tmp.open("w", encoding="utf-8", newline="") as f:
+            if _es_jsonl(ruta):
+                escribir = lambda p: f.write(json.dumps(p.to_dict(), ensure_ascii=False) + "\n")
+            else:
+                w = csv.writer(f)
+                w.writerow(COLUMNAS)
+                escribir = lambda p: w.writerow((p.codigo, p.nombre, p.cantidad, a_texto(p.centavos)))
+            for p in inventario.recorrer(filtro):
+                escribir(p)
+                total += 1
+                if progreso is not None and total % cada == 0:
+                    progreso(total)
+        os.replace(tmp, ruta)
+    except BaseException:
+        # No dejar el .tmp a medio escribir
+        tmp.unlink(missing_ok=True)
+        raise
+    return total
+
+
+# ---------- Consola ----------
+def main(argv=None) -> int:
+    from inventario import Inventario
+    parser = argparse.ArgumentParser(description="Importar / exportar productos (CSV o JSON-lines).")
+    parser.add_argument("accion", choices=("importar", "exportar"))
+    parser.add_argument("archivo", help="CSV (.csv) o JSON-lines (.jsonl)")
+    parser.add_argument("--inventario", default="inventario.txt")
+    parser.add_argument("--filtro", help="sólo exportar productos que contengan este texto")
+    args = parser.parse_args(argv)
+
+    # compartido=True: una App abierta sobre el mismo archivo ve los cambios
+    inventario = Inventario(args.inventario, compartido=True)
+    try:
+        if args.accion == "exportar":
+            total = exportar(inventario, args.archivo, args.filtro)
+            print(f"{total} producto(s) exportados a {args.archivo}")
+            return 0
+        mostrar = lambda filas, errores: print(f"\r{filas:,} filas ({errores} con error)", end="", flush=True)
+        r = importar(inventario, args.archivo, progreso=mostrar)
+        print()
+    except (OSError, ValueError, csv.Error) as ex:
+        # Archivo inexistente, sin las columnas o mal formado: un mensaje, sin traza
+        print(f"No se pudo {args.accion}: {ex}", file=sys.stderr)
+        return 1
+    finally:
+        inventario.cerrar()
+    print(f"Agregados: {r['agregados']}  Modificados: {r['modificados']}  "
+          f"Sin cambios: {r['sin_cambios']}  Con error: {r['total_errores']}  "
+          f"({r['segundos']:.2f} s)")
+    for n, mensaje in r["errores"][:20]:
+        print(f"  línea {n}: {mensaje}")
+    if r["total_errores"] > 20:
+        print(f"  ... y {r['total_errores'] - 20} más")
+    return 0 if r["total_errores"] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# indice_busqueda.py
+# Índice invertido de trigramas para buscar texto dentro del código o el nombre.
+#   - Los textos se normalizan: minúsculas y sin tildes ("Café" -> "cafe").
+#   - Cada trigrama apunta al conjunto de códigos que lo contienen.
+#   - Una búsqueda intersecta los conjuntos de sus trigramas y luego confirma
+#     la subcadena sólo en esos candidatos.
+# Ocupa bastante memoria (un conjunto por trigrama), por eso Inventario lo usa
+# sólo si se pide con indice_busqueda=True.
+import re
+import unicodedata
+from functools import lru_cache
+
+
+# Marcas diacríticas del bloque común (tildes, diéresis, virgulilla...)
+_MARCAS = re.compile("[\u0300-\u036f]+")
+
+
+def _sin_marcas(texto: str) -> str:
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def plegar(texto: str) -> str:
+    """Minúsculas y sin marcas diacríticas, para comparar búsquedas."""
+    if texto.isascii():
+        return texto.lower()
+    texto = unicodedata.normalize("NFKD", texto.casefold())
+    # Quitar el bloque común con una expresión regular es mucho más rápido que
+    # mirar letra por letra; si queda algo fuera de ASCII, el camino completo
+    rapido = _MARCAS.sub("", texto)
+    return rapido if rapido.isascii() else _sin_marcas(rapido)
+
+
+# Con caché: para consultas, que se repiten. Los textos de cada producto van
+# por plegar() directo (en un catálogo grande sólo vaciarían la caché).
+normalizar = lru_cache(maxsize=4096)(plegar)
+
+
+def trigramas(texto: str) -> set[str]:
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceTrigramas:
+    def __init__(self):
+        self._postings: dict[str, set[str]] = {}
+        # codigo -> (código normalizado, nombre normalizado)
+        self._textos: dict[str, tuple[str, str]] = {}
+        # codigo -> número de inserción, para devolver resultados en orden
+        self._orden: dict[str, int] = {}
+        self._siguiente = 0
+
+    def __len__(self) -> int:
+        return len(self._textos)
+
+    def agregar(self, codigo: str, nombre: str) -> None:
+        if codigo in self._textos:
+            self.actualizar(codigo, nombre)
+            return
+        self._orden[codigo] = self._siguiente
+        self._siguiente += 1
+        textos = (plegar(codigo), plegar(nombre))
+        self._textos[codigo] = textos
+        for t in trigramas(textos[0]) | trigramas(textos[1]):
+            self._postings.setdefault(t, set()).add(codigo)
+
+    def actualizar(self, codigo: str, nombre: str) -> None:
+        """Cambia el nombre indexado conservando la posición del producto."""
+        viejo = self._textos[codigo]
+        nuevo = (viejo[0], plegar(nombre))
+        if nuevo == viejo:
+            return
+        antes = trigramas(viejo[0]) | trigramas(viejo[1])
+        despues = trigramas(nuevo[0]) | trigramas(nuevo[1])
+        for t in antes - despues:
+            self._descartar(t, codigo)
+        for t in despues - antes:
+            self._postings.setdefault(t, set()).add(codigo)
+        self._textos[codigo] = nuevo
+
+    def quitar(self, codigo: str) -> None:
+        textos = self._textos.pop(codigo, None)
+        if textos is None:
+            return
+        del self._orden[codigo]
+        for t in trigramas(textos[0]) | trigramas(textos[1]):
+            self._descartar(t, codigo)
+
+    def _descartar(self, trigrama: str, codigo: str) -> None:
+        conjunto = self._postings.get(trigrama)
+        if conjunto is not None:
+            conjunto.discard(codigo)
+            if not conjunto:
+                del self._postings[trigrama]
+
+    def buscar(self, consulta: str) -> list[str]:
+        """Códigos cuyo código o nombre contiene la consulta, en orden de inserción."""
+        q = normalizar(consulta.strip())
+        if len(q) < 3:
+            # Consultas muy cortas: recorrer los textos ya normalizados
+            candidatos = self._textos.keys()
+        else:
+            conjuntos = []
+            for t in trigramas(q):
+                conjunto = self._postings.get(t)
+                if not conjunto:
+                    return []
+                conjuntos.append(conjunto)
+            conjuntos.sort(key=len)
+            candidatos = conjuntos[0].intersection(*conjuntos[1:])
+        encontrados = [c for c in candidatos
+                       if q in self._textos[c][0] or q in self._textos[c][1]]
+        if len(q) >= 3:
+            encontrados.sort(key=self._orden.__getitem__)
+        return encontrados
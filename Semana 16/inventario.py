@@ -1,56 +1,698 @@
 import json
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from producto import Producto
+from almacenamiento import almacen_para
+from diario_compartido import DiarioCompartido, firma_archivo
+from eventos import EmisorCambios
+from indice_busqueda import IndiceTrigramas, normalizar, plegar
+from producto import Producto, TablaProductos
+from segundo_plano import EscritorDiferido, leer_en_hilo
+from vista_ordenada import VistaOrdenada
 
-class Inventario:
-    def __init__(self, archivo: str = "inventario.txt"):
+LIMITE_DIARIO = 4 * 1024 * 1024  # bytes del diario antes de compactar
+# Cambios externos traídos de una vez: hasta este número se avisa producto por
+# producto; si son más, un solo "recargar" (repintar todo sale más barato)
+MAX_AVISOS_POR_FILA = 500
+
+# Columnas por las que se puede ordenar en consultar() (empates: por código)
+CLAVES_ORDEN = {
+    "codigo": lambda p: p.codigo.lower(),
+    "nombre": lambda p: plegar(p.nombre),
+    "cantidad": lambda p: p.cantidad,
+    "precio": lambda p: p.centavos,
+    "total": lambda p: p.cantidad * p.centavos,
+}
+
+
+class Inventario(EmisorCambios):
+    def __init__(self, archivo: str = "inventario.txt", diario: bool = False,
+                 limite_diario: int = LIMITE_DIARIO, columnar: bool = False,
+                 indice_busqueda: bool = False, segundo_plano: bool = False,
+                 cargar_ahora: bool = True, compartido: bool = False):
         self.archivo = Path(archivo)
-        self.productos: list[Producto] = []
-        self.cargar()
+        # Formato del snapshot según la extensión (.txt = JSON, .bin = binario)
+        self.almacen = almacen_para(self.archivo)
+        # Modo diario: cada cambio se añade como una línea JSON al archivo .log
+        # y el snapshot completo sólo se reescribe al compactar.
+        self.diario = diario or compartido
+        self.archivo_diario = self.archivo.with_name(self.archivo.name + ".log")
+        self.limite_diario = limite_diario
+        self._tam_diario = 0
+        # Modo compartido: varios procesos sobre el mismo archivo (ver diario_compartido.py).
+        # Cada uno añade sus cambios al diario bajo bloqueo y lee los de los demás.
+        self.compartido: DiarioCompartido | None = None
+        if compartido:
+            self.compartido = DiarioCompartido(
+                self.archivo_diario, self.archivo.with_name(self.archivo.name + ".lock"))
+        # Cambios propios numerados: codigo -> número del último cambio. Mientras ese
+        # número no se lea del diario (o el escritor no lo confirme), los cambios
+        # ajenos a ese código se ignoran: el propio va después en el diario y gana.
+        # Los códigos ignorados así quedan en conflictos.
+        self._cambio = 0
+        self._cambio_escrito = 0
+        self._cambios_locales: dict[str, int] = {}
+        self.conflictos: list[str] = []
+        self._proxima_compactacion = (0, 0)
+        # (mtime, tamaño, inodo) del snapshot tal como se leyó o escribió aquí;
+        # si cambia, alguien lo reemplazó desde fuera (ver actualizar_desde_disco)
+        self._firma_snapshot: tuple | None = None
+        # Índice por código (dict conserva el orden de inserción para listar()).
+        # Con columnar=True se usa TablaProductos, que ocupa mucha menos memoria.
+        self._coleccion = TablaProductos if columnar else dict
+        self.productos: dict[str, Producto] = self._coleccion()
+        # Totales acumulados (se actualizan en O(1) con cada cambio): unidades y
+        # valor en centavos; todo aritmética entera (ver dinero.py)
+        self._unidades = 0
+        self._centavos = 0
+        # Índice de trigramas para búsquedas por subcadena (opcional, usa memoria)
+        self._usar_indice = indice_busqueda
+        self.indice: IndiceTrigramas | None = None
+        # Sin índice: código -> "código\0nombre" ya plegados, en el orden de productos.
+        # Buscar recorre estos textos sin plegar cada producto en cada consulta.
+        self._plegados: dict[str, str] | None = {}
+        # Vistas ordenadas por columna; se crean al pedir ese orden por primera vez
+        self._vistas: dict[str, VistaOrdenada] = {}
+        # Último resultado de _filtrados(): (filtro, lista); se descarta con cada cambio
+        self._ultimo_filtrado: tuple[str, list] | None = None
+        # Estado del lote activo (None = sin lote): registros pendientes y deshacer
+        self._pendientes: list[dict] | None = None
+        self._deshacer: list[tuple] = []
+        self._orden_previo: list[str] | None = None
+        # Estadísticas de la última carga: productos, segundos, productos/segundo
+        self.ultima_carga: dict = {}
+        # True mientras cargar_por_partes() no terminó
+        self.cargando = False
+        # Con segundo_plano=True la E/S la hace un hilo escritor (ver segundo_plano.py)
+        # y guardar() / los cambios sólo encolan; sincronizar() espera a que termine.
+        self.escritor: EscritorDiferido | None = None
+        if segundo_plano:
+            escribir_snapshot = self._escribir_snapshot_compartido if compartido else self._escribir_snapshot
+            self.escritor = EscritorDiferido(self._escribir_diario, escribir_snapshot)
+        # Suscriptores de cambios (p. ej. FormProducto)
+        self._iniciar_eventos()
+        # cargar_ahora=False: el llamador usa cargar_por_partes() (p. ej. con after())
+        if cargar_ahora:
+            self.cargar()
+
+    @staticmethod
+    def _clave(codigo) -> str:
+        return str(codigo).strip()
 
     # ---------- CRUD ----------
     def agregar(self, producto: Producto) -> bool:
         # Evitar duplicados por código
-        if any(p.codigo == producto.codigo for p in self.productos):
+        clave = self._clave(producto.codigo)
+        if clave in self.productos:
             return False
-        self.productos.append(producto)
-        self.guardar()
+        self._poner(clave, producto)
+        self._anotar_deshacer("agregar", clave, None)
+        self._registrar({"op": "agregar", "p": producto.to_dict()})
+        self._emitir("agregar", clave, producto)
         return True
 
     def eliminar(self, codigo: str) -> bool:
-        codigo = str(codigo).strip()
-        antes = len(self.productos)
-        self.productos = [p for p in self.productos if p.codigo != codigo]
-        self.guardar()
-        return len(self.productos) < antes
-
-    def modificar(self, codigo: str, nombre: str, cantidad: int, precio: float) -> bool:
-        codigo = str(codigo).strip()
-        for p in self.productos:
-            if p.codigo == codigo:
-                p.nombre = nombre.strip()
-                p.cantidad = int(cantidad)
-                p.precio = float(precio)
-                self.guardar()
-                return True
-        return False
+        clave = self._clave(codigo)
+        if clave not in self.productos:
+            return False
+        if self._pendientes is not None and self._orden_previo is None:
+            # Para restaurar el orden de listar() si el lote se revierte
+            self._orden_previo = list(self.productos)
+        p = self._quitar(clave)
+        self._anotar_deshacer("eliminar", clave, p)
+        self._registrar({"op": "eliminar", "codigo": clave})
+        self._emitir("eliminar", clave, None, p)
+        return True
+
+    def modificar(self, codigo: str, nombre: str, cantidad: int, precio) -> bool:
+        """precio en dólares (float, str, Decimal) o Dinero (centavos exactos)."""
+        anterior = self.productos.get(self._clave(codigo))
+        if anterior is None:
+            return False
+        # Producto nuevo en vez de cambiar el actual: así una copia de la colección
+        # (la que recorre el hilo escritor) nunca ve un producto a medio cambiar
+        p = Producto(anterior.codigo, nombre, cantidad, precio)
+        self._anotar_deshacer("modificar", p.codigo, anterior)
+        self._poner(p.codigo, p)
+        self._registrar({"op": "modificar", "p": p.to_dict()})
+        self._emitir("modificar", p.codigo, p, anterior)
+        return True
+
+    # ---------- Operaciones por lote ----------
+    @contextmanager
+    def lote(self):
+        """Agrupa varias operaciones en una sola escritura a disco.
+
+        Si ocurre una excepción dentro del bloque, se revierte el estado en
+        memoria y no se escribe nada. Los lotes anidados se unen al exterior.
+        """
+        if self._pendientes is not None:
+            yield self
+            return
+        self._pendientes = []
+        self._deshacer = []
+        self._orden_previo = None
+        self._retener_eventos()
+        try:
+            yield self
+        except BaseException:
+            self._revertir()
+            self._liberar_eventos(descartar=True)
+            raise
+        finally:
+            pendientes, self._pendientes = self._pendientes, None
+            self._deshacer = []
+            self._orden_previo = None
+        try:
+            if pendientes:
+                self._volcar(pendientes)
+        finally:
+            self._liberar_eventos()
+
+    def agregar_muchos(self, productos) -> list[bool]:
+        with self.lote():
+            return [self.agregar(p) for p in productos]
+
+    def modificar_muchos(self, cambios) -> list[bool]:
+        """cambios: iterable de tuplas (codigo, nombre, cantidad, precio)."""
+        with self.lote():
+            return [self.modificar(*c) for c in cambios]
+
+    def eliminar_muchos(self, codigos) -> list[bool]:
+        with self.lote():
+            return [self.eliminar(c) for c in codigos]
+
+    def _anotar_deshacer(self, op: str, clave: str, previo) -> None:
+        if self._pendientes is not None:
+            self._deshacer.append((op, clave, previo))
+
+    def _revertir(self) -> None:
+        for op, clave, previo in reversed(self._deshacer):
+            if op == "agregar":
+                self._quitar(clave)
+            else:
+                # eliminar / modificar: volver a poner el producto anterior
+                self._poner(clave, previo)
+        if self._orden_previo is not None:
+            reordenado = self._coleccion()
+            reordenado.update((k, self.productos[k]) for k in self._orden_previo if k in self.productos)
+            self.productos = reordenado
+            self._ultimo_filtrado = None
+            if self.indice is not None:
+                # Caso poco común: reconstruir para recuperar el orden de los resultados
+                self.indice = IndiceTrigramas()
+                for k, p in self.productos.items():
+                    self.indice.agregar(k, p.nombre)
+            if self._plegados is not None:
+                self._plegados = {k: self._plegados[k] for k in self.productos}
+
+    def obtener(self, codigo: str) -> Producto | None:
+        return self.productos.get(self._clave(codigo))
 
     def listar(self) -> list:
-        return list(self.productos)
+        return list(self.productos.values())
+
+    def __len__(self) -> int:
+        return len(self.productos)
+
+    def __contains__(self, codigo) -> bool:
+        return self._clave(codigo) in self.productos
+
+    # ---------- Índice y totales ----------
+    def _poner(self, clave: str, p: Producto) -> None:
+        viejo = self.productos.get(clave)
+        if viejo is not None:
+            self._restar(clave, viejo)
+        self.productos[clave] = p
+        self._ultimo_filtrado = None
+        self._sumar(clave, p)
+
+    def _quitar(self, clave: str) -> Producto | None:
+        p = self.productos.pop(clave, None)
+        if p is not None:
+            self._ultimo_filtrado = None
+            self._restar(clave, p)
+            if self.indice is not None:
+                self.indice.quitar(clave)
+            if self._plegados is not None:
+                del self._plegados[clave]
+            for vista in self._vistas.values():
+                vista.quitar(clave)
+        return p
+
+    def _sumar(self, clave: str, p: Producto) -> None:
+        self._unidades += p.cantidad
+        self._centavos += p.cantidad * p.centavos
+        if self.indice is not None:
+            self.indice.agregar(clave, p.nombre)  # si ya existe, sólo actualiza
+        if self._plegados is not None:
+            self._plegados[clave] = f"{plegar(p.codigo)}\0{plegar(p.nombre)}"
+        for vista in self._vistas.values():
+            vista.poner(clave, p)
+
+    def _restar(self, clave: str, p: Producto) -> None:
+        self._unidades -= p.cantidad
+        self._centavos -= p.cantidad * p.centavos
+
+    def resumen(self, filtro: str | None = None) -> tuple[int, int, int]:
+        """(productos, unidades, valor en centavos) del inventario o de una búsqueda.
+
+        Sin filtro es O(1). Con filtro recorre sólo los productos que coinciden.
+        """
+        if not filtro or not filtro.strip():
+            return len(self.productos), self._unidades, self._centavos
+        n = unidades = valor = 0
+        for p in self._filtrados(filtro):
+            n += 1
+            unidades += p.cantidad
+            valor += p.cantidad * p.centavos
+        return n, unidades, valor
+
+    # ---------- Consultas ----------
+    @staticmethod
+    def coincide(p: Producto, filtro: str | None) -> bool:
+        """True si el producto entra en la búsqueda 'filtro' (código o nombre, sin tildes)."""
+        if not filtro or not filtro.strip():
+            return True
+        f = normalizar(filtro.strip())
+        return f in plegar(p.codigo) or f in plegar(p.nombre)
+
+    def _codigos_filtrados(self, filtro: str):
+        """Códigos que coinciden con 'filtro', en orden de inserción."""
+        if self.indice is not None:
+            return self.indice.buscar(filtro)
+        f = normalizar(filtro.strip())
+        return (c for c, texto in self._plegados.items() if f in texto)
+
+    def _filtrados(self, filtro: str | None):
+        """Productos que coinciden (lista compartida: no modificarla)."""
+        productos = self.productos.values()
+        if not filtro or not filtro.strip():
+            return productos
+        # Al refrescar se pide la misma búsqueda varias veces seguidas (contar,
+        # resumen, página): se recorre una vez y se reusa hasta el próximo cambio
+        if self._ultimo_filtrado is not None and self._ultimo_filtrado[0] == filtro:
+            return self._ultimo_filtrado[1]
+        lista = [self.productos[c] for c in self._codigos_filtrados(filtro)]
+        self._ultimo_filtrado = (filtro, lista)
+        return lista
+
+    def consultar(self, filtro: str | None = None, orden: str | None = None,
+                  descendente: bool = False, desde: int = 0, limite: int | None = None) -> list:
+        """Productos que contienen 'filtro' en código o nombre, ordenados y paginados.
+
+        Sin filtro sólo se materializa la página pedida: con orden se corta la
+        vista ordenada de esa columna, sin orden se recorre el índice por código.
+        """
+        fin = None if limite is None else desde + limite
+        if filtro and filtro.strip():
+            productos = self._filtrados(filtro)
+            if orden:
+                claves = self._vista(orden).claves
+                productos = sorted(productos, key=lambda p: (claves[p.codigo], p.codigo), reverse=descendente)
+            elif descendente:
+                productos = productos[::-1]
+            return productos[desde:fin]
+        if orden:
+            codigos = self._vista(orden).pagina(desde, limite, descendente)
+        else:
+            it = reversed(self.productos) if descendente else iter(self.productos)
+            codigos = islice(it, desde, fin)
+        return [self.productos[c] for c in codigos]
+
+    def recorrer(self, filtro: str | None = None):
+        """Generador de los productos (en orden de inserción) que coinciden con 'filtro'.
+
+        A diferencia de consultar(), no arma la lista completa (p. ej. para exportar).
+        """
+        if not filtro or not filtro.strip():
+            yield from self.productos.values()
+            return
+        # Sólo los códigos; los productos se arman de a uno
+        for c in self._codigos_filtrados(filtro):
+            yield self.productos[c]
+
+    def _vista(self, orden: str) -> VistaOrdenada:
+        vista = self._vistas.get(orden)
+        if vista is None:
+            vista = self._vistas[orden] = VistaOrdenada(CLAVES_ORDEN[orden], self.productos)
+        return vista
+
+    def contar(self, filtro: str | None = None) -> int:
+        return len(self._filtrados(filtro)) if filtro else len(self.productos)
 
     # ---------- Persistencia ----------
+    def _registrar(self, registro: dict) -> None:
+        """Persiste un cambio: línea en el diario o snapshot completo."""
+        if self._pendientes is not None:
+            self._pendientes.append(registro)
+            return
+        self._volcar([registro])
+
+    def _volcar(self, registros: list[dict]) -> None:
+        if not self.diario:
+            self.guardar()
+            return
+        if self.compartido is not None:
+            for r in registros:
+                self._cambio += 1
+                r["autor"] = self.compartido.autor
+                r["n"] = self._cambio
+                self._cambios_locales[self._codigo_de(r)] = self._cambio
+        datos = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n"
+                        for r in registros).encode("utf-8")
+        if self.compartido is not None:
+            self._volcar_compartido(datos)
+            return
+        if self.escritor is not None:
+            self.escritor.anotar(datos)
+        else:
+            self._escribir_diario(datos)
+        self._tam_diario += len(datos)
+        if self._tam_diario > self.limite_diario:
+            self.compactar()
+
+    def _escribir_diario(self, datos: bytes) -> None:
+        if self.compartido is not None:
+            with self.compartido.bloqueo():
+                self.compartido.anexar(datos)
+            return
+        with self.archivo_diario.open("ab") as f:
+            f.write(datos)
+
     def guardar(self) -> None:
-        data = [p.to_dict() for p in self.productos]
-        self.archivo.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        """Escribe el snapshot completo (con segundo_plano=True sólo lo encola)."""
+        if self.compartido is not None:
+            self._guardar_compartido()
+        elif self.escritor is not None:
+            # El hilo recorre una copia de la colección (modificar() no cambia
+            # los Producto en su lugar, así que la copia es una foto consistente)
+            self.escritor.pedir_snapshot(self.productos.copy().values())
+        else:
+            self._escribir_snapshot(self.productos.values())
+        self._tam_diario = 0
 
-    def cargar(self) -> None:
-        if not self.archivo.exists() or self.archivo.stat().st_size == 0:
-            self.productos = []
+    def _escribir_snapshot(self, productos) -> None:
+        # Escritura atómica: si falla a mitad, el snapshot anterior + diario siguen válidos
+        tmp = self.archivo.with_name(self.archivo.name + ".tmp")
+        self.almacen.escribir(tmp, productos)
+        os.replace(tmp, self.archivo)
+        if self.compartido is not None:
+            self._firma_snapshot = firma_archivo(self.archivo)
+            # Diario nuevo con la generación siguiente: los demás procesos recargan
+            self.compartido.reiniciar(self.compartido.leer_generacion() + 1)
+        elif self.diario:
+            # El diario ya está incluido en el snapshot
+            self.archivo_diario.write_bytes(b"")
+
+    def compactar(self) -> None:
+        """Incorpora el diario en un snapshot nuevo y lo vacía."""
+        self.guardar()
+
+    def sincronizar(self) -> None:
+        """Espera a que el hilo escritor termine lo pendiente (relanza su error, si hubo)."""
+        if self.escritor is not None:
+            self.escritor.vaciar()
+
+    def cerrar(self) -> None:
+        """Escribe lo pendiente y detiene el hilo escritor; después se escribe sin hilo."""
+        if self.escritor is not None:
+            escritor, self.escritor = self.escritor, None
+            escritor.cerrar()
+
+    # ---------- Varios procesos (compartido=True) ----------
+    def actualizar_desde_disco(self) -> bool:
+        """
+        Trae los cambios que otros procesos escribieron en el archivo compartido
+        (pensado para llamarse seguido, p. ej. con after()). Si ni el diario ni el
+        snapshot cambiaron (mtime, tamaño, inodo) no se abre nada. Sólo se aplica
+        la diferencia y se avisa producto por producto. True si hubo cambios.
+        """
+        if self.compartido is None or self.cargando or not self._cambio_externo():
+            return False
+        # Los avisos salen después de soltar el bloqueo
+        with self._agrupar_eventos(MAX_AVISOS_POR_FILA), self.compartido.bloqueo():
+            return self._traer_ajenos()
+
+    def _cambio_externo(self) -> bool:
+        return self.compartido.cambio() or firma_archivo(self.archivo) != self._firma_snapshot
+
+    def _volcar_compartido(self, datos: bytes) -> None:
+        d = self.compartido
+        if self.escritor is not None:
+            # Detección barata antes de escribir; la escritura la hace el hilo
+            self.actualizar_desde_disco()
+            self.escritor.anotar(datos, self._cambio)
+        else:
+            with self._agrupar_eventos(MAX_AVISOS_POR_FILA), d.bloqueo():
+                if self._cambio_externo():
+                    self._traer_ajenos()
+                d.anexar(datos, avanzar=True)
+            self._cambio_escrito = self._cambio
+        # Se compacta por el tamaño total del diario (lo escrito por todos)
+        if d.leido > self.limite_diario and (d.generacion, d.leido) >= self._proxima_compactacion:
+            self._proxima_compactacion = (d.generacion, d.leido + self.limite_diario // 4)
+            self.compactar()
+
+    def _guardar_compartido(self) -> None:
+        d = self.compartido
+        if self.escritor is not None:
+            self.actualizar_desde_disco()
+            # Versión optimista: el hilo sólo compacta si desde (generación, leído)
+            # nadie más escribió; si no, se deja para la próxima vez
+            foto = (self.productos.copy().values(), d.generacion, d.leido)
+            self.escritor.pedir_snapshot(foto, descartar_lineas=False)
             return
+        with self._agrupar_eventos(MAX_AVISOS_POR_FILA), d.bloqueo():
+            if self._cambio_externo():
+                self._traer_ajenos()
+            self._escribir_snapshot(self.productos.values())
+            d.leer_nuevas()  # toma la cabecera de la generación nueva
+
+    def _escribir_snapshot_compartido(self, foto) -> None:
+        # En el hilo escritor: nunca toca la memoria, sólo los archivos
+        productos, generacion, leido = foto
+        with self.compartido.bloqueo():
+            if self.compartido.sin_ajenos_desde(generacion, leido):
+                self._escribir_snapshot(productos)
+
+    def _traer_ajenos(self) -> bool:
+        # Con el bloqueo tomado
+        d = self.compartido
+        escrito = self.escritor.escrito_hasta if self.escritor is not None else self._cambio_escrito
+        self._cambios_locales = {c: n for c, n in self._cambios_locales.items() if n > escrito}
+        if firma_archivo(self.archivo) != self._firma_snapshot:
+            # Snapshot reemplazado sin cambiar de generación (p. ej. un programa que
+            # no usa el modo compartido): hay que releer también el diario entero
+            d.preparar(d.leer_generacion())
+            return self._recargar_diferencias()
+        otra, registros = d.leer_nuevas()
+        if otra:
+            # Otro proceso compactó: su posición en el diario ya no sirve
+            return self._recargar_diferencias()
+        cambios = False
+        for r in registros:
+            cambios = self._fusionar(r) or cambios
+        return cambios
+
+    def _recargar_diferencias(self) -> bool:
+        """
+        Lee snapshot + diario completos aparte y aplica sólo lo que difiere de la
+        memoria, avisando por producto. Lo propio sin escribir se conserva.
+        """
+        firma = firma_archivo(self.archivo)
+        nuevos: dict[str, Producto] = {}
+        if self._hay_snapshot():
+            try:
+                for datos in self.almacen.leer(self.archivo):
+                    p = Producto(**datos)
+                    nuevos[p.codigo] = p
+            except Exception:
+                # Archivo a medio escribir por otro programa: se reintenta la próxima vez
+                self._firma_snapshot = None
+                return False
+        self._firma_snapshot = firma
+        _, registros = self.compartido.leer_nuevas()
+        for r in registros:
+            self._confirmar_propio(r)
+            if r.get("op") in ("agregar", "modificar"):
+                p = Producto(**r["p"])
+                nuevos[p.codigo] = p
+            elif r.get("op") == "eliminar":
+                nuevos.pop(self._clave(r["codigo"]), None)
+        cambios = False
+        for c in [c for c in self.productos if c not in nuevos and c not in self._cambios_locales]:
+            cambios = self._avisar(c, self._quitar(c), None) or cambios
+        for c, p in nuevos.items():
+            if c not in self._cambios_locales:
+                anterior = self.productos.get(c)
+                if anterior is None or not self._iguales(anterior, p):
+                    self._poner(c, p)
+                    cambios = self._avisar(c, anterior, p) or cambios
+        return cambios
+
+    def _confirmar_propio(self, r: dict) -> bool:
+        """Si r es una línea propia, la marca como escrita. True si era propia."""
+        if r.get("autor") != self.compartido.autor:
+            return False
+        c = self._codigo_de(r)
+        n = self._cambios_locales.get(c)
+        if n is not None and r.get("n", 0) >= n:
+            del self._cambios_locales[c]
+        return True
+
+    def _fusionar(self, r: dict) -> bool:
+        c = self._codigo_de(r)
+        if c is None:
+            return False
+        if c in self._cambios_locales:
+            # Hay un cambio propio más nuevo (o igual) en memoria: no se aplica
+            if not self._confirmar_propio(r):
+                self.conflictos.append(c)
+            return False
+        # Se aplica en el orden del diario (también las líneas propias ya escritas,
+        # por si un cambio ajeno anterior al mismo producto se aplicó antes)
+        anterior = self.productos.get(c)
+        self._aplicar(r)
+        return self._avisar(c, anterior, self.productos.get(c))
+
+    def _avisar(self, c: str, anterior: Producto | None, nuevo: Producto | None) -> bool:
+        """Emite el aviso que corresponde a un cambio traído de disco. False si no hubo cambio."""
+        if anterior is None and nuevo is None:
+            return False
+        if anterior is None:
+            self._emitir("agregar", c, nuevo)
+        elif nuevo is None:
+            self._emitir("eliminar", c, None, anterior)
+        elif not self._iguales(anterior, nuevo):
+            self._emitir("modificar", c, nuevo, anterior)
+        else:
+            return False
+        return True
+
+    @staticmethod
+    def _iguales(a: Producto, b: Producto) -> bool:
+        return (a.nombre, a.cantidad, a.centavos) == (b.nombre, b.cantidad, b.centavos)
+
+    def _codigo_de(self, r: dict) -> str | None:
+        if "p" in r:
+            return self._clave(r["p"]["codigo"])
+        if "codigo" in r:
+            return self._clave(r["codigo"])
+        return None
+
+    def _reiniciar(self) -> None:
+        self.productos = self._coleccion()
+        self._unidades = self._centavos = 0
+        self.indice = IndiceTrigramas() if self._usar_indice else None
+        self._plegados = None if self._usar_indice else {}
+        self._vistas = {}
+        self._ultimo_filtrado = None
+
+    def _hay_snapshot(self) -> bool:
+        return self.archivo.exists() and self.archivo.stat().st_size > 0
+
+    def cargar(self) -> None:
+        inicio = time.perf_counter()
+        self._preparar_carga()
+        self._cargar_snapshot()
+        self._terminar_carga(inicio)
+
+    def _cargar_snapshot(self) -> None:
+        self._reiniciar()
+        if self._hay_snapshot():
+            try:
+                # Carga incremental: nunca conviven el texto completo y todos los objetos
+                for d in self.almacen.leer(self.archivo):
+                    p = Producto(**d)
+                    self._poner(p.codigo, p)
+            except Exception:
+                # Si el archivo está corrupto, no romper la app
+                self._reiniciar()
+
+    def cargar_por_partes(self, tam: int = 5000):
+        """
+        Igual que cargar(), pero como generador: tras cada parte de 'tam' productos
+        devuelve cuántos van y avisa "recargar" a los suscriptores. Leer y parsear
+        el archivo se hace en un hilo lector; el llamador decide cuándo seguir
+        (p. ej. con after() para que la interfaz responda entre parte y parte).
+        """
+        inicio = time.perf_counter()
+        self.cargando = True
+        self._preparar_carga()
+        self._reiniciar()
         try:
-            data = json.loads(self.archivo.read_text(encoding="utf-8"))
-            self.productos = [Producto(**d) for d in data]
-        except Exception:
-            # Si el archivo está corrupto, no romper la app
-            self.productos = []
+            if self._hay_snapshot():
+                leer = lambda: (Producto(**d) for d in self.almacen.leer(self.archivo))
+                try:
+                    for parte in leer_en_hilo(leer, tam):
+                        for p in parte:
+                            self._poner(p.codigo, p)
+                        self._emitir("recargar", None)
+                        yield len(self.productos)
+                except Exception:
+                    self._reiniciar()
+            self._terminar_carga(inicio)
+        finally:
+            self.cargando = False
+        self._emitir("recargar", None)
+        yield len(self.productos)
+
+    def _preparar_carga(self) -> None:
+        if self.compartido is not None:
+            # Generación del diario antes de leer el snapshot; si cambia durante
+            # la lectura, _terminar_carga lo nota y vuelve a leer
+            with self.compartido.bloqueo():
+                self.compartido.preparar(self.compartido.leer_generacion())
+                self._firma_snapshot = firma_archivo(self.archivo)
+
+    def _terminar_carga(self, inicio: float) -> None:
+        if self.compartido is not None:
+            with self.compartido.bloqueo():
+                otra, registros = self.compartido.leer_nuevas()
+                if otra:
+                    self._firma_snapshot = firma_archivo(self.archivo)
+                    self._cargar_snapshot()
+                    _, registros = self.compartido.leer_nuevas()
+                for r in registros:
+                    self._aplicar(r)
+        elif self.diario:
+            self._reproducir_diario()
+            existe = self.archivo_diario.exists()
+            self._tam_diario = self.archivo_diario.stat().st_size if existe else 0
+        segundos = time.perf_counter() - inicio
+        self.ultima_carga = {
+            "productos": len(self.productos),
+            "segundos": segundos,
+            "por_segundo": len(self.productos) / segundos if segundos > 0 else 0.0,
+        }
+
+    def _reproducir_diario(self) -> None:
+        if not self.archivo_diario.exists():
+            return
+        valido = 0  # bytes hasta el final de la última línea entera
+        with self.archivo_diario.open("rb") as f:
+            for linea in f:
+                if not linea.endswith(b"\n"):
+                    break
+                try:
+                    r = json.loads(linea)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    raise ValueError(f"Diario dañado en el byte {valido}: {self.archivo_diario}") from None
+                self._aplicar(r)
+                valido += len(linea)
+            cortado = f.tell() > valido
+        if cortado:
+            # Última línea incompleta (corte durante la escritura): nunca se
+            # confirmó; se recorta para que el próximo cambio no quede pegado a ella
+            os.truncate(self.archivo_diario, valido)
 
+    def _aplicar(self, r: dict) -> None:
+        # Reaplicar es idempotente: agregar/modificar sobrescriben, eliminar ignora ausentes
+        if r.get("op") in ("agregar", "modificar"):
+            p = Producto(**r["p"])
+            self._poner(p.codigo, p)
+        elif r.get("op") == "eliminar":
+            self._quitar(self._clave(r["codigo"]))
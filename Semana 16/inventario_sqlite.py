@@ -0,0 +1,196 @@
+# inventario_sqlite.py
+# Inventario sobre SQLite (módulo estándar sqlite3), para almacenes grandes.
+# Misma interfaz que Inventario: agregar / eliminar / modificar / listar,
+# lote() y consultar() / contar() con filtro, orden y paginación en la base.
+import sqlite3
+from contextlib import contextmanager
+from eventos import EmisorCambios
+from indice_busqueda import normalizar, plegar
+from producto import Producto
+
+# Columna SQL para cada orden admitido por consultar()
+COLUMNAS_ORDEN = {
+    "codigo": "codigo COLLATE NOCASE",
+    "nombre": "nombre_min",
+    "cantidad": "cantidad",
+    "precio": "centavos",
+    "total": "cantidad * centavos",
+}
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS productos (
+    id         INTEGER PRIMARY KEY,
+    codigo     TEXT NOT NULL UNIQUE,
+    nombre     TEXT NOT NULL,
+    nombre_min TEXT NOT NULL,
+    cantidad   INTEGER NOT NULL,
+    centavos   INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_productos_nombre_min ON productos(nombre_min);
+"""
+_COLUMNAS = "codigo, nombre, cantidad, centavos"
+
+
+def _patron_like(filtro: str) -> str:
+    f = normalizar(filtro.strip())
+    f = f.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{f}%"
+
+
+class InventarioSQLite(EmisorCambios):
+    def __init__(self, archivo: str = "inventario.db"):
+        self.archivo = archivo
+        # isolation_level=None: autocommit por operación; lote() abre una transacción
+        self.conexion = sqlite3.connect(archivo, isolation_level=None)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        self.conexion.executescript(_ESQUEMA)
+        # El mismo plegado que Inventario, usable desde SQL ("Café" coincide con "cafe")
+        self.conexion.create_function("plegar", 1, plegar, deterministic=True)
+        self._en_lote = False
+        self.cargando = False  # misma interfaz que Inventario (no hay carga por partes)
+        self._iniciar_eventos()
+
+    @staticmethod
+    def _clave(codigo) -> str:
+        return str(codigo).strip()
+
+    @staticmethod
+    def _producto(fila) -> Producto:
+        return Producto.de_centavos(*fila)
+
+    # ---------- CRUD ----------
+    def agregar(self, producto: Producto) -> bool:
+        try:
+            self.conexion.execute(
+                "INSERT INTO productos (codigo, nombre, nombre_min, cantidad, centavos) VALUES (?, ?, ?, ?, ?)",
+                (producto.codigo, producto.nombre, plegar(producto.nombre), producto.cantidad, producto.centavos),
+            )
+        except sqlite3.IntegrityError:
+            return False
+        self._emitir("agregar", producto.codigo, producto)
+        return True
+
+    def eliminar(self, codigo: str) -> bool:
+        clave = self._clave(codigo)
+        anterior = self.obtener(clave) if self.con_suscriptores else None
+        cur = self.conexion.execute("DELETE FROM productos WHERE codigo = ?", (clave,))
+        if cur.rowcount == 0:
+            return False
+        self._emitir("eliminar", clave, None, anterior)
+        return True
+
+    def modificar(self, codigo: str, nombre: str, cantidad: int, precio) -> bool:
+        """precio en dólares (float, str, Decimal) o Dinero (centavos exactos)."""
+        p = Producto(codigo, nombre, cantidad, precio)
+        anterior = self.obtener(p.codigo) if self.con_suscriptores else None
+        cur = self.conexion.execute(
+            "UPDATE productos SET nombre = ?, nombre_min = ?, cantidad = ?, centavos = ? WHERE codigo = ?",
+            (p.nombre, plegar(p.nombre), p.cantidad, p.centavos, p.codigo),
+        )
+        if cur.rowcount == 0:
+            return False
+        self._emitir("modificar", p.codigo, p, anterior)
+        return True
+
+    def obtener(self, codigo: str) -> Producto | None:
+        fila = self.conexion.execute(
+            f"SELECT {_COLUMNAS} FROM productos WHERE codigo = ?", (self._clave(codigo),)
+        ).fetchone()
+        return self._producto(fila) if fila else None
+
+    def listar(self) -> list:
+        cur = self.conexion.execute(f"SELECT {_COLUMNAS} FROM productos ORDER BY id")
+        return [self._producto(f) for f in cur]
+
+    def __len__(self) -> int:
+        return self.conexion.execute("SELECT COUNT(*) FROM productos").fetchone()[0]
+
+    def __contains__(self, codigo) -> bool:
+        return self.conexion.execute(
+            "SELECT 1 FROM productos WHERE codigo = ?", (self._clave(codigo),)
+        ).fetchone() is not None
+
+    # ---------- Operaciones por lote ----------
+    @contextmanager
+    def lote(self):
+        """Una sola transacción; si hay una excepción se hace ROLLBACK."""
+        if self._en_lote:
+            yield self
+            return
+        self._en_lote = True
+        self._retener_eventos()
+        self.conexion.execute("BEGIN")
+        try:
+            yield self
+        except BaseException:
+            self.conexion.execute("ROLLBACK")
+            self._liberar_eventos(descartar=True)
+            raise
+        else:
+            self.conexion.execute("COMMIT")
+            self._liberar_eventos()
+        finally:
+            self._en_lote = False
+
+    def agregar_muchos(self, productos) -> list[bool]:
+        with self.lote():
+            return [self.agregar(p) for p in productos]
+
+    def modificar_muchos(self, cambios) -> list[bool]:
+        """cambios: iterable de tuplas (codigo, nombre, cantidad, precio)."""
+        with self.lote():
+            return [self.modificar(*c) for c in cambios]
+
+    def eliminar_muchos(self, codigos) -> list[bool]:
+        with self.lote():
+            return [self.eliminar(c) for c in codigos]
+
+    # ---------- Consultas ----------
+    @staticmethod
+    def coincide(p: Producto, filtro: str | None) -> bool:
+        """Equivalente en Python del WHERE de consultar()."""
+        if not filtro or not filtro.strip():
+            return True
+        f = normalizar(filtro.strip())
+        return f in plegar(p.codigo) or f in plegar(p.nombre)
+
+    @staticmethod
+    def _where(filtro: str | None) -> tuple[str, tuple]:
+        if not filtro or not filtro.strip():
+            return "", ()
+        patron = _patron_like(filtro)
+        return " WHERE plegar(codigo) LIKE ? ESCAPE '\\' OR nombre_min LIKE ? ESCAPE '\\'", (patron, patron)
+
+    def consultar(self, filtro: str | None = None, orden: str | None = None,
+                  descendente: bool = False, desde: int = 0, limite: int | None = None) -> list:
+        """Filtra, ordena y pagina en SQLite; sólo la página llega a Python."""
+        where, params = self._where(filtro)
+        sentido = "DESC" if descendente else "ASC"
+        # Empates por código, igual que las vistas ordenadas de Inventario
+        orden_sql = f"{COLUMNAS_ORDEN[orden]} {sentido}, codigo {sentido}" if orden else f"id {sentido}"
+        sql = f"SELECT {_COLUMNAS} FROM productos{where} ORDER BY {orden_sql} LIMIT ? OFFSET ?"
+        cur = self.conexion.execute(sql, params + (-1 if limite is None else limite, desde))
+        return [self._producto(f) for f in cur]
+
+    def recorrer(self, filtro: str | None = None):
+        """Generador de los productos que coinciden con 'filtro'; el cursor trae las filas de a poco."""
+        where, params = self._where(filtro)
+        cur = self.conexion.execute(f"SELECT {_COLUMNAS} FROM productos{where} ORDER BY id", params)
+        for fila in cur:
+            yield self._producto(fila)
+
+    def resumen(self, filtro: str | None = None) -> tuple[int, int, int]:
+        """(productos, unidades, valor en centavos) calculado en SQLite."""
+        where, params = self._where(filtro)
+        n, unidades, valor = self.conexion.execute(
+            f"SELECT COUNT(*), SUM(cantidad), SUM(cantidad * centavos) FROM productos{where}", params
+        ).fetchone()
+        return n, unidades or 0, valor or 0
+
+    def contar(self, filtro: str | None = None) -> int:
+        where, params = self._where(filtro)
+        return self.conexion.execute(f"SELECT COUNT(*) FROM productos{where}", params).fetchone()[0]
+
+    def cerrar(self) -> None:
+        self.conexion.close()
@@ -1,10 +1,35 @@
 import tkinter as tk
-from tkinter import ttk
-from PIL import Image, ImageTk  # pip install pillow
+from tkinter import ttk, messagebox
 from form_producto import FormProducto
+from imagenes import cargar_imagen
 from inventario import Inventario
 
 APP_W, APP_H = 980, 620
+PRODUCTOS_POR_PARTE = 5000  # productos cargados entre repintados de la interfaz
+VIGILANCIA_MS = 1000  # cada cuánto se mira si otro proceso cambió el archivo
+
+
+class PantallaCarga(tk.Toplevel):
+    """Ventanita de "Cargando inventario..." mientras se leen los productos."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Cargando")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.protocol("WM_DELETE_WINDOW", lambda: None)  # se cierra sola al terminar
+        frame = ttk.Frame(self, padding=16)
+        frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(frame, text="Cargando inventario...", font=("Segoe UI", 11, "bold")).pack(anchor="w")
+        self.barra = ttk.Progressbar(frame, mode="indeterminate", length=280)
+        self.barra.pack(pady=8)
+        self.barra.start(12)
+        self.detalle = ttk.Label(frame, text="0 productos")
+        self.detalle.pack(anchor="w")
+
+    def mostrar(self, productos: int):
+        self.detalle.config(text=f"{productos:,} productos")
+
 
 class App(tk.Tk):
     def __init__(self):
@@ -13,11 +38,15 @@ class App(tk.Tk):
         self.geometry(f"{APP_W}x{APP_H}")
         self.resizable(False, False)
 
-        self.inventario = Inventario()
+        # La E/S va en hilos aparte: la carga se hace por partes (ver _cargar_parte)
+        # y los guardados los hace el hilo escritor sin bloquear la interfaz.
+        # compartido=True: varias instancias de la app pueden usar el mismo archivo
+        self.inventario = Inventario(diario=True, indice_busqueda=True, segundo_plano=True,
+                                     cargar_ahora=False, compartido=True)
 
         # ---------- Fondo ----------
-        self._bg_img = Image.open("FONDO-1.jpeg").resize((APP_W, APP_H))
-        self._bg_photo = ImageTk.PhotoImage(self._bg_img)
+        # Imágenes ya escaladas desde la caché en disco (ver imagenes.py)
+        self._bg_photo = cargar_imagen("FONDO-1.jpeg", "exacto", APP_W, APP_H)
         canvas = tk.Canvas(self, width=APP_W, height=APP_H, highlightthickness=0)
         canvas.pack(fill=tk.BOTH, expand=True)
         canvas.create_image(0, 0, anchor="nw", image=self._bg_photo)
@@ -29,11 +58,7 @@ class App(tk.Tk):
         canvas.create_window(APP_W // 2, 210, window=panel, anchor="center")
 
         # Logo
-        logo_img = Image.open("logo_uea.png")
-        max_w = 460
-        ratio = max_w / logo_img.width
-        logo_img = logo_img.resize((int(logo_img.width * ratio), int(logo_img.height * ratio)), Image.LANCZOS)
-        self._logo_photo = ImageTk.PhotoImage(logo_img)
+        self._logo_photo = cargar_imagen("logo_uea.png", "ancho", 460)
         ttk.Label(panel, image=self._logo_photo).grid(row=0, column=0, pady=(0, 10))
 
         # Textos institucionales
@@ -55,13 +80,52 @@ class App(tk.Tk):
         menu.add_cascade(label="Opciones", menu=opciones)
         opciones.add_command(label="Productos", command=self._abrir_productos)
         opciones.add_separator()
-        opciones.add_command(label="Salir", command=self.destroy)
+        opciones.add_command(label="Salir", command=self._salir)
 
         # Botón grande igual al menú (por si el profe quiere clic visual)
         ttk.Button(self, text="Abrir Productos", command=self._abrir_productos).place(x=APP_W//2-80, y=APP_H-90, width=160, height=36)
 
-        # Atajo para cerrar
-        self.bind("<Escape>", lambda e: self.destroy())
+        # Atajo para cerrar (y cierre con la X): primero se vacía la cola del escritor
+        self.bind("<Escape>", lambda e: self._salir())
+        self.protocol("WM_DELETE_WINDOW", self._salir)
+
+        # ---------- Carga del inventario ----------
+        self._carga = PantallaCarga(self)
+        self._partes = self.inventario.cargar_por_partes(PRODUCTOS_POR_PARTE)
+        self._vigilancia = None
+        self.after(50, self._cargar_parte)  # deja pintar la ventana antes de empezar
+
+    def _cargar_parte(self):
+        # Una parte por llamada; entre parte y parte Tk atiende eventos y repinta
+        try:
+            n = next(self._partes)
+        except StopIteration:
+            self._partes = None
+            self._carga.destroy()
+            self._vigilancia = self.after(VIGILANCIA_MS, self._vigilar)
+            return
+        self._carga.mostrar(n)
+        self.after(1, self._cargar_parte)
+
+    def _vigilar(self):
+        # Sondeo barato (un par de stat); si otra instancia cambió el archivo, el
+        # inventario trae sólo la diferencia y FormProducto actualiza esas filas
+        try:
+            self.inventario.actualizar_desde_disco()
+        except OSError:
+            pass  # archivo ocupado o movido: se reintenta en la próxima vuelta
+        self._vigilancia = self.after(VIGILANCIA_MS, self._vigilar)
+
+    def _salir(self):
+        if self._vigilancia is not None:
+            self.after_cancel(self._vigilancia)
+        if self._partes is not None:
+            self._partes.close()  # detiene el hilo lector
+        try:
+            self.inventario.cerrar()
+        except OSError as ex:
+            messagebox.showerror("Error", f"No se pudieron guardar los últimos cambios:\n{ex}")
+        self.destroy()
 
     def _abrir_productos(self):
         FormProducto(self, self.inventario)
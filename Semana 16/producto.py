@@ -1,13 +1,43 @@
+import sys
+from array import array
+from collections.abc import MutableMapping
+from dinero import a_centavos, a_texto
+
+
 class Producto:
-    def __init__(self, codigo: str, nombre: str, cantidad: int, precio: float):
+    # Sin __dict__ por instancia: menos memoria con catálogos grandes.
+    # El precio se guarda en centavos enteros (ver dinero.py).
+    __slots__ = ("codigo", "nombre", "cantidad", "centavos")
+
+    def __init__(self, codigo: str, nombre: str, cantidad: int, precio=0, centavos: int | None = None):
+        """precio: monto en dólares (float, str, Decimal o Dinero); o bien centavos=..."""
         # Siempre manejar código como string para evitar inconsistencias
         self.codigo = str(codigo).strip()
         self.nombre = nombre.strip()
         self.cantidad = int(cantidad)
-        self.precio = float(precio)
+        self.centavos = int(centavos) if centavos is not None else a_centavos(precio)
+
+    @classmethod
+    def de_centavos(cls, codigo: str, nombre: str, cantidad: int, centavos: int) -> "Producto":
+        """Sin validar ni convertir: para datos que ya vienen limpios (tablas, base)."""
+        p = cls.__new__(cls)
+        p.codigo = codigo
+        p.nombre = nombre
+        p.cantidad = cantidad
+        p.centavos = centavos
+        return p
+
+    @property
+    def precio(self) -> float:
+        # Sólo para mostrar / JSON: 1234 centavos -> 12.34 (repr exacto con 2 decimales)
+        return self.centavos / 100
+
+    @precio.setter
+    def precio(self, valor) -> None:
+        self.centavos = a_centavos(valor)
 
     def __str__(self):
-        return f"{self.codigo} - {self.nombre} ({self.cantidad}) - ${self.precio:.2f}"
+        return f"{self.codigo} - {self.nombre} ({self.cantidad}) - ${a_texto(self.centavos)}"
 
     def to_dict(self):
         return {
@@ -17,3 +47,81 @@ class Producto:
             "precio": self.precio
         }
 
+
+class TablaProductos(MutableMapping):
+    """
+    Almacén columnar de productos: {codigo: Producto} sin guardar objetos.
+    - cantidades / centavos: columnas array('q')
+    - codigos / nombres: listas de strings internados
+    - indice: dict { codigo: fila }
+    Al leer se entrega un Producto nuevo (copia); para cambiar un producto
+    hay que volver a asignarlo con tabla[codigo] = producto.
+    Las filas eliminadas quedan como huecos y se compactan cuando son muchas,
+    así se conserva el orden de inserción.
+    """
+    def __init__(self, items=()):
+        self.codigos: list[str | None] = []
+        self.nombres: list[str | None] = []
+        self.cantidades = array("q")
+        self.centavos = array("q")
+        self.indice: dict[str, int] = {}
+        self._huecos = 0
+        self.update(items)
+
+    def __getitem__(self, codigo) -> Producto:
+        fila = self.indice[codigo]
+        return Producto.de_centavos(self.codigos[fila], self.nombres[fila],
+                                    self.cantidades[fila], self.centavos[fila])
+
+    def __setitem__(self, codigo, p: Producto) -> None:
+        fila = self.indice.get(codigo)
+        if fila is None:
+            self.indice[codigo] = len(self.codigos)
+            self.codigos.append(sys.intern(codigo))
+            self.nombres.append(sys.intern(p.nombre))
+            self.cantidades.append(p.cantidad)
+            self.centavos.append(p.centavos)
+        else:
+            self.nombres[fila] = sys.intern(p.nombre)
+            self.cantidades[fila] = p.cantidad
+            self.centavos[fila] = p.centavos
+
+    def __delitem__(self, codigo) -> None:
+        fila = self.indice.pop(codigo)
+        self.codigos[fila] = None
+        self.nombres[fila] = None
+        self._huecos += 1
+        if self._huecos > 1024 and self._huecos * 2 > len(self.codigos):
+            self._compactar()
+
+    def __iter__(self):
+        return (c for c in self.codigos if c is not None)
+
+    def __reversed__(self):
+        return (c for c in reversed(self.codigos) if c is not None)
+
+    def __len__(self) -> int:
+        return len(self.indice)
+
+    def __contains__(self, codigo) -> bool:
+        return codigo in self.indice
+
+    def copy(self) -> "TablaProductos":
+        """Copia independiente; copia las columnas enteras sin crear Productos."""
+        t = TablaProductos.__new__(TablaProductos)
+        t.codigos = self.codigos.copy()
+        t.nombres = self.nombres.copy()
+        t.cantidades = self.cantidades[:]
+        t.centavos = self.centavos[:]
+        t.indice = self.indice.copy()
+        t._huecos = self._huecos
+        return t
+
+    def _compactar(self) -> None:
+        vivas = [i for i, c in enumerate(self.codigos) if c is not None]
+        self.codigos = [self.codigos[i] for i in vivas]
+        self.nombres = [self.nombres[i] for i in vivas]
+        self.cantidades = array("q", (self.cantidades[i] for i in vivas))
+        self.centavos = array("q", (self.centavos[i] for i in vivas))
+        self.indice = {c: i for i, c in enumerate(self.codigos)}
+        self._huecos = 0
@@ -0,0 +1,151 @@
+# segundo_plano.py
+# Hilos de apoyo para que la interfaz no se congele con la E/S a disco.
+#   - EscritorDiferido: un hilo escritor con cola que se compacta sola. Las
+#     líneas del diario pendientes se escriben juntas en un solo write y varios
+#     pedidos de snapshot seguidos se reducen al último.
+#   - leer_en_hilo: recorre un generador (lectura + parseo) en otro hilo y
+#     entrega los elementos por partes.
+# Ninguno de los dos hilos toca Tk ni el Inventario: sólo reciben datos.
+import queue
+import threading
+
+
+class EscritorDiferido:
+    def __init__(self, escribir_diario, escribir_snapshot):
+        """
+        escribir_diario: función bytes -> None (añade líneas al diario)
+        escribir_snapshot: función que recibe lo pasado a pedir_snapshot()
+        """
+        self._escribir_diario = escribir_diario
+        self._escribir_snapshot = escribir_snapshot
+        self._cond = threading.Condition()
+        self._lineas: list[bytes] = []
+        self._marca = 0
+        self._snapshot = None
+        self._ocupado = False
+        self._cerrado = False
+        # Último error de escritura; se relanza en vaciar()
+        self.error: BaseException | None = None
+        # Escrituras reales hechas (menos que los pedidos si se unieron)
+        self.escrituras = 0
+        # Marca de las últimas líneas que llegaron al disco (ver anotar)
+        self.escrito_hasta = 0
+        self._hilo = threading.Thread(target=self._trabajar, name="escritor-inventario", daemon=True)
+        self._hilo.start()
+
+    @property
+    def pendiente(self) -> bool:
+        with self._cond:
+            return self._hay_trabajo() or self._ocupado
+
+    def anotar(self, datos: bytes, marca: int = 0) -> None:
+        """Encola líneas para el diario. 'marca' (creciente) pasa a escrito_hasta al escribirlas."""
+        with self._cond:
+            self._lineas.append(datos)
+            self._marca = max(self._marca, marca)
+            self._cond.notify()
+
+    def pedir_snapshot(self, productos, descartar_lineas: bool = True) -> None:
+        """Encola un snapshot completo; reemplaza al que aún no se haya escrito."""
+        with self._cond:
+            self._snapshot = productos
+            if descartar_lineas:
+                # Las líneas todavía no escritas ya están incluidas en el snapshot
+                self._lineas = []
+            self._cond.notify()
+
+    def vaciar(self, timeout: float | None = None) -> bool:
+        """Espera a que no quede nada pendiente. False si venció el timeout."""
+        with self._cond:
+            listo = self._cond.wait_for(lambda: not (self._hay_trabajo() or self._ocupado), timeout)
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+        return listo
+
+    def cerrar(self) -> None:
+        """Escribe lo pendiente y termina el hilo."""
+        with self._cond:
+            self._cerrado = True
+            self._cond.notify()
+        self._hilo.join()
+        self.vaciar()
+
+    def _hay_trabajo(self) -> bool:
+        return bool(self._lineas) or self._snapshot is not None
+
+    def _intentar(self, escribir, datos) -> bool:
+        try:
+            escribir(datos)
+        except BaseException as ex:
+            self.error = ex
+            return False
+        self.escrituras += 1
+        return True
+
+    def _trabajar(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._hay_trabajo() or self._cerrado)
+                if not self._hay_trabajo():
+                    return
+                snapshot, self._snapshot = self._snapshot, None
+                lineas, self._lineas = self._lineas, []
+                marca = self._marca
+                self._ocupado = True
+            # Primero el snapshot (vacía el diario) y después las líneas posteriores;
+            # si el snapshot falla, las líneas igual se intentan escribir
+            if snapshot is not None:
+                self._intentar(self._escribir_snapshot, snapshot)
+            if lineas and self._intentar(self._escribir_diario, b"".join(lineas)):
+                self.escrito_hasta = marca
+            with self._cond:
+                self._ocupado = False
+                self._cond.notify_all()
+
+
+def leer_en_hilo(leer, tam: int = 5000, en_cola: int = 4):
+    """
+    Ejecuta leer() (un generador) en un hilo aparte y entrega sus elementos en
+    listas de hasta 'tam'. Si leer() falla, la excepción se relanza aquí.
+    """
+    cola: queue.Queue = queue.Queue(maxsize=en_cola)
+    parar = threading.Event()
+    fin = object()
+
+    def poner(x) -> bool:
+        # put con espera corta para poder abandonar si el consumidor se fue
+        while not parar.is_set():
+            try:
+                cola.put(x, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def trabajar() -> None:
+        try:
+            parte = []
+            for x in leer():
+                parte.append(x)
+                if len(parte) >= tam:
+                    if not poner(parte):
+                        return
+                    parte = []
+            if parte and not poner(parte):
+                return
+            poner(fin)
+        except BaseException as ex:
+            poner(ex)
+
+    threading.Thread(target=trabajar, name="lector-inventario", daemon=True).start()
+    try:
+        while True:
+            x = cola.get()
+            if x is fin:
+                return
+            if isinstance(x, BaseException):
+                raise x
+            yield x
+    finally:
+        parar.set()
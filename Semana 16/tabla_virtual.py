@@ -0,0 +1,229 @@
+# tabla_virtual.py
+# Treeview "virtual": sólo existen en Tk las filas visibles. El modelo (Inventario
+# o InventarioSQLite) entrega cada página con consultar(filtro, orden, ...), y la
+# barra de desplazamiento trabaja sobre el total de filas, no sobre el Treeview.
+import tkinter as tk
+from tkinter import ttk
+from inventario import CLAVES_ORDEN
+
+SOBRECARGA = 32  # filas extra que se piden arriba y abajo de la ventana visible
+
+
+class TablaVirtual(ttk.Frame):
+    def __init__(self, parent, modelo, columnas, formatear, alto: int = 16):
+        """
+        modelo: objeto con consultar() y contar()
+        columnas: tuplas (id, título, ancho, anchor)
+        formatear: función Producto -> tupla de valores para las columnas
+        """
+        super().__init__(parent)
+        self.modelo = modelo
+        self.formatear = formatear
+        self.alto = alto
+
+        # Estado de búsqueda / orden / posición
+        self.filtro: str | None = None
+        self.orden: str | None = None
+        self.descendente = False
+        self.desde = 0
+        self.total = 0
+
+        # Página en memoria (ventana visible + sobrecarga)
+        self._cache: list = []
+        self._cache_desde = 0
+
+        cols = tuple(c for c, *_ in columnas)
+        self.tree = ttk.Treeview(self, columns=cols, show="headings", height=alto)
+        for c, txt, w, anchor in columnas:
+            self.tree.heading(c, text=txt, command=lambda k=c: self.ordenar_por(k))
+            self.tree.column(c, width=w, anchor=anchor, stretch=False)
+
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._scroll)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.vsb.pack(side=tk.LEFT, fill=tk.Y)
+
+        # Zebra rows
+        self.tree.tag_configure("even", background="#f6f7fb")
+        self.tree.tag_configure("odd", background="white")
+
+        # Rueda del mouse (Windows/macOS y Linux) y teclado en los bordes
+        self.tree.bind("<MouseWheel>", self._rueda)
+        self.tree.bind("<Button-4>", lambda e: self._mover(self.desde - 3))
+        self.tree.bind("<Button-5>", lambda e: self._mover(self.desde + 3))
+        self.tree.bind("<Up>", lambda e: self._tecla(-1))
+        self.tree.bind("<Down>", lambda e: self._tecla(1))
+        self.tree.bind("<Prior>", lambda e: self._mover(self.desde - self.alto) or "break")
+        self.tree.bind("<Next>", lambda e: self._mover(self.desde + self.alto) or "break")
+
+    # ---------- API ----------
+    def refrescar(self, filtro: str | None = None) -> None:
+        """Vuelve a contar y pintar; conserva orden y posición si el filtro no cambia."""
+        filtro = (filtro or "").strip() or None
+        if filtro != self.filtro:
+            self.filtro = filtro
+            self.desde = 0
+        self.total = self.modelo.contar(self.filtro)
+        self._invalidar()
+        self._mover(self.desde)
+
+    def ordenar_por(self, col: str) -> None:
+        # Primer clic: ascendente; clics siguientes en la misma columna invierten
+        if self.orden == col:
+            self.descendente = not self.descendente
+        else:
+            self.orden, self.descendente = col, False
+        self._invalidar()
+        self._mover(self.desde)
+
+    def aplicar_cambio(self, tipo: str, codigo: str, nuevo=None, anterior=None) -> None:
+        """
+        Actualiza la tabla ante un evento del modelo tocando sólo lo necesario:
+        la fila afectada y el zebra de las filas visibles que se desplazan.
+        Si la posición de la fila no se puede deducir (p. ej. con orden activo),
+        se vuelve a pedir la página visible.
+        """
+        if tipo != "agregar" and anterior is None:
+            # Sin datos previos del producto no se sabe dónde estaba
+            self.refrescar(self.filtro)
+            return
+        antes = anterior is not None and self.modelo.coincide(anterior, self.filtro)
+        despues = nuevo is not None and self.modelo.coincide(nuevo, self.filtro)
+        if not antes and not despues:
+            return
+        self.total += int(despues) - int(antes)
+        i = self._posicion_cache(codigo)
+
+        if antes and despues and self._misma_posicion(anterior, nuevo):
+            # Misma posición: sólo cambian los valores (si la fila está en memoria)
+            if i is not None:
+                self._cache[i] = nuevo
+                if self.tree.exists(codigo):
+                    self.tree.item(codigo, values=self.formatear(nuevo))
+            return
+
+        if tipo == "agregar" and self.orden is None and not self.descendente:
+            # Sin orden: el producto nuevo va al final
+            if self._cache_desde + len(self._cache) == self.total - 1:
+                self._cache.append(nuevo)
+                fila = self.total - 1
+                if fila < self.desde + self.alto:
+                    tag = "even" if fila % 2 == 0 else "odd"
+                    self.tree.insert("", tk.END, iid=nuevo.codigo, values=self.formatear(nuevo), tags=(tag,))
+            self._actualizar_barra()
+            return
+
+        if antes and not despues and i is not None:
+            del self._cache[i]
+            fila = self._cache_desde + i
+            if fila < self.desde:
+                # Antes de la ventana: lo visible no cambia, pero sube una posición
+                self.desde -= 1
+                self._retag(0)
+                self._actualizar_barra()
+                return
+            if fila < self.desde + self.alto and self.desde + self.alto <= self.total:
+                self._quitar_visible(codigo, fila)
+                return
+
+        self._invalidar()
+        self._mover(self.desde)
+
+    def filas_visibles(self) -> list:
+        """Productos de la ventana visible, en el orden en que se muestran."""
+        i = self.desde - self._cache_desde
+        return self._cache[i:i + self.alto]
+
+    # ---------- Internos ----------
+    def _posicion_cache(self, codigo: str) -> int | None:
+        for i, p in enumerate(self._cache):
+            if p.codigo == codigo:
+                return i
+        return None
+
+    def _misma_posicion(self, anterior, nuevo) -> bool:
+        if self.orden is None:
+            return True
+        clave = CLAVES_ORDEN[self.orden]
+        return clave(anterior) == clave(nuevo)
+
+    def _quitar_visible(self, codigo: str, fila: int) -> None:
+        # Borra la fila, corrige el zebra de las siguientes y completa la última
+        self.tree.delete(codigo)
+        self._retag(fila - self.desde)
+        ultima = self.desde + self.alto - 1
+        k = ultima - self._cache_desde
+        if 0 <= k < len(self._cache):
+            p = self._cache[k]
+            self.tree.insert("", tk.END, iid=p.codigo, values=self.formatear(p),
+                             tags=("even" if ultima % 2 == 0 else "odd",))
+        elif ultima < self.total:
+            self._invalidar()
+            self._mover(self.desde)
+            return
+        self._actualizar_barra()
+
+    def _retag(self, desde_hijo: int) -> None:
+        # Zebra según la posición absoluta de cada fila visible
+        hijos = self.tree.get_children()
+        for j in range(desde_hijo, len(hijos)):
+            self.tree.item(hijos[j], tags=("even" if (self.desde + j) % 2 == 0 else "odd",))
+
+    def _actualizar_barra(self) -> None:
+        if self.total:
+            self.vsb.set(self.desde / self.total, min(1.0, (self.desde + self.alto) / self.total))
+        else:
+            self.vsb.set(0.0, 1.0)
+
+    def _invalidar(self) -> None:
+        self._cache = []
+        self._cache_desde = 0
+
+    def _mover(self, desde: int) -> None:
+        self.desde = max(0, min(desde, self.total - self.alto))
+        fin = min(self.desde + self.alto, self.total)
+        cache_fin = self._cache_desde + len(self._cache)
+        if not self._cache or self.desde < self._cache_desde or fin > cache_fin:
+            inicio = max(0, self.desde - SOBRECARGA)
+            self._cache = self.modelo.consultar(
+                self.filtro, self.orden, self.descendente, inicio, self.alto + 2 * SOBRECARGA)
+            self._cache_desde = inicio
+        self._pintar()
+
+    def _pintar(self) -> None:
+        foco = self.tree.focus()
+        self.tree.delete(*self.tree.get_children())
+        for i, p in enumerate(self.filas_visibles(), start=self.desde):
+            tag = "even" if i % 2 == 0 else "odd"
+            self.tree.insert("", tk.END, iid=p.codigo, values=self.formatear(p), tags=(tag,))
+        if foco and self.tree.exists(foco):
+            self.tree.selection_set(foco)
+            self.tree.focus(foco)
+        self._actualizar_barra()
+
+    def _scroll(self, accion, cantidad, unidad=None) -> None:
+        if accion == "moveto":
+            self._mover(int(float(cantidad) * self.total))
+        elif accion == "scroll":
+            pasos = int(cantidad) * (self.alto if unidad == "pages" else 1)
+            self._mover(self.desde + pasos)
+
+    def _rueda(self, event):
+        pasos = -event.delta // 120 if abs(event.delta) >= 120 else (-1 if event.delta > 0 else 1)
+        self._mover(self.desde + 3 * pasos)
+        return "break"
+
+    def _tecla(self, paso: int):
+        # Sólo desplaza cuando el foco está en la primera/última fila visible
+        hijos = self.tree.get_children()
+        if not hijos:
+            return None
+        borde = hijos[0] if paso < 0 else hijos[-1]
+        if self.tree.focus() != borde:
+            return None
+        self._mover(self.desde + paso)
+        hijos = self.tree.get_children()
+        if hijos:
+            nuevo = hijos[0] if paso < 0 else hijos[-1]
+            self.tree.selection_set(nuevo)
+            self.tree.focus(nuevo)
+        return "break"
@@ -0,0 +1,50 @@
+"""
+Pruebas de importación y montos (python -m pytest en esta carpeta).
+"""
+
+import pytest
+
+from dinero import a_centavos
+from importacion import importar
+from inventario import Inventario
+
+
+@pytest.mark.parametrize("texto, centavos", [
+    ("1,234.50", 123450),
+    ("$1,234,567", 123456700),
+    ("2.5", 250),
+])
+def test_coma_de_miles(texto, centavos):
+    assert a_centavos(texto) == centavos
+
+
+@pytest.mark.parametrize("texto", ["1,50", "2,5", "12,34.5", "1,2345"])
+def test_coma_que_no_es_de_miles_es_invalida(texto):
+    with pytest.raises(ValueError):
+        a_centavos(texto)
+
+
+def _importar(tmp_path, contenido):
+    ruta = tmp_path / "lista.csv"
+    ruta.write_text(contenido, encoding="utf-8")
+    inv = Inventario(tmp_path / "inventario.txt", diario=True)
+    return inv, importar(inv, ruta)
+
+
+def test_csv_con_punto_y_coma_usa_coma_decimal(tmp_path):
+    inv, r = _importar(tmp_path, "codigo;nombre;cantidad;precio\n"
+                                 "A;Tornillo;3;1,50\n"
+                                 "B;Tuerca;1;1.234,5\n")
+    assert r["total_errores"] == 0
+    assert inv.obtener("A").centavos == 150
+    assert inv.obtener("B").centavos == 123450
+
+
+def test_csv_con_comas_rechaza_coma_decimal(tmp_path):
+    inv, r = _importar(tmp_path, 'codigo,nombre,cantidad,precio\n'
+                                 'A,Tornillo,3,"1,50"\n'
+                                 'B,Tuerca,1,"1,234.50"\n')
+    assert r["agregados"] == 1
+    assert [n for n, _ in r["errores"]] == [2]
+    assert inv.obtener("A") is None
+    assert inv.obtener("B").centavos == 123450
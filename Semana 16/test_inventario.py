@@ -0,0 +1,67 @@
+"""
+Pruebas del Inventario (python -m pytest en esta carpeta).
+"""
+
+from inventario import Inventario
+from producto import Producto
+
+
+def _producto(codigo):
+    return Producto.de_centavos(codigo, f"Producto {codigo}", 1, 100)
+
+
+def test_diario_cortado_y_mas_cambios(tmp_path):
+    archivo = tmp_path / "inventario.txt"
+    inv = Inventario(archivo, diario=True)
+    inv.agregar(_producto("A"))
+    # Corte a mitad de una escritura: queda media línea al final del diario
+    with inv.archivo_diario.open("ab") as f:
+        f.write(b'{"op":"agreg')
+
+    inv = Inventario(archivo, diario=True)
+    assert list(inv.productos) == ["A"]
+    inv.agregar(_producto("B"))
+    inv.agregar(_producto("C"))
+
+    inv = Inventario(archivo, diario=True)
+    assert sorted(inv.productos) == ["A", "B", "C"]
+
+
+def test_buscar_sin_tildes_sigue_los_cambios(tmp_path):
+    inv = Inventario(tmp_path / "inventario.txt", diario=True)
+    inv.agregar(Producto.de_centavos("A1", "Café molido", 1, 100))
+    inv.agregar(Producto.de_centavos("B2", "Té verde", 1, 100))
+    inv.agregar(Producto.de_centavos("C3", "Cafetera", 1, 100))
+    assert [p.codigo for p in inv.consultar("CAFE")] == ["A1", "C3"]
+
+    inv.modificar("B2", "Café en grano", 1, 1)
+    inv.eliminar("A1")
+    assert [p.codigo for p in inv.consultar("cafe")] == ["B2", "C3"]
+    assert [p.codigo for p in inv.recorrer("b2")] == ["B2"]
+
+    try:
+        with inv.lote():
+            inv.eliminar("B2")
+            inv.agregar(Producto.de_centavos("D4", "Cafecito", 1, 100))
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert [p.codigo for p in inv.consultar("cafe")] == ["B2", "C3"]
+
+
+def test_sqlite_busca_igual_que_inventario(tmp_path):
+    from inventario_sqlite import InventarioSQLite
+
+    inv = Inventario(tmp_path / "inventario.txt")
+    bd = InventarioSQLite(str(tmp_path / "inventario.db"))
+    for p in (Producto.de_centavos("CAFÉ-1", "Molido", 1, 100),
+              Producto.de_centavos("T2", "Café en grano", 1, 100),
+              Producto.de_centavos("T3", "Té verde", 1, 100)):
+        inv.agregar(p)
+        bd.agregar(p)
+    for filtro in ("cafe", "CAFÉ", "te", "é-1"):
+        esperado = [p.codigo for p in inv.consultar(filtro)]
+        assert [p.codigo for p in bd.consultar(filtro)] == esperado
+        assert bd.contar(filtro) == len(esperado)
+        assert [p.codigo for p in inv.listar() if bd.coincide(p, filtro)] == esperado
+    bd.cerrar()
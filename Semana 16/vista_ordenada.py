@@ -0,0 +1,54 @@
+# vista_ordenada.py
+# Vista ordenada de los productos por una columna, mantenida en cada cambio.
+# Guarda (clave, codigo) en una lista ordenada: insertar/quitar es una búsqueda
+# binaria + un corrimiento de la lista (memmove), y pedir una página es un slice.
+# Los empates se resuelven por código, igual que InventarioSQLite.
+from bisect import bisect_left, insort
+
+
+class VistaOrdenada:
+    def __init__(self, clave, productos):
+        """clave: función Producto -> valor de orden; productos: dict {codigo: Producto}."""
+        self.clave = clave
+        self.claves: dict[str, object] = {}
+        entradas = []
+        for codigo, p in productos.items():
+            k = clave(p)
+            self.claves[codigo] = k
+            entradas.append((k, codigo))
+        entradas.sort()
+        self.entradas: list[tuple] = entradas
+
+    def __len__(self) -> int:
+        return len(self.entradas)
+
+    def poner(self, codigo: str, p) -> None:
+        k = self.clave(p)
+        viejo = self.claves.get(codigo)
+        if viejo is not None:
+            if viejo == k:
+                return
+            self._sacar(viejo, codigo)
+        self.claves[codigo] = k
+        insort(self.entradas, (k, codigo))
+
+    def quitar(self, codigo: str) -> None:
+        k = self.claves.pop(codigo, None)
+        if k is not None:
+            self._sacar(k, codigo)
+
+    def _sacar(self, k, codigo: str) -> None:
+        i = bisect_left(self.entradas, (k, codigo))
+        del self.entradas[i]
+
+    def pagina(self, desde: int = 0, limite: int | None = None, descendente: bool = False) -> list[str]:
+        """Códigos de la página pedida, en orden ascendente o descendente."""
+        n = len(self.entradas)
+        if descendente:
+            ini = max(n - desde, 0)
+            fin = 0 if limite is None else max(ini - limite, 0)
+            trozo = self.entradas[fin:ini]
+            trozo.reverse()
+        else:
+            trozo = self.entradas[desde:None if limite is None else desde + limite]
+        return [codigo for _, codigo in trozo]
@@ -53,79 +53,100 @@ class Producto:
         return f"ID: {self.id_producto} | Nombre: {self.nombre} | Cantidad: {self.cantidad} | Precio: ${self.precio:.2f}"
 
 
+# -------------------------
+# Errores del inventario
+# -------------------------
+class InventarioError(Exception):
+    """Error de una operación del inventario (el mensaje es apto para mostrar)."""
+
+
+class ProductoDuplicadoError(InventarioError):
+    pass
+
+
+class ProductoNoEncontradoError(InventarioError):
+    pass
+
+
 # -------------------------
 # Clase Inventario
 # -------------------------
 class Inventario:
+    """
+    Inventario en memoria. No imprime nada: cada método devuelve su resultado o
+    lanza InventarioError, así se puede usar desde otros programas; el menú de
+    consola es quien muestra los mensajes.
+    """
+
     def __init__(self):
         """
         Inicializa el inventario como una lista vacía.
         """
         self.productos = []
 
+    def _buscar_por_id(self, id_producto):
+        for p in self.productos:
+            if p.get_id() == id_producto:
+                return p
+        raise ProductoNoEncontradoError("No se encontró un producto con ese ID.")
+
     def agregar_producto(self, producto):
         """
         Agrega un nuevo producto, verificando que el ID sea único.
         """
         for p in self.productos:
             if p.get_id() == producto.get_id():
-                print("❌ Error: Ya existe un producto con ese ID.")
-                return
+                raise ProductoDuplicadoError("Ya existe un producto con ese ID.")
         self.productos.append(producto)
-        print("✅ Producto agregado correctamente.")
 
     def eliminar_producto(self, id_producto):
         """
-        Elimina un producto por ID.
+        Elimina un producto por ID y lo devuelve.
         """
-        for p in self.productos:
-            if p.get_id() == id_producto:
-                self.productos.remove(p)
-                print("✅ Producto eliminado.")
-                return
-        print("❌ No se encontró un producto con ese ID.")
+        p = self._buscar_por_id(id_producto)
+        self.productos.remove(p)
+        return p
 
     def actualizar_producto(self, id_producto, nueva_cantidad=None, nuevo_precio=None):
         """
-        Actualiza la cantidad y/o precio de un producto por ID.
+        Actualiza la cantidad y/o precio de un producto por ID y lo devuelve.
         """
-        for p in self.productos:
-            if p.get_id() == id_producto:
-                if nueva_cantidad is not None:
-                    p.set_cantidad(nueva_cantidad)
-                if nuevo_precio is not None:
-                    p.set_precio(nuevo_precio)
-                print("✅ Producto actualizado.")
-                return
-        print("❌ No se encontró un producto con ese ID.")
+        p = self._buscar_por_id(id_producto)
+        if nueva_cantidad is not None:
+            p.set_cantidad(nueva_cantidad)
+        if nuevo_precio is not None:
+            p.set_precio(nuevo_precio)
+        return p
 
     def buscar_producto(self, nombre):
         """
-        Busca productos que contengan el nombre indicado.
+        Devuelve los productos que contengan el nombre indicado.
         """
-        resultados = [p for p in self.productos if nombre.lower() in p.get_nombre().lower()]
-        if resultados:
-            print("\n🔍 Resultados de búsqueda:")
-            for p in resultados:
-                print(p)
-        else:
-            print("❌ No se encontraron productos con ese nombre.")
+        nombre = nombre.lower()
+        return [p for p in self.productos if nombre in p.get_nombre().lower()]
 
-    def mostrar_todos(self):
+    def listar(self):
         """
-        Muestra todos los productos del inventario.
+        Devuelve todos los productos del inventario.
         """
-        if not self.productos:
-            print("📦 El inventario está vacío.")
-        else:
-            print("\n📋 Lista de productos:")
-            for p in self.productos:
-                print(p)
+        return list(self.productos)
 
 
 # -------------------------
 # Menú Interactivo
 # -------------------------
+def mostrar_productos(productos, titulo, vacio):
+    """
+    Imprime una lista de productos (o el mensaje 'vacio').
+    """
+    if not productos:
+        print(vacio)
+        return
+    print(titulo)
+    for p in productos:
+        print(p)
+
+
 def menu():
     inventario = Inventario()
 
@@ -140,48 +161,56 @@ def menu():
 
         opcion = input("Seleccione una opción: ")
 
-        if opcion == "1":
-            id_prod = input("Ingrese ID único: ")
-            nombre = input("Ingrese nombre: ")
-            try:
-                cantidad = int(input("Ingrese cantidad: "))
-                precio = float(input("Ingrese precio: "))
-            except ValueError:
-                print("❌ Error: cantidad y precio deben ser números.")
-                continue
-            nuevo_producto = Producto(id_prod, nombre, cantidad, precio)
-            inventario.agregar_producto(nuevo_producto)
-
-        elif opcion == "2":
-            id_prod = input("Ingrese ID del producto a eliminar: ")
-            inventario.eliminar_producto(id_prod)
-
-        elif opcion == "3":
-            id_prod = input("Ingrese ID del producto a actualizar: ")
-            try:
-                nueva_cantidad = input("Ingrese nueva cantidad (dejar vacío si no cambia): ")
-                nuevo_precio = input("Ingrese nuevo precio (dejar vacío si no cambia): ")
-
-                nueva_cantidad = int(nueva_cantidad) if nueva_cantidad else None
-                nuevo_precio = float(nuevo_precio) if nuevo_precio else None
-            except ValueError:
-                print("❌ Error: cantidad y precio deben ser números.")
-                continue
-            inventario.actualizar_producto(id_prod, nueva_cantidad, nuevo_precio)
-
-        elif opcion == "4":
-            nombre = input("Ingrese el nombre o parte del nombre a buscar: ")
-            inventario.buscar_producto(nombre)
-
-        elif opcion == "5":
-            inventario.mostrar_todos()
-
-        elif opcion == "6":
-            print("👋 Saliendo del sistema...")
-            break
-
-        else:
-            print("❌ Opción inválida. Intente de nuevo.")
+        try:
+            if opcion == "1":
+                id_prod = input("Ingrese ID único: ")
+                nombre = input("Ingrese nombre: ")
+                try:
+                    cantidad = int(input("Ingrese cantidad: "))
+                    precio = float(input("Ingrese precio: "))
+                except ValueError:
+                    print("❌ Error: cantidad y precio deben ser números.")
+                    continue
+                nuevo_producto = Producto(id_prod, nombre, cantidad, precio)
+                inventario.agregar_producto(nuevo_producto)
+                print("✅ Producto agregado correctamente.")
+
+            elif opcion == "2":
+                id_prod = input("Ingrese ID del producto a eliminar: ")
+                inventario.eliminar_producto(id_prod)
+                print("✅ Producto eliminado.")
+
+            elif opcion == "3":
+                id_prod = input("Ingrese ID del producto a actualizar: ")
+                try:
+                    nueva_cantidad = input("Ingrese nueva cantidad (dejar vacío si no cambia): ")
+                    nuevo_precio = input("Ingrese nuevo precio (dejar vacío si no cambia): ")
+
+                    nueva_cantidad = int(nueva_cantidad) if nueva_cantidad else None
+                    nuevo_precio = float(nuevo_precio) if nuevo_precio else None
+                except ValueError:
+                    print("❌ Error: cantidad y precio deben ser números.")
+                    continue
+                inventario.actualizar_producto(id_prod, nueva_cantidad, nuevo_precio)
+                print("✅ Producto actualizado.")
+
+            elif opcion == "4":
+                nombre = input("Ingrese el nombre o parte del nombre a buscar: ")
+                mostrar_productos(inventario.buscar_producto(nombre), "\n🔍 Resultados de búsqueda:",
+                                  "❌ No se encontraron productos con ese nombre.")
+
+            elif opcion == "5":
+                mostrar_productos(inventario.listar(), "\n📋 Lista de productos:",
+                                  "📦 El inventario está vacío.")
+
+            elif opcion == "6":
+                print("👋 Saliendo del sistema...")
+                break
+
+            else:
+                print("❌ Opción inválida. Intente de nuevo.")
+        except InventarioError as e:
+            print(f"❌ {e}")
 
 
 # -------------------------